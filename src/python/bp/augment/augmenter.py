@@ -1,6 +1,6 @@
 from bp.augment.bill import BillAugmenter
-from bp.augment.chat import CachedChat
-from bp.augment.openai import ChatGpt
+from bp.augment.chat import SqliteCachedChat
+from bp.augment.concurrent import MODEL, ConcurrentChatGpt
 from bp.augment.seed import DEFAULT_SEED
 from bp.data.serialisation import Serialisation
 from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
@@ -8,7 +8,7 @@ from dotenv import load_dotenv
 
 import asyncio
 from numpy.random import default_rng
-from typing import List
+from typing import Iterator, List
 
 
 async def main():
@@ -24,15 +24,18 @@ async def main():
     ballots_with_result: List[DoubleMajorityBallot] = [
         ballot for ballot in ballots if ballot.status is BallotStatus.COMPLETED]
 
+    selected_ballots: List[DoubleMajorityBallot] = [
+        ballot for ballot in ballots_with_result if "Keine Massentierhaltung in der Schweiz (Massentierhaltungsinitiative)" == ballot.bill.title]
+
     augmented_ballots: List[DoubleMajorityBallot] = []
-    chat = ChatGpt()
-    async with CachedChat(chat) as cached_chat:
+    async with ConcurrentChatGpt(MODEL) as chat, SqliteCachedChat(chat, MODEL) as cached_chat:
         bill_augmenter = BillAugmenter(
             cached_chat, default_rng(DEFAULT_SEED), 5)
+        groups: Iterator[List[DoubleMajorityBallot]] = iter(
+            await bill_augmenter.paraphrase_and_contradict_each(selected_ballots))
         for ballot in ballots_with_result:
-            if "Keine Massentierhaltung in der Schweiz (Massentierhaltungsinitiative)" == ballot.bill.title:
-                augmented_ballots.extend(
-                    bill_augmenter.paraphrase_and_contradict([ballot]))
+            if ballot in selected_ballots:
+                augmented_ballots.extend(next(groups))
             else:
                 augmented_ballots.append(ballot)
 
@@ -4,10 +4,15 @@ from bp.entity.bill import Bill
 
 import jsonpickle
 from decimal import Decimal
-from numpy import float64
+import numpy as np
 from numpy.random import Generator
 from scipy.stats import truncnorm
-from typing import List
+from typing import Iterator, List
+
+
+STANDARD_DEVIATION: float = 2.0
+"""float: Standard deviation of augmented vote results around the original
+result, in percentage points."""
 
 
 class BillAugmenter:
@@ -29,7 +34,7 @@ class BillAugmenter:
         self.generator = generator
         self.multiplier = multiplier
 
-    def paraphrase_and_contradict(self, ballots: List[DoubleMajorityBallot]) -> List[DoubleMajorityBallot]:
+    async def paraphrase_and_contradict(self, ballots: List[DoubleMajorityBallot]) -> List[DoubleMajorityBallot]:
         """Generates n new ballots for each ballot in ballots, with paraphrased
         or opposite meanings.
 
@@ -39,9 +44,62 @@ class BillAugmenter:
         Returns:
             List[DoubleMajorityBallot]: Augmented list of ballots.
         """
-        responses: List[str] = []
+        return [new_ballot for group in await self.paraphrase_and_contradict_each(ballots) for new_ballot in group]
+
+    async def paraphrase_and_contradict_each(self, ballots: List[DoubleMajorityBallot]) -> List[List[DoubleMajorityBallot]]:
+        """Generates n new ballots for each ballot in ballots, with paraphrased
+        or opposite meanings. The paraphrase and contradiction prompts of all
+        ballots are sent to the chat model as a single batch, so that chat
+        implementations can answer them concurrently and cached chats only send
+        the uncached prompts of the whole batch.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to augment.
+
+        Returns:
+            List[List[DoubleMajorityBallot]]: For each ballot in order, the
+            ballot itself followed by its paraphrased and contradicting
+            ballots.
+        """
+        queries: List[str] = []
         for ballot in ballots:
-            responses.extend(self.chat.prompt([f"""Das nachfolgende JSON-Objekt enthält eine Volksinitiative zur Anpassung der schweizerischen Bundesverfassung mit Titel und Wortlaut:
+            queries.append(self.create_paraphrase_prompt(ballot))
+            queries.append(self.create_contradiction_prompt(ballot))
+        responses: List[str] = await self.chat.prompt(queries)
+
+        bills: List[List[Bill]] = []
+        percentages_yes: List[float] = []
+        accepting_cantons: List[float] = []
+        flip_results: List[bool] = []
+        for ballot_index, ballot in enumerate(ballots):
+            ballot_bills: List[Bill] = []
+            for is_contradiction in (False, True):
+                new_bills: List[Bill] = BillAugmenter.__parse_bills(
+                    ballot, responses[2 * ballot_index + is_contradiction])
+                ballot_bills.extend(new_bills)
+                percentages_yes.extend(
+                    [float(ballot.result.percentage_yes)] * len(new_bills))
+                accepting_cantons.extend(
+                    [float(ballot.result.accepting_cantons)] * len(new_bills))
+                flip_results.extend([is_contradiction] * len(new_bills))
+            bills.append(ballot_bills)
+
+        results: Iterator[DoubleMajorityBallotResult] = iter(self.augment_votes(
+            np.array(percentages_yes), np.array(accepting_cantons), np.array(flip_results, dtype=bool)))
+        return [[ballot] + [DoubleMajorityBallot(bill, ballot.status, next(results)) for bill in ballot_bills]
+                for ballot, ballot_bills in zip(ballots, bills)]
+
+    def create_paraphrase_prompt(self, ballot: DoubleMajorityBallot) -> str:
+        """Creates the prompt asking for bills with the same meaning as the
+        bill of ballot.
+
+        Args:
+            ballot (DoubleMajorityBallot): Ballot to paraphrase.
+
+        Returns:
+            str: Chat query.
+        """
+        return f"""Das nachfolgende JSON-Objekt enthält eine Volksinitiative zur Anpassung der schweizerischen Bundesverfassung mit Titel und Wortlaut:
 
 ```
 {{
@@ -50,8 +108,19 @@ class BillAugmenter:
 }}
 ```
 
-Generiere {self.multiplier - 1} weitere Initiativen mit derselben Struktur. Diese neuen Initiativen sollen dieselbe inhaltliche Bedeutung haben wie das Original, aber sollen alle anders formuliert sein. Die neuen Texte dürfen signifikant vom Original abweichen, aber verändere keine Absatz- oder Paragraphennummern. Die Ausgabe soll nur ein generiertes JSON-Array mit den Initiativen beinhalten, keine weiteren Kommentare oder Text."""]))
-            responses.extend(self.chat.prompt([f"""Das nachfolgende JSON-Objekt enthält eine Volksinitiative zur Anpassung der schweizerischen Bundesverfassung mit Titel und Wortlaut:
+Generiere {self.multiplier - 1} weitere Initiativen mit derselben Struktur. Diese neuen Initiativen sollen dieselbe inhaltliche Bedeutung haben wie das Original, aber sollen alle anders formuliert sein. Die neuen Texte dürfen signifikant vom Original abweichen, aber verändere keine Absatz- oder Paragraphennummern. Die Ausgabe soll nur ein generiertes JSON-Array mit den Initiativen beinhalten, keine weiteren Kommentare oder Text."""
+
+    def create_contradiction_prompt(self, ballot: DoubleMajorityBallot) -> str:
+        """Creates the prompt asking for bills with the opposite meaning of
+        the bill of ballot.
+
+        Args:
+            ballot (DoubleMajorityBallot): Ballot to contradict.
+
+        Returns:
+            str: Chat query.
+        """
+        return f"""Das nachfolgende JSON-Objekt enthält eine Volksinitiative zur Anpassung der schweizerischen Bundesverfassung mit Titel und Wortlaut:
 
 ```
 {{
@@ -60,64 +129,51 @@ Generiere {self.multiplier - 1} weitere Initiativen mit derselben Struktur. Dies
 }}
 ```
 
-Generiere {self.multiplier} weitere Initiativen mit derselben Struktur. Diese neuen Initiativen sollen das Gegenteil der obigen Initiative fordern. Trotz der gegenteiligen Aussage soll der Text so ansprechend wie möglich für potentielle Wähler wirken. Die neuen Texte dürfen signifikant vom Original abweichen, aber verändere keine Absatz- oder Paragraphennummern. Die Ausgabe soll nur ein generiertes JSON-Array mit den Initiativen beinhalten, keine weiteren Kommentare oder Text."""]))
-
-        new_ballots: List[DoubleMajorityBallot] = []
-        response_index: int = 0
-        for response in responses:
-            parsed_response: List[dict[str]] = jsonpickle.decode(response)
-            ballot: DoubleMajorityBallot = ballots[int(response_index / 2)]
-            response_element_index: int = 0
-            is_contradiction: bool = response_index % 2 == 1
-            if not is_contradiction:
-                new_ballots.append(ballot)
-
-            while response_element_index < len(parsed_response):
-                new_text_and_wording: dict[str] = parsed_response[response_element_index]
-                new_ballots.append(DoubleMajorityBallot(
-                    Bill(
-                        new_text_and_wording["title"],
-                        new_text_and_wording["wording"],
-                        ballot.bill.date
-                    ),
-                    ballot.status,
-                    self.__augment_vote(
-                        ballot.result.percentage_yes,
-                        ballot.result.accepting_cantons,
-                        is_contradiction)
-                ))
-                response_element_index = response_element_index + 1
-            response_index = response_index + 1
-
-        return new_ballots
-
-    def __augment_vote(self, percentage_yes: Decimal, accepting_cantons: Decimal, flip_result: bool) -> DoubleMajorityBallotResult:
-        """Generates a new vote result randomly, while either maintaining the
-        result or flipping it for contradictory bill texts.
+Generiere {self.multiplier} weitere Initiativen mit derselben Struktur. Diese neuen Initiativen sollen das Gegenteil der obigen Initiative fordern. Trotz der gegenteiligen Aussage soll der Text so ansprechend wie möglich für potentielle Wähler wirken. Die neuen Texte dürfen signifikant vom Original abweichen, aber verändere keine Absatz- oder Paragraphennummern. Die Ausgabe soll nur ein generiertes JSON-Array mit den Initiativen beinhalten, keine weiteren Kommentare oder Text."""
+
+    @staticmethod
+    def __parse_bills(ballot: DoubleMajorityBallot, response: str) -> List[Bill]:
+        """Converts a chat response to bills with the date of ballot.
 
         Args:
-            percentage_yes (Decimal): Share of population accepting the bill.
-            accepting_cantons (Decimal): Share of cantons accepting the bill.
-            flip_result (bool): Whether to flip the result.
+            ballot (DoubleMajorityBallot): Augmented ballot.
+            response (str): JSON array of titles and wordings from the chat.
 
         Returns:
-            DoubleMajorityBallotResult: New ballot result.
+            List[Bill]: New bill for each element of response.
         """
-        one_hundred = Decimal(100)
-        if flip_result:
-            percentage_yes = one_hundred - percentage_yes
-            accepting_cantons = one_hundred - accepting_cantons
+        parsed_response: List[dict[str]] = jsonpickle.decode(response)
+        return [Bill(new_text_and_wording["title"], new_text_and_wording["wording"], ballot.bill.date)
+                for new_text_and_wording in parsed_response]
+
+    def augment_votes(self, percentages_yes: np.ndarray, accepting_cantons: np.ndarray, flip_results: np.ndarray) -> List[DoubleMajorityBallotResult]:
+        """Generates new vote results randomly, while either maintaining each
+        result or flipping it for contradictory bill texts. All values are
+        drawn in a single vectorised call, in the same order as drawing the
+        share of population and then the share of cantons of each result one
+        by one.
+
+        Args:
+            percentages_yes (np.ndarray): Shares of population accepting the
+            bills.
+            accepting_cantons (np.ndarray): Shares of cantons accepting the
+            bills.
+            flip_results (np.ndarray): bool flags of the results to flip.
 
-        new_percentage_yes: Decimal = self.truncated_normal_distribution(
-            percentage_yes)
-        new_accepting_cantons: Decimal = self.truncated_normal_distribution(
-            accepting_cantons)
-        return DoubleMajorityBallotResult(new_percentage_yes, new_accepting_cantons)
+        Returns:
+            List[DoubleMajorityBallotResult]: New ballot results, in order.
+        """
+        values: np.ndarray = np.stack(
+            [percentages_yes, accepting_cantons], axis=-1).astype(np.float64)
+        values = np.where(flip_results[:, np.newaxis], 100.0 - values, values)
+        samples: List[float] = self.truncated_normal_distributions(
+            values.ravel()).tolist()
+        hundredth = Decimal("0.01")
+        return [DoubleMajorityBallotResult(Decimal(new_percentage_yes).quantize(hundredth), Decimal(new_accepting_cantons).quantize(hundredth))
+                for new_percentage_yes, new_accepting_cantons in zip(samples[0::2], samples[1::2])]
 
     def truncated_normal_distribution(self, value: Decimal) -> Decimal:
-        """Helper random distribution to generate new vote results without
-        changing the outcome, and with values closer to the original result
-        more probable that significantly different results.
+        """Draws a single new vote result, see truncated_normal_distributions.
 
         Args:
             value (Decimal): Original result, either share of population
@@ -126,18 +182,28 @@ Generiere {self.multiplier} weitere Initiativen mit derselben Struktur. Diese ne
         Returns:
             Decimal: New vote result with same outcome.
         """
-        fifty = Decimal(50)
-        min: Decimal = fifty if value >= fifty else Decimal(0)
-        max: Decimal = Decimal(100) if value >= fifty else Decimal(49.99)
-        std_dev: float = 2
-
-        min_num_std_devs_diff: float = float((min - value) / std_dev)
-        max_num_std_devs_diff: float = float((max - value) / std_dev)
-        value: float64 = truncnorm.rvs(
-            min_num_std_devs_diff,
-            max_num_std_devs_diff,
-            loc=float(value),
-            scale=std_dev,
-            random_state=self.generator)
+        return Decimal(self.truncated_normal_distributions(
+            np.array([float(value)]))[0]).quantize(Decimal("0.01"))
+
+    def truncated_normal_distributions(self, values: np.ndarray) -> np.ndarray:
+        """Helper random distribution to generate new vote results without
+        changing the outcome, and with values closer to the original result
+        more probable that significantly different results.
 
-        return Decimal(value).quantize(Decimal("0.01"))
+        Args:
+            values (np.ndarray): Original results, each either a share of
+            population accepting a bill or share of cantons accepting it.
+
+        Returns:
+            np.ndarray: New float64 vote results with same outcomes.
+        """
+        accepted: np.ndarray = values >= 50.0
+        lower: np.ndarray = np.where(accepted, 50.0, 0.0)
+        upper: np.ndarray = np.where(accepted, 100.0, 49.99)
+        return truncnorm.rvs(
+            (lower - values) / STANDARD_DEVIATION,
+            (upper - values) / STANDARD_DEVIATION,
+            loc=values,
+            scale=STANDARD_DEVIATION,
+            size=values.shape,
+            random_state=self.generator)
@@ -1,10 +1,13 @@
 import aiofiles
+import aiosqlite
+import asyncio
 import jsonpickle
 import re
 import os
+import time
 from abc import ABC, abstractmethod
 from hashlib import sha256
-from typing import List, Coroutine
+from typing import Awaitable, Callable, Dict, List, Coroutine, Tuple
 
 
 REMOVE_JSON_MARKUP: re.Pattern = re.compile("```json\n?(.*)```", re.DOTALL)
@@ -15,18 +18,20 @@ optional JSON markup from a chat response."""
 class Chat(ABC):
     """Implementing classes accept batch prompts for a chat model. This is used
     for data augmentation, generating paraphrased bills or bills with opposite
-    meaning using prompt engineering.
+    meaning using prompt engineering. Batches of independent prompts are
+    answered asynchronously, which allows sending the prompts of a batch
+    concurrently.
     """
 
     @abstractmethod
-    def prompt(self, queries: List[str]) -> List[str]:
-        """Batch chat prompt.
+    async def prompt(self, queries: List[str]) -> List[str]:
+        """Batch chat prompt, answering each query in a separate conversation.
 
         Args:
             queries (List[str]): All queries to send to the chat model.
 
         Returns:
-            List[str]: Response for each query.
+            List[str]: Response for each query, in the order of queries.
         """
         pass
 
@@ -44,6 +49,47 @@ class Chat(ABC):
         return REMOVE_JSON_MARKUP.sub("\\1", response)
 
 
+DEFAULT_BATCH_SIZE: int = 64
+"""int: Default maximum number of uncached queries which caches pass to the
+wrapped chat in a single batch."""
+
+
+async def prompt_batches(chat: Chat, queries: List[str], store: Callable[[List[Tuple[str, str]]], Awaitable[None]], batch_size: int = DEFAULT_BATCH_SIZE) -> List[str]:
+    """Sends queries to chat in batches of at most batch_size queries, all
+    concurrently, and stores the responses of each batch as soon as it is
+    answered. Each batch is passed to chat as a whole, so that chat decides how
+    to send its queries. If batches fail, the remaining ones are still awaited
+    and stored before the first error is raised, so that no response received
+    is lost.
+
+    Args:
+        chat (Chat): Chat to send queries to.
+        queries (List[str]): Queries to send.
+        store (Callable[[List[Tuple[str, str]]], Awaitable[None]]): Invoked
+        with the queries of each answered batch and their responses.
+        batch_size (int, optional): Maximum number of queries per batch.
+        Defaults to DEFAULT_BATCH_SIZE.
+
+    Raises:
+        Exception: First error raised by chat or store, in the order of
+        queries.
+
+    Returns:
+        List[str]: Response for each query, in the order of queries.
+    """
+    async def prompt_and_store(batch: List[str]) -> List[str]:
+        responses: List[str] = await chat.prompt(batch)
+        await store(list(zip(batch, responses)))
+        return responses
+
+    results: List[List[str] | BaseException] = await asyncio.gather(
+        *[prompt_and_store(queries[start:start + batch_size]) for start in range(0, len(queries), batch_size)], return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return [response for responses in results for response in responses]
+
+
 CACHE_FILE: str = "../resources/openai/cache.json"
 """str: Location of cache JSON file relative to this module."""
 
@@ -52,7 +98,7 @@ class CachedChat(Chat):
     """Decorator Chat implementation caching previously executed queries.
     """
 
-    def __init__(self, chat: Chat, cache_file: str = CACHE_FILE):
+    def __init__(self, chat: Chat, cache_file: str = CACHE_FILE, batch_size: int = DEFAULT_BATCH_SIZE):
         """
 
         Args:
@@ -60,9 +106,19 @@ class CachedChat(Chat):
             cache_file (str, optional): Path to persistent JSON file to store
             cache on exit. Will be loded in __aenter__ and written in
             __aexit__. Defaults to CACHE_FILE.
+            batch_size (int, optional): Maximum number of uncached queries
+            passed to chat in one batch. Defaults to DEFAULT_BATCH_SIZE.
         """
         self.chat = chat
         self.cache_file = cache_file
+        self.batch_size = batch_size
+        self.hits: int = 0
+        """int: Number of queries answered from the cache."""
+        self.misses: int = 0
+        """int: Number of distinct queries sent to the wrapped chat."""
+        self.deduplicated: int = 0
+        """int: Number of uncached queries answered by the response to an
+        identical query of the same batch."""
 
     async def __aenter__(self):
         """Loads the JSON cache file into memory."""
@@ -77,9 +133,12 @@ class CachedChat(Chat):
             self.cache = {}
         return self
 
-    def prompt(self, queries: List[str]) -> List[str]:
+    async def prompt(self, queries: List[str]) -> List[str]:
         """Invokes the wrapped prompt method whie caching previous query
-        results.
+        results. Identical uncached queries of a batch are only sent once.
+        Uncached queries are sent in batches of at most batch_size, whose
+        responses are added to the cache as they arrive, so that they are
+        written on exit even if other batches fail.
 
         Args:
             queries (List[str]): All queries to execute.
@@ -87,29 +146,32 @@ class CachedChat(Chat):
         Returns:
             List[str]: Potentially cached response for each query.
         """
-        responses: List[str] = [None] * len(queries)
-        uncached_queries: List[str] = []
-        index: int = 0
-        while index < len(queries):
-            query: str = queries[index]
-            cached_response: str = self.cache.get(query)
-            if cached_response is None:
-                uncached_queries.append(query)
-            else:
-                responses[index] = cached_response
-            index = index + 1
+        responses: List[str | None] = [
+            self.cache.get(query) for query in queries]
+        miss_indices: List[int] = [index for index,
+                                   response in enumerate(responses) if response is None]
+        uncached_queries: List[str] = list(
+            dict.fromkeys(queries[index] for index in miss_indices))
+        self.hits += len(queries) - len(miss_indices)
+        self.misses += len(uncached_queries)
+        self.deduplicated += len(miss_indices) - len(uncached_queries)
 
         if len(uncached_queries) > 0:
-            new_responses: List[str] = self.chat.prompt(uncached_queries)
-            index = 0
-            for response in new_responses:
-                while responses[index] is not None:
-                    index = index + 1
-                responses[index] = response
-                self.cache[queries[index]] = response
+            await prompt_batches(self.chat, uncached_queries, self.__store, self.batch_size)
+            for index in miss_indices:
+                responses[index] = self.cache[queries[index]]
 
         return responses
 
+    async def __store(self, responses: List[Tuple[str, str]]) -> None:
+        """Adds new responses to the in-memory cache.
+
+        Args:
+            responses (List[Tuple[str, str]]): Queries sent to the wrapped
+            chat and their responses.
+        """
+        self.cache.update(responses)
+
     def __get_cache_file_path(self) -> str:
         """Provides the path to the serialised JSON cache file, persisting
         cached query results.
@@ -126,3 +188,188 @@ class CachedChat(Chat):
         path: str = self.__get_cache_file_path()
         async with aiofiles.open(path, "w") as file:
             await file.write(serialised)
+
+
+CACHE_DATABASE: str = "../resources/openai/cache.db"
+"""str: Location of the SQLite cache database relative to this module."""
+
+
+SQLITE_CACHE_SCHEMA: str = """
+    create table if not exists response (
+        key blob primary key,
+        response text not null,
+        created real not null,
+        accessed real not null
+    ) without rowid;
+    create index if not exists response_accessed on response (accessed);
+"""
+"""str: Schema of the SQLite cache database. Responses are stored by SHA-256
+hash of model and prompt, together with their creation and last access time
+for TTL and LRU eviction."""
+
+
+class SqliteCachedChat(Chat):
+    """Decorator Chat implementation caching responses in a SQLite database.
+    Unlike CachedChat, only the queried responses are read, and new responses
+    are committed as soon as the wrapped chat returns their batch instead of on
+    exit, so that a crash or a failed batch does not lose responses which were
+    already received. Optionally evicts responses older than a TTL and least
+    recently used responses beyond a maximum number of entries. The database
+    is accessed through aiosqlite, so that lookups and commits do not block
+    the event loop while other batches are in flight.
+    """
+
+    def __init__(self, chat: Chat, model: str, database: str = CACHE_DATABASE, max_entries: int | None = None, time_to_live: float | None = None, legacy_cache_file: str | None = CACHE_FILE, clock: Callable[[], float] = time.time, batch_size: int = DEFAULT_BATCH_SIZE):
+        """Configures the cache without opening the database.
+
+        Args:
+            chat (Chat): Chat implementation to which to add a cache.
+            model (str): Chat model used by chat, which is part of the cache
+            key so that responses of different models are kept apart.
+            database (str, optional): Path to the SQLite database relative to
+            this module, created in __aenter__ if it does not exist. Defaults
+            to CACHE_DATABASE.
+            max_entries (int | None, optional): Maximum number of cached
+            responses, beyond which the least recently used ones are evicted.
+            Defaults to None, which does not limit the size.
+            time_to_live (float | None, optional): Seconds after which a cached
+            response expires. Defaults to None, which keeps responses forever.
+            legacy_cache_file (str | None, optional): CachedChat JSON cache
+            file relative to this module, imported when creating a new
+            database. Defaults to CACHE_FILE.
+            clock (Callable[[], float], optional): Current time in seconds.
+            Defaults to time.time.
+            batch_size (int, optional): Maximum number of uncached queries
+            passed to chat in one batch. Defaults to DEFAULT_BATCH_SIZE.
+        """
+        self.chat = chat
+        self.model = model
+        self.database = database
+        self.max_entries = max_entries
+        self.time_to_live = time_to_live
+        self.legacy_cache_file = legacy_cache_file
+        self.clock = clock
+        self.batch_size = batch_size
+        self.hits: int = 0
+        """int: Number of queries answered from the cache."""
+        self.misses: int = 0
+        """int: Number of distinct queries sent to the wrapped chat."""
+        self.deduplicated: int = 0
+        """int: Number of uncached queries answered by the response to an
+        identical query of the same batch."""
+
+    async def __aenter__(self):
+        """Opens the cache database, creating and initialising it if
+        necessary."""
+        module_location: str = os.path.dirname(__file__)
+        path: str = os.path.join(module_location, self.database)
+        should_initialise: bool = not os.path.isfile(path)
+
+        self.connection: aiosqlite.Connection = await aiosqlite.connect(path)
+        await self.connection.execute("pragma journal_mode = wal")
+        await self.connection.execute("pragma synchronous = normal")
+        await self.connection.executescript(SQLITE_CACHE_SCHEMA)
+        async with self.connection.execute("select count(*) from response") as cursor:
+            self.size: int = (await cursor.fetchone())[0]
+        if should_initialise and self.legacy_cache_file is not None:
+            legacy_path: str = os.path.join(
+                module_location, self.legacy_cache_file)
+            if os.path.isfile(legacy_path):
+                async with aiofiles.open(legacy_path) as file:
+                    cache: dict[str, str] = jsonpickle.decode(await file.read())
+                await self.__insert(list(cache.items()))
+        return self
+
+    async def prompt(self, queries: List[str]) -> List[str]:
+        """Answers queries from the cache where possible and sends the
+        distinct uncached queries to the wrapped chat in concurrent batches of
+        at most batch_size, committing the responses of each batch as it
+        arrives.
+
+        Args:
+            queries (List[str]): All queries to execute.
+
+        Returns:
+            List[str]: Potentially cached response for each query.
+        """
+        now: float = self.clock()
+        responses: List[str | None] = []
+        hits: List[Tuple[float, bytes]] = []
+        expired: List[Tuple[bytes]] = []
+        for query in queries:
+            key: bytes = self.__key(query)
+            row: Tuple[str, float] | None
+            async with self.connection.execute(
+                    "select response, created from response where key = ?", [key]) as cursor:
+                row = await cursor.fetchone()
+            if row is not None and self.time_to_live is not None and row[1] + self.time_to_live <= now:
+                expired.append((key,))
+                row = None
+            responses.append(None if row is None else row[0])
+            if row is not None:
+                hits.append((now, key))
+
+        await self.connection.executemany(
+            "update response set accessed = ? where key = ?", hits)
+        self.size -= (await self.connection.executemany(
+            "delete from response where key = ?", expired)).rowcount
+        await self.connection.commit()
+
+        miss_indices: List[int] = [index for index,
+                                   response in enumerate(responses) if response is None]
+        uncached_queries: List[str] = list(
+            dict.fromkeys(queries[index] for index in miss_indices))
+        self.hits += len(queries) - len(miss_indices)
+        self.misses += len(uncached_queries)
+        self.deduplicated += len(miss_indices) - len(uncached_queries)
+
+        if len(uncached_queries) > 0:
+            new_responses: Dict[str, str] = dict(
+                zip(uncached_queries, await prompt_batches(self.chat, uncached_queries, self.__insert, self.batch_size)))
+            for index in miss_indices:
+                responses[index] = new_responses[queries[index]]
+
+        return responses
+
+    def __key(self, query: str) -> bytes:
+        """Cache key of a query.
+
+        Args:
+            query (str): Query sent to the chat model.
+
+        Returns:
+            bytes: SHA-256 hash of model and query.
+        """
+        return sha256(f"{self.model}\0{query}".encode("utf-8")).digest()
+
+    async def __insert(self, responses: List[Tuple[str, str]]) -> None:
+        """Writes responses in one transaction and evicts the least recently
+        used responses beyond max_entries. Responses to queries which are
+        already cached replace the previous response without changing the
+        size, and for duplicate queries the last response is kept.
+
+        Args:
+            responses (List[Tuple[str, str]]): Queries and their responses.
+        """
+        now: float = self.clock()
+        rows: List[Tuple[bytes, str, float, float]] = [
+            (self.__key(query), response, now, now) for query, response in responses]
+        inserted: int = (await self.connection.executemany(
+            "insert or ignore into response (key, response, created, accessed) values (?, ?, ?, ?)",
+            rows)).rowcount
+        self.size += inserted
+        if inserted < len(rows):
+            await self.connection.executemany(
+                "update response set response = ?, created = ?, accessed = ? where key = ?",
+                [(response, created, accessed, key) for key, response, created, accessed in rows])
+        if self.max_entries is not None and self.size > self.max_entries:
+            evicted: int = self.size - self.max_entries
+            self.size = self.max_entries
+            await self.connection.execute(
+                "delete from response where key in (select key from response order by accessed limit ?)",
+                [evicted])
+        await self.connection.commit()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> Coroutine:
+        """Closes the cache database. All responses are already committed."""
+        await self.connection.close()
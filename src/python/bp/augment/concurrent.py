@@ -0,0 +1,199 @@
+from bp.augment.chat import Chat
+
+import asyncio
+import httpx
+import openai
+import random
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion, ChatCompletionUserMessageParam
+from typing import Coroutine, List, Tuple, Type
+
+
+MODEL: str = "gpt-3.5-turbo"
+"""str: OpenAI chat model used for data augmentation."""
+
+
+DEFAULT_MAX_CONCURRENCY: int = 16
+"""int: Default maximum number of completion requests in flight at the same
+time."""
+
+
+DEFAULT_REQUESTS_PER_MINUTE: float | None = 500.0
+"""float | None: Default maximum rate at which completion requests are
+started."""
+
+
+DEFAULT_TOKENS_PER_MINUTE: float | None = 60000.0
+"""float | None: Default maximum rate of estimated prompt tokens sent."""
+
+
+DEFAULT_MAX_ATTEMPTS: int = 6
+"""int: Default number of attempts per prompt before giving up."""
+
+
+DEFAULT_INITIAL_BACKOFF_SECONDS: float = 1.0
+"""float: Default upper bound of the first retry delay, which doubles with
+every further attempt."""
+
+
+DEFAULT_MAX_BACKOFF_SECONDS: float = 60.0
+"""float: Default upper bound of any retry delay."""
+
+
+DEFAULT_TIMEOUT_SECONDS: float = 120.0
+"""float: Default timeout for a single completion request."""
+
+
+CHARACTERS_PER_TOKEN: int = 4
+"""int: Rough number of characters per token, used to estimate the token cost
+of a prompt for the token budget without a tokenizer."""
+
+
+RETRYABLE_ERRORS: Tuple[Type[Exception], ...] = (
+    openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+"""Tuple[Type[Exception], ...]: Errors after which a request is retried.
+openai.APIConnectionError includes timeouts."""
+
+
+class ConcurrentChatGpt(Chat):
+    """Chat implementation using the ChatGPT API through a single pooled
+    openai.AsyncOpenAI client. All prompts of a batch are sent concurrently as
+    independent conversations, limited by a maximum number of requests in
+    flight and by request and token budgets per minute. Failed requests are
+    retried with jittered exponential backoff. Needs to be used as an async
+    context manager, which opens and disposes the connection pool.
+    """
+
+    def __init__(self, model: str = MODEL, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, requests_per_minute: float | None = DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute: float | None = DEFAULT_TOKENS_PER_MINUTE, max_attempts: int = DEFAULT_MAX_ATTEMPTS, initial_backoff: float = DEFAULT_INITIAL_BACKOFF_SECONDS, max_backoff: float = DEFAULT_MAX_BACKOFF_SECONDS, timeout: float = DEFAULT_TIMEOUT_SECONDS, api_key: str | None = None, base_url: str | None = None, generator: random.Random | None = None):
+        """Configures the chat without opening any connections.
+
+        Args:
+            model (str, optional): Chat model to use. Defaults to MODEL.
+            max_concurrency (int, optional): Maximum number of requests in
+            flight at the same time. Also used as the connection pool size.
+            Defaults to DEFAULT_MAX_CONCURRENCY.
+            requests_per_minute (float | None, optional): Maximum rate at which
+            requests are started, or None to disable the limit. Defaults to
+            DEFAULT_REQUESTS_PER_MINUTE.
+            tokens_per_minute (float | None, optional): Maximum rate of
+            estimated prompt tokens, or None to disable the limit. Defaults to
+            DEFAULT_TOKENS_PER_MINUTE.
+            max_attempts (int, optional): Number of attempts per prompt.
+            Defaults to DEFAULT_MAX_ATTEMPTS.
+            initial_backoff (float, optional): Upper bound of the first retry
+            delay in seconds. Defaults to DEFAULT_INITIAL_BACKOFF_SECONDS.
+            max_backoff (float, optional): Upper bound of any retry delay in
+            seconds. Defaults to DEFAULT_MAX_BACKOFF_SECONDS.
+            timeout (float, optional): Timeout in seconds for a single request.
+            Defaults to DEFAULT_TIMEOUT_SECONDS.
+            api_key (str | None, optional): OpenAI API key. Defaults to None,
+            which uses the OPENAI_API_KEY environment variable.
+            base_url (str | None, optional): API base URL, e.g. of a local
+            test server. Defaults to None, which uses the OpenAI API.
+            generator (random.Random | None, optional): Source of the backoff
+            jitter. Defaults to None, which creates an unseeded generator.
+        """
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.api_key = api_key
+        self.base_url = base_url
+        self.generator = generator or random.Random()
+
+    async def __aenter__(self):
+        """Opens the connection pool."""
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency)
+        self.http_client = httpx.AsyncClient(
+            limits=limits, timeout=self.timeout)
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                  max_retries=0, http_client=self.http_client)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.next_request_time: float = 0.0
+        return self
+
+    async def prompt(self, queries: List[str]) -> List[str]:
+        """Sends every query concurrently as a separate conversation.
+
+        Args:
+            queries (List[str]): All queries to send to the chat model.
+
+        Raises:
+            openai.OpenAIError: If a request failed with a non-retryable error
+            or still failed after max_attempts attempts.
+            ValueError: If a completion has no content, e.g. due to a content
+            filter or a refusal.
+
+        Returns:
+            List[str]: Response for each query without JSON markup, in the
+            order of queries.
+        """
+        return await asyncio.gather(*[self.__complete(query) for query in queries])
+
+    async def __complete(self, query: str) -> str:
+        """Sends a single query, retrying retryable errors with full jitter
+        exponential backoff.
+
+        Args:
+            query (str): Query to send.
+
+        Raises:
+            openai.OpenAIError: If the request failed with a non-retryable
+            error or still failed after max_attempts attempts.
+            ValueError: If the completion has no content.
+
+        Returns:
+            str: Response without JSON markup.
+        """
+        attempt: int = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    await self.__wait_for_budget(query)
+                    completion: ChatCompletion = await self.client.chat.completions.create(
+                        messages=[ChatCompletionUserMessageParam(
+                            content=query, role="user")],
+                        model=self.model)
+                content: str | None = completion.choices[0].message.content
+                if content is None:
+                    raise ValueError(
+                        f"Completion without content, finish reason '{completion.choices[0].finish_reason}': {query}")
+                return Chat.remove_json_markup(content)
+            except RETRYABLE_ERRORS:
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    raise
+                backoff: float = min(
+                    self.max_backoff, self.initial_backoff * 2 ** (attempt - 1))
+                await asyncio.sleep(self.generator.uniform(0, backoff))
+
+    async def __wait_for_budget(self, query: str) -> None:
+        """Reserves the next free request slot according to the request and
+        token budgets and sleeps until that slot is reached. Each request
+        occupies the budget for the longer of its request and token share.
+
+        Args:
+            query (str): Query which will be sent next.
+        """
+        interval: float = 0.0
+        if self.requests_per_minute is not None:
+            interval = 60.0 / self.requests_per_minute
+        if self.tokens_per_minute is not None:
+            tokens: int = len(query) // CHARACTERS_PER_TOKEN + 1
+            interval = max(interval, 60.0 * tokens / self.tokens_per_minute)
+
+        now: float = asyncio.get_running_loop().time()
+        slot: float = max(now, self.next_request_time)
+        self.next_request_time = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> Coroutine:
+        """Disposes the connection pool."""
+        await self.client.close()
@@ -1,22 +1,27 @@
 from bp.augment.chat import Chat
+from bp.augment.concurrent import MODEL, ConcurrentChatGpt
 
-from openai import OpenAI
-from openai.types.chat.completion_create_params import ResponseFormat
-from openai.types.chat import ChatCompletion, ChatCompletionUserMessageParam
+import warnings
 from typing import List
 
 
 class ChatGpt(Chat):
-    """Implements Chat interface using the ChatGPT API.
+    """Implements Chat interface using the ChatGPT API. Deprecated, use
+    ConcurrentChatGpt as an async context manager instead, which shares its
+    connection pool and rate limits between batches. Each batch is sent
+    through a ConcurrentChatGpt opened for that batch only.
     """
 
-    def prompt(self, prompts: List[str]) -> List[str]:
-        messages: List[ChatCompletionUserMessageParam] = [
-            ChatCompletionUserMessageParam(content=prompt, role="user") for prompt in prompts]
-        client = OpenAI()
-        response: ChatCompletion = client.chat.completions.create(
-            messages=messages,
-            model="gpt-3.5-turbo"
-        )
+    def __init__(self, model: str = MODEL):
+        """Configures the chat model.
 
-        return [Chat.remove_json_markup(choice.message.content) for choice in response.choices]
+        Args:
+            model (str, optional): Chat model to use. Defaults to MODEL.
+        """
+        warnings.warn("ChatGpt is deprecated, use ConcurrentChatGpt instead",
+                      DeprecationWarning, stacklevel=2)
+        self.model = model
+
+    async def prompt(self, queries: List[str]) -> List[str]:
+        async with ConcurrentChatGpt(self.model) as chat:
+            return await chat.prompt(queries)
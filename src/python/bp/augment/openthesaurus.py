@@ -1,14 +1,18 @@
 import aiosqlite
+import argparse
+import asyncio
 import os
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Coroutine, Iterable
+from typing import Callable, Coroutine, Dict, Iterable, List, Tuple
 
 
 SQLITE_DATABASE: str = "../resources/openthesaurus/openthesaurus.db"
 """str: Relative path from this module to the default SQLite database. This
 database will be used in most production scenarios and is only configurable for
-testing purposes."""
+testing purposes. It is built once from SQLITE_DUMP using
+`python -m bp.augment.openthesaurus build`."""
 
 
 SQLITE_DUMP: str = "../resources/openthesaurus/openthesaurus_dump_ch_sqlite.sql"
@@ -25,38 +29,183 @@ sqlite3 src/python/bp/resources/openthesaurus/openthesaurus.db .dump >src/python
 """
 
 
+INDEXES: str = """
+    create index if not exists term_word on term (word);
+    create index if not exists term_synset_id on term (synset_id);
+    create index if not exists term_link_term_id_link_type_id on term_link (term_id, link_type_id);
+"""
+"""str: Indexes of the lookup columns, created when building the database."""
+
+
+MMAP_SIZE: int = 256 << 20
+"""int: Maximum number of bytes of the read-only database accessed through
+memory mapping instead of read calls."""
+
+
+DEFAULT_POOL_SIZE: int = 4
+"""int: Default number of read-only connections, each with its own worker
+thread, over which concurrent lookups are distributed."""
+
+
+DEFAULT_CACHE_SIZE: int = 4096
+"""int: Default maximum number of terms whose synonyms and antonyms are kept
+in the LRU caches of find_synonyms and find_antonyms."""
+
+
+MAX_VARIABLES: int = 500
+"""int: Maximum number of terms bound in a single IN query, well below the
+SQLite variable limit of older versions."""
+
+
+SYNONYMS_QUERY: str = """
+    select
+    	needle.word,
+    	case when synonym.normalized_word is null
+    		then synonym.word
+    		else synonym.normalized_word
+    	end as word
+    from term as needle
+    	inner join term as synonym
+    		on synonym.synset_id = needle.synset_id
+    where needle.word in ({}) and synonym.word != needle.word
+"""
+"""str: Synonyms of a set of terms, formatted with one placeholder per term."""
+
+
+ANTONYMS_QUERY: str = """
+    select
+    	distinct
+    	needle.word,
+    	case when antonym.normalized_word is null
+    		then antonym.word
+    		else antonym.normalized_word
+    	end as word
+    from term_link
+    	inner join term needle on term_link.term_id = needle.id
+    	inner join term antonym on term_link.target_term_id  = antonym.id
+    where term_link.link_type_id = 1
+    	and needle.word in ({})
+"""
+"""str: Antonyms of a set of terms, formatted with one placeholder per
+term."""
+
+
 class OpenThesaurus:
     """Helper class based on bundled resources in bp/resources/openthesaurus to
     access synonym and antonym information for terms.
     """
 
-    def __init__(self, database: str = SQLITE_DATABASE):
+    def __init__(self, database: str = SQLITE_DATABASE, preload: bool = False, cache_size: int = DEFAULT_CACHE_SIZE, pool_size: int = DEFAULT_POOL_SIZE):
         """Initialises and configures the SQLite connection without opening it.
 
         Args:
-            database (str, optional): Path to SQLite database file to use. Will
-            be creatd in __aenter__ if it does not exist. Defaults to
-            SQLITE_DATABASE.
+            database (str, optional): Path to SQLite database file to use,
+            built by build_database. Defaults to SQLITE_DATABASE.
+            preload (bool, optional): Whether to load all terms into an
+            in-memory index in __aenter__, after which no lookup queries the
+            database. Defaults to False.
+            cache_size (int, optional): Maximum number of terms in the LRU
+            caches of find_synonyms and find_antonyms. Defaults to
+            DEFAULT_CACHE_SIZE.
+            pool_size (int, optional): Number of read-only connections
+            serving lookups concurrently. Defaults to DEFAULT_POOL_SIZE.
         """
         self.database = database
+        self.preload = preload
+        self.cache_size = cache_size
+        self.pool_size = pool_size
+        self.synonym_cache: OrderedDict[str, List[str]] = OrderedDict()
+        self.antonym_cache: OrderedDict[str, List[str]] = OrderedDict()
+        self.cache_hits: int = 0
+        """int: Number of find_synonyms and find_antonyms calls answered from
+        the LRU caches."""
+        self.cache_misses: int = 0
+        """int: Number of find_synonyms and find_antonyms calls which needed
+        a lookup."""
+        self.synsets_by_word: Dict[str, List[int]] | None = None
+        """Dict[str, List[int]] | None: Preloaded synset ID of every term
+        with the given word, if preloaded."""
+        self.words_by_synset: Dict[int, List[Tuple[str, str]]] | None = None
+        """Dict[int, List[Tuple[str, str]]] | None: Preloaded word and
+        normalised word of every term in the given synset, if preloaded."""
+        self.antonyms_by_word: Dict[str, List[str]] | None = None
+        """Dict[str, List[str]] | None: Preloaded distinct normalised
+        antonyms of every word which has any, if preloaded."""
 
     async def __aenter__(self):
-        """Opens the configured SQLite database connection."""
+        """Opens pool_size read-only connections to the configured SQLite
+        database.
+
+        Raises:
+            FileNotFoundError: If the database has not been built yet.
+        """
         module_location: str = os.path.dirname(__file__)
         path: str = os.path.join(module_location, self.database)
-        should_initialise: bool = not os.path.isfile(path)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(
+                f"Thesaurus database {path} does not exist, build it using: python -m bp.augment.openthesaurus build")
 
-        self.connection = aiosqlite.connect(path)
-        await self.connection.__aenter__()
+        uri: str = f"{Path(path).absolute().as_uri()}?mode=ro&immutable=1"
+        self.connections: List[aiosqlite.Connection] = []
+        self.pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for _ in range(self.pool_size):
+            connection: aiosqlite.Connection = aiosqlite.connect(
+                uri, uri=True)
+            await connection.__aenter__()
+            self.connections.append(connection)
+            await connection.execute(f"pragma mmap_size = {MMAP_SIZE}")
+            self.pool.put_nowait(connection)
 
-        if should_initialise:
-            script_path: str = os.path.join(module_location, SQLITE_DUMP)
-            script: str = Path(script_path).read_text("utf8")
-            await self.connection.executescript(script)
+        if self.preload:
+            await self.load_index()
         return self
 
+    @staticmethod
+    async def build_database(database: str, dump: str) -> None:
+        """Builds the optimised thesaurus database from an SQL dump. Adds
+        INDEXES, collects statistics for the query planner and compacts the
+        file. The database is built next to its target path and only moved
+        into place once complete, so that an interrupted build is not mistaken
+        for a complete database.
+
+        Args:
+            database (str): Path of the database to create or replace.
+            dump (str): Path to the SQL dump to import.
+        """
+        temporary: str = f"{database}.tmp"
+        if os.path.isfile(temporary):
+            os.remove(temporary)
+        script: str = Path(dump).read_text("utf8")
+        async with aiosqlite.connect(temporary) as connection:
+            await connection.executescript(script)
+            await connection.executescript(INDEXES)
+            await connection.execute("analyze")
+            await connection.commit()
+            await connection.execute("vacuum")
+        os.replace(temporary, database)
+
+    async def load_index(self) -> None:
+        """Loads all terms and antonym links into an in-memory index, which
+        is used by all subsequent lookups instead of the database.
+        """
+        synsets_by_word: Dict[str, List[int]] = {}
+        words_by_synset: Dict[int, List[Tuple[str, str]]] = {}
+        for synset_id, word, normalized_word in await self.__execute_fetchall(
+                "select synset_id, word, normalized_word from term"):
+            synsets_by_word.setdefault(word, []).append(synset_id)
+            words_by_synset.setdefault(synset_id, []).append(
+                (word, word if normalized_word is None else normalized_word))
+
+        antonyms_by_word: Dict[str, List[str]] = {}
+        for word, antonym in await self.__execute_fetchall(ANTONYMS_QUERY.format("select word from term")):
+            antonyms_by_word.setdefault(word, []).append(antonym)
+
+        self.synsets_by_word = synsets_by_word
+        self.words_by_synset = words_by_synset
+        self.antonyms_by_word = antonyms_by_word
+
     async def find_synonyms(self, term: str) -> Coroutine[str, None, None]:
-        """Finds all synonyms for term.
+        """Finds all synonyms for term. Results are kept in an LRU cache.
 
         Args:
             term (str): Term for which to find synonyms.
@@ -64,21 +213,10 @@ class OpenThesaurus:
         Returns:
             List[str]: All found synonyms.
         """
-        rows: Iterable[aiosqlite.Row] = await self.connection.execute_fetchall("""
-            select
-            	case when synonym.normalized_word is null
-            		then synonym.word
-            		else synonym.normalized_word
-            	end as word
-            from term as needle
-            	inner join term as synonym
-            		on synonym.synset_id = needle.synset_id
-            where needle.word = ? and synonym.word != ?
-        """, [term, term])
-        return [row[0] for row in rows]
+        return await self.__find_cached(term, self.synonym_cache, self.find_synonyms_many)
 
     async def find_antonyms(self, term: str) -> Coroutine[str, None, None]:
-        """Finds all antonyms for term.
+        """Finds all antonyms for term. Results are kept in an LRU cache.
 
         Args:
             term (str): Term for which to find antonyms.
@@ -86,21 +224,130 @@ class OpenThesaurus:
         Returns:
             List[str]: All found antonyms.
         """
-        rows: Iterable[aiosqlite.Row] = await self.connection.execute_fetchall("""
-            select
-            	distinct
-            	case when antonym.normalized_word is null
-            		then antonym.word
-            		else antonym.normalized_word
-            	end as word
-            from term_link
-            	inner join term needle on term_link.term_id = needle.id
-            	inner join term antonym on term_link.target_term_id  = antonym.id
-            where term_link.link_type_id = 1
-            	and needle.word = ?
-        """, [term])
-        return [row[0] for row in rows]
+        return await self.__find_cached(term, self.antonym_cache, self.find_antonyms_many)
+
+    async def find_synonyms_many(self, terms: Iterable[str]) -> Dict[str, List[str]]:
+        """Finds all synonyms for each of terms, using one query per
+        MAX_VARIABLES distinct terms or the preloaded index.
+
+        Args:
+            terms (Iterable[str]): Terms for which to find synonyms.
+
+        Returns:
+            Dict[str, List[str]]: All found synonyms of each distinct term.
+        """
+        distinct_terms: List[str] = list(dict.fromkeys(terms))
+        if self.synsets_by_word is not None:
+            return {term: [normalized_word
+                           for synset_id in self.synsets_by_word.get(term, [])
+                           for word, normalized_word in self.words_by_synset[synset_id]
+                           if word != term] for term in distinct_terms}
+        return await self.__find_many(distinct_terms, SYNONYMS_QUERY)
+
+    async def find_antonyms_many(self, terms: Iterable[str]) -> Dict[str, List[str]]:
+        """Finds all antonyms for each of terms, using one query per
+        MAX_VARIABLES distinct terms or the preloaded index.
+
+        Args:
+            terms (Iterable[str]): Terms for which to find antonyms.
+
+        Returns:
+            Dict[str, List[str]]: All found antonyms of each distinct term.
+        """
+        distinct_terms: List[str] = list(dict.fromkeys(terms))
+        if self.antonyms_by_word is not None:
+            return {term: list(self.antonyms_by_word.get(term, [])) for term in distinct_terms}
+        return await self.__find_many(distinct_terms, ANTONYMS_QUERY)
+
+    async def __find_many(self, terms: List[str], query: str) -> Dict[str, List[str]]:
+        """Executes a lookup query for chunks of at most MAX_VARIABLES terms,
+        distributing the chunks over the connection pool.
+
+        Args:
+            terms (List[str]): Distinct terms to look up.
+            query (str): SYNONYMS_QUERY or ANTONYMS_QUERY.
+
+        Returns:
+            Dict[str, List[str]]: Found words of each term.
+        """
+        chunks: List[List[str]] = [terms[start:start + MAX_VARIABLES]
+                                   for start in range(0, len(terms), MAX_VARIABLES)]
+        results: List[Iterable[aiosqlite.Row]] = await asyncio.gather(*[self.__execute_fetchall(
+            query.format(", ".join("?" * len(chunk))), chunk) for chunk in chunks])
+        found: Dict[str, List[str]] = {term: [] for term in terms}
+        for rows in results:
+            for term, word in rows:
+                found[term].append(word)
+        return found
+
+    async def __execute_fetchall(self, sql: str, parameters: List[str] | None = None) -> Iterable[aiosqlite.Row]:
+        """Executes a query on the next idle pooled connection, waiting for
+        one to become idle if necessary.
+
+        Args:
+            sql (str): Query to execute.
+            parameters (List[str] | None, optional): Query parameters.
+            Defaults to None.
+
+        Returns:
+            Iterable[aiosqlite.Row]: All result rows.
+        """
+        connection: aiosqlite.Connection = await self.pool.get()
+        try:
+            return await connection.execute_fetchall(sql, parameters)
+        finally:
+            self.pool.put_nowait(connection)
+
+    async def __find_cached(self, term: str, cache: OrderedDict[str, List[str]], find_many: Callable[[Iterable[str]], Coroutine]) -> List[str]:
+        """Looks up term in an LRU cache, falling back to find_many.
+
+        Args:
+            term (str): Term to look up.
+            cache (OrderedDict[str, List[str]]): LRU cache of the lookup.
+            find_many (Callable[[Iterable[str]], Coroutine]): Bulk lookup.
+
+        Returns:
+            List[str]: Copy of the found words, which callers may modify.
+        """
+        words: List[str] | None = cache.get(term)
+        if words is None:
+            self.cache_misses += 1
+            words = (await find_many([term]))[term]
+            cache[term] = words
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            self.cache_hits += 1
+            cache.move_to_end(term)
+        return list(words)
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> Coroutine:
-        """Disposes the SQLite connection."""
-        await self.connection.__aexit__(exc_type, exc_val, exc_tb)
+        """Disposes all pooled SQLite connections."""
+        for connection in self.connections:
+            await connection.__aexit__(exc_type, exc_val, exc_tb)
+
+
+async def main(arguments: List[str] | None = None) -> None:
+    """Builds the optimised read-only thesaurus database used by
+    OpenThesaurus from the OpenThesaurus SQL dump. This only needs to be run
+    once after checkout, and again whenever the dump changes.
+
+    Args:
+        arguments (List[str] | None, optional): Command line arguments.
+        Defaults to None, which uses sys.argv.
+    """
+    module_location: str = os.path.dirname(__file__)
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser(
+        "build", help="Build the thesaurus database from the SQL dump.")
+    build.add_argument("--dump", default=os.path.join(module_location, SQLITE_DUMP),
+                       help="OpenThesaurus SQL dump to import.")
+    build.add_argument("--database", default=os.path.join(module_location, SQLITE_DATABASE),
+                       help="Thesaurus database to create or replace.")
+    parsed_arguments: argparse.Namespace = parser.parse_args(arguments)
+    await OpenThesaurus.build_database(parsed_arguments.database, parsed_arguments.dump)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
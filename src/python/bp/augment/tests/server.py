@@ -0,0 +1,102 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Tuple
+
+import json
+import time
+
+
+class CompletionServer:
+    """Local HTTP server imitating the chat completions endpoint of the OpenAI
+    API, used to test chat backends without network access. Records every
+    prompt and the maximum number of requests served concurrently. Can fail a
+    configurable number of initial requests to exercise retries.
+    """
+
+    def __init__(self, respond: Callable[[str], str | None] = lambda prompt: prompt, delay: float = 0.0, failures: int = 0, failure_status: int = 429):
+        """Configures the responses without starting the server.
+
+        Args:
+            respond (Callable[[str], str | None], optional): Computes the
+            response content for a prompt, or None for a completion stopped by
+            the content filter. Defaults to echoing the prompt.
+            delay (float, optional): Seconds to wait before answering each
+            request. Defaults to 0.0.
+            failures (int, optional): Number of initial requests answered with
+            failure_status. Defaults to 0.
+            failure_status (int, optional): HTTP status of failed requests.
+            Defaults to 429.
+        """
+        self.respond = respond
+        self.delay = delay
+        self.failures = failures
+        self.failure_status = failure_status
+        self.requests: List[Tuple[str, float]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = Lock()
+
+    def url(self) -> str:
+        """API base URL of this server.
+
+        Returns:
+            str: Base URL to pass to the OpenAI client.
+        """
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        """Starts serving on a free local port in a background thread."""
+        stub: CompletionServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                request: Dict[str, Any] = json.loads(self.rfile.read(
+                    int(self.headers["Content-Length"])))
+                prompt: str = request["messages"][0]["content"]
+                with stub.lock:
+                    stub.requests.append((prompt, time.monotonic()))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(
+                        stub.max_in_flight, stub.in_flight)
+                    failed: bool = stub.failures > 0
+                    stub.failures -= 1 if failed else 0
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.in_flight -= 1
+                if failed:
+                    body: bytes = json.dumps({"error": {
+                        "message": "Failure", "type": "server_error"}}).encode()
+                    self.send_response(stub.failure_status)
+                else:
+                    content: str | None = stub.respond(prompt)
+                    body = json.dumps({
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": request["model"],
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "content_filter" if content is None else "stop"
+                        }]
+                    }).encode()
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stops the server."""
+        self.server.shutdown()
+        self.server.server_close()
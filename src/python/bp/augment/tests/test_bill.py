@@ -4,23 +4,15 @@ from bp.augment.seed import DEFAULT_SEED
 from bp.entity.ballot import BallotStatus, DoubleMajorityBallot, DoubleMajorityBallotResult
 from bp.entity.bill import Bill
 
+import numpy as np
 import unittest
 from datetime import datetime
 from decimal import Decimal
-from numpy.random import default_rng
+from numpy.random import Generator, default_rng
 from typing import Dict, List
 
 
-class MockChat(Chat):
-    
-    def __init__(self):
-        self.invocation_index = 0
-
-    def prompt(self, _: List[str]) -> List[str]:
-        if self.invocation_index == 0:
-            self.invocation_index = self.invocation_index + 1
-            return [
-            """
+PARAPHRASES: str = """
 [
   {
     "title": "gegen das Schlachten ohne vorherige Betäubung",
@@ -58,9 +50,10 @@ class MockChat(Chat):
     "title": "für die Betäubung vor dem Töten",
     "wording": "Die Volksinitiative lautet:\n\nDie Bundesverfassung wird wie folgt ergänzt:\n\nArt. 25^bis (neu)\n\nBevor Tiere getötet werden, ist eine vorherige Betäubung vor dem Blutentzug zwingend vorgeschrieben, und zwar für jede Schlachtart und Viehgattung."
   }
-]"""]
-        return [
-            """
+]"""
+
+
+CONTRADICTIONS: str = """
 [
   {
     "title": "gegen ein Verbot des Schlachtens ohne vorherige Betäubung",
@@ -102,14 +95,24 @@ class MockChat(Chat):
     "title": "für die uneingeschränkte Erlaubnis des Schlachtens ohne vorherige Betäubung",
     "wording": "Die Volksinitiative lautet:\n\nDie Bundesverfassung wird wie folgt ergänzt:\n\nArt. 25^bis (neu)\n\nDas Schlachten der Tiere ohne vorherige Betäubung vor dem Blutentzuge ist bei jeder Schlachtart und Viehgattung uneingeschränkt erlaubt."
   }
-]"""]
+]"""
+
+
+class MockChat(Chat):
+
+    def __init__(self):
+        self.batches: List[List[str]] = []
+
+    async def prompt(self, queries: List[str]) -> List[str]:
+        self.batches.append(queries)
+        return [CONTRADICTIONS if "das Gegenteil" in query else PARAPHRASES for query in queries]
 
 
-class TestBillAugmenter(unittest.TestCase):
+class TestBillAugmenter(unittest.IsolatedAsyncioTestCase):
 
-    def test_paraphrase_and_contradict(self):
+    async def test_paraphrase_and_contradict(self):
         augmenter: BillAugmenter = TestBillAugmenter.__create_mock_augmenter()
-        augmented_ballots: List[DoubleMajorityBallot] = augmenter.paraphrase_and_contradict(
+        augmented_ballots: List[DoubleMajorityBallot] = await augmenter.paraphrase_and_contradict(
             TestBillAugmenter.__get_ballots())
         self.assertEqual(20, len(augmented_ballots))
         self.assertEqual(
@@ -129,20 +132,109 @@ class TestBillAugmenter(unittest.TestCase):
         self.assertEqual(
             "Die Volksinitiative lautet:\n\nDie Bundesverfassung wird wie folgt ergänzt:\n\nArt. 25^bis (neu)\n\nDas Schlachten der Tiere ohne vorherige Betäubung vor dem Blutentzuge ist bei jeder Schlachtart und Viehgattung uneingeschränkt erlaubt.", augmented_ballots[19].bill.wording)
 
+    async def test_paraphrase_and_contradict_batch(self):
+        chat = MockChat()
+        augmenter = BillAugmenter(chat, default_rng(DEFAULT_SEED), 10)
+        ballots: List[DoubleMajorityBallot] = TestBillAugmenter.__get_ballots()
+        other_ballot = DoubleMajorityBallot(
+            Bill("Titel", "Wortlaut", datetime(1900, 1, 1)),
+            BallotStatus.COMPLETED,
+            DoubleMajorityBallotResult(Decimal("30.5"), Decimal("20")))
+        ballots.append(other_ballot)
+
+        groups: List[List[DoubleMajorityBallot]] = await augmenter.paraphrase_and_contradict_each(
+            ballots)
+        self.assertEqual(1, len(chat.batches))
+        self.assertListEqual([
+            augmenter.create_paraphrase_prompt(ballots[0]),
+            augmenter.create_contradiction_prompt(ballots[0]),
+            augmenter.create_paraphrase_prompt(other_ballot),
+            augmenter.create_contradiction_prompt(other_ballot)], chat.batches[0])
+        self.assertListEqual([20, 20], [len(group) for group in groups])
+        self.assertIs(ballots[0], groups[0][0])
+        self.assertIs(other_ballot, groups[1][0])
+        self.assertTrue(all(ballot.bill.date == datetime(
+            1900, 1, 1) for ballot in groups[1]))
+        self.assertLess(groups[1][1].result.percentage_yes, Decimal(50))
+        self.assertGreaterEqual(
+            groups[1][19].result.percentage_yes, Decimal(50))
+
+        flattened: List[DoubleMajorityBallot] = await BillAugmenter(
+            MockChat(), default_rng(DEFAULT_SEED), 10).paraphrase_and_contradict(ballots)
+        self.assertListEqual([(ballot.bill.title, ballot.result.percentage_yes) for group in groups for ballot in group], [
+                             (ballot.bill.title, ballot.result.percentage_yes) for ballot in flattened])
+
+    async def test_paraphrase_and_contradict_empty(self):
+        chat = MockChat()
+        augmenter = BillAugmenter(chat, default_rng(DEFAULT_SEED), 10)
+        self.assertListEqual([], await augmenter.paraphrase_and_contradict([]))
+        self.assertListEqual([[]], chat.batches)
+
     def test_augment_vote(self):
         augment: BillAugmenter = TestBillAugmenter.__create_mock_augmenter()
-        result: DoubleMajorityBallotResult = augment._BillAugmenter__augment_vote(
-            Decimal("45.52"), Decimal("34.78"), False)
+        result: DoubleMajorityBallotResult = augment.augment_votes(
+            np.array([45.52]), np.array([34.78]), np.array([False]))[0]
         self.assertLess(result.percentage_yes, Decimal(50.0))
         self.assertLess(result.accepting_cantons, Decimal(50.0))
 
     def test_augment_vote_flip(self):
         augment: BillAugmenter = TestBillAugmenter.__create_mock_augmenter()
-        result: DoubleMajorityBallotResult = augment._BillAugmenter__augment_vote(
-            Decimal("45.52"), Decimal("34.78"), True)
+        result: DoubleMajorityBallotResult = augment.augment_votes(
+            np.array([45.52]), np.array([34.78]), np.array([True]))[0]
         self.assertGreaterEqual(result.percentage_yes, Decimal(50.0))
         self.assertGreaterEqual(result.accepting_cantons, Decimal(50.0))
 
+    def test_truncated_normal_distribution(self):
+        value: Decimal = TestBillAugmenter.__create_mock_augmenter(
+        ).truncated_normal_distribution(Decimal("45.52"))
+        expected: np.ndarray = TestBillAugmenter.__create_mock_augmenter(
+        ).truncated_normal_distributions(np.array([45.52]))
+        self.assertEqual(Decimal(expected[0]).quantize(Decimal("0.01")), value)
+        self.assertLess(value, Decimal(50.0))
+        self.assertEqual(-2, value.as_tuple().exponent)
+
+    def test_augment_votes(self):
+        augmenter: BillAugmenter = TestBillAugmenter.__create_mock_augmenter()
+        results: List[DoubleMajorityBallotResult] = augmenter.augment_votes(
+            np.array([45.52, 45.52, 60.0]), np.array([34.78, 34.78, 100.0]), np.array([False, True, False]))
+        self.assertEqual(3, len(results))
+        self.assertLess(results[0].percentage_yes, Decimal(50.0))
+        self.assertLess(results[0].accepting_cantons, Decimal(50.0))
+        self.assertGreaterEqual(results[1].percentage_yes, Decimal(50.0))
+        self.assertGreaterEqual(results[1].accepting_cantons, Decimal(50.0))
+        self.assertGreaterEqual(results[2].percentage_yes, Decimal(50.0))
+        self.assertLessEqual(results[2].accepting_cantons, Decimal(100.0))
+        self.assertEqual(-2, results[0].percentage_yes.as_tuple().exponent)
+
+    def test_augment_votes_reproducible(self):
+        percentages_yes: np.ndarray = np.linspace(0.0, 100.0, 1001)
+        accepting_cantons: np.ndarray = percentages_yes[::-1].copy()
+        flip_results: np.ndarray = np.arange(1001) % 3 == 0
+        results: List[DoubleMajorityBallotResult] = TestBillAugmenter.__create_mock_augmenter(
+        ).augment_votes(percentages_yes, accepting_cantons, flip_results)
+        repeated: List[DoubleMajorityBallotResult] = TestBillAugmenter.__create_mock_augmenter(
+        ).augment_votes(percentages_yes, accepting_cantons, flip_results)
+        self.assertListEqual([(result.percentage_yes, result.accepting_cantons) for result in results], [
+                             (result.percentage_yes, result.accepting_cantons) for result in repeated])
+
+        generator: Generator = default_rng(DEFAULT_SEED)
+        augmenter = BillAugmenter(MockChat(), generator, 10)
+        for index in range(len(results)):
+            expected: np.ndarray = np.array([percentages_yes[index], accepting_cantons[index]])
+            if flip_results[index]:
+                expected = 100.0 - expected
+            samples: np.ndarray = augmenter.truncated_normal_distributions(expected)
+            self.assertEqual(Decimal(samples[0]).quantize(
+                Decimal("0.01")), results[index].percentage_yes)
+            self.assertEqual(Decimal(samples[1]).quantize(
+                Decimal("0.01")), results[index].accepting_cantons)
+            self.assertListEqual(
+                (expected >= 50.0).tolist(), (samples >= 50.0).tolist())
+
+    def test_augment_votes_empty(self):
+        self.assertListEqual([], TestBillAugmenter.__create_mock_augmenter().augment_votes(
+            np.empty(0), np.empty(0), np.empty(0, dtype=bool)))
+
     @staticmethod
     def __create_mock_augmenter():
         return BillAugmenter(MockChat(), default_rng(DEFAULT_SEED), 10)
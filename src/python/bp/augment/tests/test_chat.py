@@ -1,8 +1,10 @@
-from bp.augment.chat import CachedChat, Chat
+from bp.augment.chat import CachedChat, Chat, SqliteCachedChat
 
 import aiofiles
+import asyncio
 import jsonpickle
 import os
+import sqlite3
 import tempfile
 import unittest
 from typing import List
@@ -10,15 +12,15 @@ from typing import List
 
 class MockChat(Chat):
 
-    def prompt(self, queries: List[str]) -> List[str]:
-        return super().prompt(queries)
+    async def prompt(self, queries: List[str]) -> List[str]:
+        return await super().prompt(queries)
 
 
-class TestChat(unittest.TestCase):
+class TestChat(unittest.IsolatedAsyncioTestCase):
 
-    def test_prompt(self):
+    async def test_prompt(self):
         chat = MockChat()
-        self.assertIsNone(chat.prompt(None))
+        self.assertIsNone(await chat.prompt(None))
 
     def test_remove_json_markup(self):
         self.assertEqual("""[
@@ -41,8 +43,10 @@ class CountingEchoChat(Chat):
 
     def __init__(self) -> None:
         self.history = {}
+        self.batches: List[List[str]] = []
 
-    def prompt(self, queries: List[str]) -> List[str]:
+    async def prompt(self, queries: List[str]) -> List[str]:
+        self.batches.append(queries)
         for query in queries:
             current_count: int = self.history.get(query)
             if current_count is None:
@@ -51,20 +55,28 @@ class CountingEchoChat(Chat):
         return queries
 
 
-class TestCountingEchoChat(unittest.TestCase):
+class FailingEchoChat(CountingEchoChat):
+
+    async def prompt(self, queries: List[str]) -> List[str]:
+        if "fail" in queries:
+            raise ValueError("fail")
+        return await super().prompt(queries)
+
 
-    def test_prompt(self):
+class TestCountingEchoChat(unittest.IsolatedAsyncioTestCase):
+
+    async def test_prompt(self):
         chat = CountingEchoChat()
         self.assertListEqual(
             ["prompt-1"],
-            chat.prompt(["prompt-1"]))
+            await chat.prompt(["prompt-1"]))
         self.assertDictEqual(
             {"prompt-1": 1},
             chat.history
         )
         self.assertListEqual(
             ["prompt-1"],
-            chat.prompt(["prompt-1"]))
+            await chat.prompt(["prompt-1"]))
         self.assertDictEqual(
             {"prompt-1": 2},
             chat.history
@@ -83,14 +95,14 @@ class TestCachedChat(unittest.IsolatedAsyncioTestCase):
             async with CachedChat(wrapped_chat, cache_file) as chat:
                 self.assertListEqual(
                     ["prompt-1", "prompt-2"],
-                    chat.prompt(["prompt-1", "prompt-2"]))
+                    await chat.prompt(["prompt-1", "prompt-2"]))
                 self.assertListEqual(
                     ["prompt-1"],
-                    chat.prompt(["prompt-1"])
+                    await chat.prompt(["prompt-1"])
                 )
                 self.assertListEqual(
                     ["prompt-3"],
-                    chat.prompt(["prompt-3"])
+                    await chat.prompt(["prompt-3"])
                 )
                 self.assertDictEqual(
                     {
@@ -115,7 +127,7 @@ class TestCachedChat(unittest.IsolatedAsyncioTestCase):
             async with CachedChat(wrapped_chat, cache_file) as chat:
                 self.assertListEqual(
                     ["prompt-1", "prompt-2", "prompt-3"],
-                    chat.prompt(["prompt-1", "prompt-2", "prompt-3"]))
+                    await chat.prompt(["prompt-1", "prompt-2", "prompt-3"]))
                 self.assertDictEqual(
                     {
                         "prompt-1": 1,
@@ -126,3 +138,190 @@ class TestCachedChat(unittest.IsolatedAsyncioTestCase):
                 )
         finally:
             os.remove(cache_file)
+
+    async def test_prompt_duplicates(self):
+        cache_file: str
+        with tempfile.NamedTemporaryFile() as temp_file_generator:
+            cache_file = temp_file_generator.name
+
+        try:
+            wrapped_chat = CountingEchoChat()
+            async with CachedChat(wrapped_chat, cache_file) as chat:
+                self.assertListEqual(
+                    ["prompt-1", "prompt-2", "prompt-1", "prompt-1"],
+                    await chat.prompt(["prompt-1", "prompt-2", "prompt-1", "prompt-1"]))
+                self.assertListEqual(
+                    ["prompt-2", "prompt-3", "prompt-3"],
+                    await chat.prompt(["prompt-2", "prompt-3", "prompt-3"]))
+                self.assertDictEqual(
+                    {"prompt-1": 1, "prompt-2": 1, "prompt-3": 1}, wrapped_chat.history)
+                self.assertEqual(1, chat.hits)
+                self.assertEqual(3, chat.misses)
+                self.assertEqual(3, chat.deduplicated)
+        finally:
+            os.remove(cache_file)
+
+
+    async def test_prompt_batches(self):
+        cache_file: str
+        with tempfile.NamedTemporaryFile() as temp_file_generator:
+            cache_file = temp_file_generator.name
+
+        try:
+            wrapped_chat = CountingEchoChat()
+            async with CachedChat(wrapped_chat, cache_file, batch_size=2) as chat:
+                self.assertListEqual(["prompt-1", "prompt-2", "prompt-3", "prompt-1"],
+                                     await chat.prompt(["prompt-1", "prompt-2", "prompt-3", "prompt-1"]))
+            self.assertListEqual(
+                [["prompt-1", "prompt-2"], ["prompt-3"]], wrapped_chat.batches)
+        finally:
+            os.remove(cache_file)
+
+    async def test_prompt_failure(self):
+        cache_file: str
+        with tempfile.NamedTemporaryFile() as temp_file_generator:
+            cache_file = temp_file_generator.name
+
+        try:
+            async with CachedChat(FailingEchoChat(), cache_file, batch_size=2) as chat:
+                with self.assertRaises(ValueError):
+                    await chat.prompt(["prompt-1", "prompt-2", "fail", "prompt-3"])
+
+            async with aiofiles.open(cache_file) as file:
+                self.assertDictEqual(
+                    {"prompt-1": "prompt-1", "prompt-2": "prompt-2"}, jsonpickle.decode(await file.read()))
+        finally:
+            os.remove(cache_file)
+
+
+class Clock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSqliteCachedChat(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, "cache.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_prompt(self):
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, legacy_cache_file=None) as chat:
+            self.assertListEqual(
+                ["prompt-1", "prompt-2"],
+                await chat.prompt(["prompt-1", "prompt-2"]))
+            self.assertListEqual(
+                ["prompt-1", "prompt-3", "prompt-3"],
+                await chat.prompt(["prompt-1", "prompt-3", "prompt-3"]))
+            self.assertListEqual([], await chat.prompt([]))
+            self.assertEqual(1, chat.hits)
+            self.assertEqual(3, chat.misses)
+            self.assertEqual(1, chat.deduplicated)
+        self.assertDictEqual(
+            {"prompt-1": 1, "prompt-2": 1, "prompt-3": 1}, wrapped_chat.history)
+
+        async with SqliteCachedChat(wrapped_chat, "model", self.database) as chat:
+            self.assertEqual(3, chat.size)
+            self.assertListEqual(
+                ["prompt-3", "prompt-2", "prompt-1"],
+                await chat.prompt(["prompt-3", "prompt-2", "prompt-1"]))
+        self.assertDictEqual(
+            {"prompt-1": 1, "prompt-2": 1, "prompt-3": 1}, wrapped_chat.history)
+
+        async with SqliteCachedChat(wrapped_chat, "other-model", self.database) as chat:
+            self.assertListEqual(["prompt-1"], await chat.prompt(["prompt-1"]))
+        self.assertEqual(2, wrapped_chat.history["prompt-1"])
+
+    async def test_write_through(self):
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, legacy_cache_file=None) as chat:
+            await chat.prompt(["prompt-1"])
+            with sqlite3.connect(self.database) as connection:
+                self.assertEqual(1, connection.execute(
+                    "select count(*) from response").fetchone()[0])
+
+    async def test_prompt_failure(self):
+        wrapped_chat = FailingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, legacy_cache_file=None, batch_size=2) as chat:
+            with self.assertRaises(ValueError):
+                await chat.prompt(["prompt-1", "prompt-2", "fail", "prompt-3"])
+        async with SqliteCachedChat(wrapped_chat, "model", self.database) as chat:
+            self.assertEqual(2, chat.size)
+            self.assertListEqual(
+                ["prompt-1", "prompt-2"], await chat.prompt(["prompt-1", "prompt-2"]))
+        self.assertDictEqual(
+            {"prompt-1": 1, "prompt-2": 1}, wrapped_chat.history)
+
+    async def test_prompt_batches(self):
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, legacy_cache_file=None) as chat:
+            queries: List[str] = [f"prompt-{index}" for index in range(100)]
+            self.assertListEqual(queries, await chat.prompt(queries))
+            self.assertEqual(100, chat.size)
+        self.assertListEqual([queries[:64], queries[64:]], wrapped_chat.batches)
+
+    async def test_size_on_replace(self):
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, max_entries=2, legacy_cache_file=None) as chat:
+            await asyncio.gather(chat.prompt(["prompt-1"]), chat.prompt(["prompt-1"]))
+            await chat.prompt(["prompt-2"])
+            self.assertEqual(2, chat.size)
+            self.assertListEqual(
+                ["prompt-1", "prompt-2"], await chat.prompt(["prompt-1", "prompt-2"]))
+            with sqlite3.connect(self.database) as connection:
+                self.assertEqual(2, connection.execute(
+                    "select count(*) from response").fetchone()[0])
+        self.assertDictEqual(
+            {"prompt-1": 2, "prompt-2": 1}, wrapped_chat.history)
+
+    async def test_max_entries(self):
+        clock = Clock()
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, max_entries=2, legacy_cache_file=None, clock=clock) as chat:
+            await chat.prompt(["prompt-1"])
+            clock.now += 1
+            await chat.prompt(["prompt-2"])
+            clock.now += 1
+            await chat.prompt(["prompt-1"])
+            clock.now += 1
+            await chat.prompt(["prompt-3"])
+            self.assertEqual(2, chat.size)
+            clock.now += 1
+            await chat.prompt(["prompt-1", "prompt-2", "prompt-3"])
+        self.assertDictEqual(
+            {"prompt-1": 1, "prompt-2": 2, "prompt-3": 1}, wrapped_chat.history)
+
+    async def test_time_to_live(self):
+        clock = Clock()
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, time_to_live=10.0, legacy_cache_file=None, clock=clock) as chat:
+            await chat.prompt(["prompt-1"])
+            clock.now += 5
+            await chat.prompt(["prompt-2"])
+            clock.now += 5
+            await chat.prompt(["prompt-1", "prompt-2"])
+            self.assertEqual(2, chat.size)
+        self.assertDictEqual(
+            {"prompt-1": 2, "prompt-2": 1}, wrapped_chat.history)
+
+    async def test_legacy_cache_file(self):
+        cache_file: str = os.path.join(self.directory.name, "cache.json")
+        async with aiofiles.open(cache_file, "w") as file:
+            await file.write(jsonpickle.encode({"prompt-1": "response-1"}))
+
+        wrapped_chat = CountingEchoChat()
+        async with SqliteCachedChat(wrapped_chat, "model", self.database, legacy_cache_file=cache_file) as chat:
+            self.assertListEqual(["response-1"], await chat.prompt(["prompt-1"]))
+        self.assertDictEqual({}, wrapped_chat.history)
+
+        missing_database: str = os.path.join(self.directory.name, "new.db")
+        async with SqliteCachedChat(wrapped_chat, "model", missing_database, legacy_cache_file=missing_database + ".json") as chat:
+            self.assertEqual(0, chat.size)
@@ -0,0 +1,88 @@
+from bp.augment.chat import SqliteCachedChat
+from bp.augment.concurrent import ConcurrentChatGpt
+from bp.augment.tests.server import CompletionServer
+
+import openai
+import os
+import random
+import tempfile
+import unittest
+from typing import List
+
+
+class TestConcurrentChatGpt(unittest.IsolatedAsyncioTestCase):
+
+    async def test_prompt(self):
+        queries: List[str] = [f"query {index}" for index in range(10)]
+        with CompletionServer(lambda prompt: prompt.upper()) as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url(), requests_per_minute=None, tokens_per_minute=None) as chat:
+                self.assertListEqual([query.upper() for query in queries], await chat.prompt(queries))
+        self.assertCountEqual(queries, [request[0]
+                              for request in server.requests])
+
+    async def test_cached(self):
+        with tempfile.TemporaryDirectory() as directory, CompletionServer(lambda prompt: prompt.upper()) as server:
+            database: str = os.path.join(directory, "cache.db")
+            for _ in range(2):
+                async with ConcurrentChatGpt(api_key="key", base_url=server.url()) as chat, SqliteCachedChat(chat, chat.model, database, legacy_cache_file=None) as cached_chat:
+                    self.assertListEqual(["A", "B", "A"], await cached_chat.prompt(["a", "b", "a"]))
+        self.assertCountEqual(["a", "b"], [request[0] for request in server.requests])
+
+    async def test_prompt_empty(self):
+        with CompletionServer() as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url()) as chat:
+                self.assertListEqual([], await chat.prompt([]))
+        self.assertListEqual([], server.requests)
+
+    async def test_remove_json_markup(self):
+        with CompletionServer(lambda prompt: f"```json\n{prompt}\n```") as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url()) as chat:
+                self.assertListEqual(["[]\n"], await chat.prompt(["[]"]))
+
+    async def test_max_concurrency(self):
+        queries: List[str] = [str(index) for index in range(12)]
+        with CompletionServer(delay=0.05) as server:
+            async with ConcurrentChatGpt(max_concurrency=3, api_key="key", base_url=server.url(), requests_per_minute=None, tokens_per_minute=None) as chat:
+                self.assertListEqual(queries, await chat.prompt(queries))
+        self.assertEqual(3, server.max_in_flight)
+
+    async def test_requests_per_minute(self):
+        with CompletionServer() as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url(), requests_per_minute=1200.0, tokens_per_minute=None) as chat:
+                await chat.prompt(["a", "b", "c", "d", "e"])
+        times: List[float] = sorted(request[1] for request in server.requests)
+        self.assertGreaterEqual(times[-1] - times[0], 4 * 0.05 * 0.8)
+
+    async def test_tokens_per_minute(self):
+        with CompletionServer() as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url(), requests_per_minute=None, tokens_per_minute=6000.0) as chat:
+                await chat.prompt(["x" * 16, "y" * 16, "z" * 16])
+        times: List[float] = sorted(request[1] for request in server.requests)
+        self.assertGreaterEqual(times[-1] - times[0], 2 * 0.05 * 0.8)
+
+    async def test_retry(self):
+        with CompletionServer(failures=2, failure_status=500) as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url(), initial_backoff=0.01, generator=random.Random(0)) as chat:
+                self.assertListEqual(["query"], await chat.prompt(["query"]))
+        self.assertEqual(3, len(server.requests))
+
+    async def test_retry_exhausted(self):
+        with CompletionServer(failures=3) as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url(), max_attempts=3, initial_backoff=0.01, generator=random.Random(0)) as chat:
+                with self.assertRaises(openai.RateLimitError):
+                    await chat.prompt(["query"])
+        self.assertEqual(3, len(server.requests))
+
+    async def test_no_retry(self):
+        with CompletionServer(failures=1, failure_status=400) as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url()) as chat:
+                with self.assertRaises(openai.BadRequestError):
+                    await chat.prompt(["query"])
+        self.assertEqual(1, len(server.requests))
+
+    async def test_no_content(self):
+        with CompletionServer(lambda prompt: None) as server:
+            async with ConcurrentChatGpt(api_key="key", base_url=server.url()) as chat:
+                with self.assertRaisesRegex(ValueError, "content_filter"):
+                    await chat.prompt(["query"])
+        self.assertEqual(1, len(server.requests))
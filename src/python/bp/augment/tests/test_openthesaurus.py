@@ -1,32 +1,160 @@
-from bp.augment.openthesaurus import OpenThesaurus
+from bp.augment.openthesaurus import MAX_VARIABLES, OpenThesaurus, main
+from bp.augment.tests.thesaurus import ThesaurusFixture
 
+import asyncio
 import os
+import sqlite3
 import tempfile
 import unittest
+from pathlib import Path
 
-from typing import List
+from typing import Dict, List
 
 
 class TestOpenthesaurus(unittest.IsolatedAsyncioTestCase):
 
-    async def test_create_database_if_not_exists(self):
-        database: str
-        with tempfile.NamedTemporaryFile() as temp_file_generator:
-            database = temp_file_generator.name
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.database: str = os.path.join(cls.directory.name, "openthesaurus.db")
+        asyncio.run(main(["build", "--database", cls.database]))
 
-        try:
-            async with OpenThesaurus(database):
-                self.assertGreaterEqual(os.path.getsize(database), 50 << 20)
-        finally:
-            os.remove(database)
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_build(self):
+        self.assertGreaterEqual(os.path.getsize(self.database), 50 << 20)
 
     async def test_find_synonyms(self):
-        async with OpenThesaurus() as thesaurus:
+        async with OpenThesaurus(self.database) as thesaurus:
             synonyms: List[str] = await thesaurus.find_synonyms("Junge")
             self.assertCountEqual(["Knirps", "Knabe", "Bub", "Wicht", "Bube", "Pimpf", "Steppke", "Kerlchen",
                                   "Jungchen", "Bengel", "Kleiner", "Kurzer", "Bauer", "Bube", "Unter", "Wuenscher"], synonyms)
 
     async def test_find_antonyms(self):
-        async with OpenThesaurus() as thesaurus:
+        async with OpenThesaurus(self.database) as thesaurus:
             antonyms: List[str] = await thesaurus.find_antonyms("Mann")
             self.assertCountEqual(["Frau"], antonyms)
+
+
+class TestOpenThesaurusFixture(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.fixture = ThesaurusFixture().__enter__()
+
+    def tearDown(self):
+        self.fixture.__exit__(None, None, None)
+
+    async def test_find_synonyms(self):
+        for preload in [False, True]:
+            async with OpenThesaurus(self.fixture.database, preload) as thesaurus:
+                self.assertCountEqual(["Knabe", "Bub"], await thesaurus.find_synonyms("Junge"))
+                self.assertCountEqual(["verboten", "nicht erlaubt"], await thesaurus.find_synonyms("untersagt"))
+                self.assertListEqual([], await thesaurus.find_synonyms("unbekannt"))
+
+    async def test_find_antonyms(self):
+        for preload in [False, True]:
+            async with OpenThesaurus(self.fixture.database, preload) as thesaurus:
+                self.assertListEqual(["Frau"], await thesaurus.find_antonyms("Mann"))
+                self.assertListEqual(["erlaubt"], await thesaurus.find_antonyms("verboten"))
+                self.assertListEqual([], await thesaurus.find_antonyms("Junge"))
+
+    async def test_find_many(self):
+        terms: List[str] = ["Junge", "Mann", "unbekannt", "Junge", "verboten"]
+        for preload in [False, True]:
+            async with OpenThesaurus(self.fixture.database, preload) as thesaurus:
+                synonyms: Dict[str, List[str]] = await thesaurus.find_synonyms_many(terms)
+                self.assertListEqual(["Junge", "Mann", "unbekannt", "verboten"], list(synonyms))
+                self.assertCountEqual(["Knabe", "Bub"], synonyms["Junge"])
+                self.assertListEqual(["Herr"], synonyms["Mann"])
+                self.assertListEqual([], synonyms["unbekannt"])
+                self.assertCountEqual(["untersagt", "nicht erlaubt"], synonyms["verboten"])
+                self.assertDictEqual({"Junge": [], "Mann": ["Frau"], "unbekannt": [], "verboten": ["erlaubt"]},
+                                     await thesaurus.find_antonyms_many(terms))
+
+    async def test_find_many_chunks(self):
+        terms: List[str] = [f"unbekannt-{index}" for index in range(
+            2 * MAX_VARIABLES)] + ["Junge"]
+        async with OpenThesaurus(self.fixture.database) as thesaurus:
+            synonyms: Dict[str, List[str]] = await thesaurus.find_synonyms_many(terms)
+        self.assertEqual(len(terms), len(synonyms))
+        self.assertCountEqual(["Knabe", "Bub"], synonyms["Junge"])
+
+    async def test_cache(self):
+        async with OpenThesaurus(self.fixture.database, cache_size=2) as thesaurus:
+            synonyms: List[str] = await thesaurus.find_synonyms("Junge")
+            synonyms.clear()
+            self.assertCountEqual(["Knabe", "Bub"], await thesaurus.find_synonyms("Junge"))
+            await thesaurus.find_synonyms("Mann")
+            await thesaurus.find_synonyms("Junge")
+            await thesaurus.find_synonyms("Tier")
+            await thesaurus.find_synonyms("Junge")
+            await thesaurus.find_synonyms("Mann")
+            self.assertListEqual(["Frau"], await thesaurus.find_antonyms("Mann"))
+            self.assertListEqual(["Frau"], await thesaurus.find_antonyms("Mann"))
+            self.assertEqual(4, thesaurus.cache_hits)
+            self.assertEqual(5, thesaurus.cache_misses)
+
+    async def test_build_database(self):
+        dump: str = os.path.join(self.fixture.directory.name, "dump.sql")
+        with sqlite3.connect(self.fixture.database) as connection:
+            Path(dump).write_text("\n".join(connection.iterdump()), "utf8")
+        connection.close()
+        database: str = os.path.join(self.fixture.directory.name, "built.db")
+        Path(f"{database}.tmp").write_text("incomplete")
+
+        await OpenThesaurus.build_database(database, dump)
+        self.assertFalse(os.path.exists(f"{database}.tmp"))
+        with sqlite3.connect(database) as connection:
+            indexes: List[str] = [row[0] for row in connection.execute(
+                "select name from sqlite_master where type = 'index'")]
+            statistics: int = connection.execute(
+                "select count(*) from sqlite_stat1").fetchone()[0]
+        connection.close()
+        self.assertCountEqual(
+            ["term_word", "term_synset_id", "term_link_term_id_link_type_id"], indexes)
+        self.assertGreater(statistics, 0)
+
+        async with OpenThesaurus(database) as thesaurus:
+            self.assertCountEqual(["Knabe", "Bub"], await thesaurus.find_synonyms("Junge"))
+            self.assertListEqual(["Frau"], await thesaurus.find_antonyms("Mann"))
+            with self.assertRaises(sqlite3.OperationalError):
+                await thesaurus.connections[0].execute("delete from term")
+
+        await OpenThesaurus.build_database(database, dump)
+        async with OpenThesaurus(database) as thesaurus:
+            self.assertCountEqual(["Knabe", "Bub"], await thesaurus.find_synonyms("Junge"))
+
+    async def test_main(self):
+        dump: str = os.path.join(self.fixture.directory.name, "dump.sql")
+        with sqlite3.connect(self.fixture.database) as connection:
+            Path(dump).write_text("\n".join(connection.iterdump()), "utf8")
+        connection.close()
+        database: str = os.path.join(self.fixture.directory.name, "built.db")
+
+        await main(["build", "--dump", dump, "--database", database])
+        async with OpenThesaurus(database) as thesaurus:
+            self.assertCountEqual(["Knabe", "Bub"], await thesaurus.find_synonyms("Junge"))
+
+    async def test_missing_database(self):
+        database: str = os.path.join(self.fixture.directory.name, "missing.db")
+        with self.assertRaises(FileNotFoundError):
+            async with OpenThesaurus(database):
+                pass
+        self.assertFalse(os.path.exists(database))
+
+    async def test_concurrent_lookups(self):
+        words: List[str] = ["Junge", "Mann", "Tier", "unbekannt"] * 8
+        for pool_size in [1, 4]:
+            async with OpenThesaurus(self.fixture.database, cache_size=0, pool_size=pool_size) as thesaurus:
+                synonyms: List[List[str]] = await asyncio.gather(*[thesaurus.find_synonyms(word) for word in words])
+                antonyms: List[List[str]] = await asyncio.gather(*[thesaurus.find_antonyms(word) for word in words])
+                self.assertEqual(pool_size, len(thesaurus.connections))
+                self.assertEqual(pool_size, thesaurus.pool.qsize())
+            for index in range(0, len(words), 4):
+                self.assertCountEqual(["Knabe", "Bub"], synonyms[index])
+                self.assertListEqual(["Herr"], synonyms[index + 1])
+                self.assertCountEqual(["Lebewesen", "Viech"], synonyms[index + 2])
+                self.assertListEqual([], synonyms[index + 3])
+                self.assertListEqual(["Frau"], antonyms[index + 1])
@@ -0,0 +1,92 @@
+from bp.augment.openthesaurus import OpenThesaurus
+from bp.augment.seed import DEFAULT_SEED
+from bp.augment.tests.thesaurus import ThesaurusFixture
+from bp.augment.thesaurus import ThesaurusAugmenter
+from bp.entity.ballot import BallotStatus, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.bill import Bill
+
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from numpy.random import default_rng
+from typing import List
+
+
+BALLOTS: List[DoubleMajorityBallot] = [
+    DoubleMajorityBallot(
+        Bill("Verbot für Junge", "Art. 25 Das Schlachten der Tier ist untersagt.",
+             datetime(1892, 5, 10)),
+        BallotStatus.COMPLETED,
+        DoubleMajorityBallotResult(Decimal("52.27"), Decimal("60.1"))),
+    DoubleMajorityBallot(
+        Bill("Mann", "Ohne Synonyme 1234", datetime(1900, 1, 1)),
+        BallotStatus.COMPLETED,
+        DoubleMajorityBallotResult(Decimal("30.5"), Decimal("20")))
+]
+"""List[DoubleMajorityBallot]: Ballots using words of the thesaurus fixture."""
+
+
+class TestThesaurusAugmenter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.fixture = ThesaurusFixture().__enter__()
+
+    def tearDown(self):
+        self.fixture.__exit__(None, None, None)
+
+    async def test_paraphrase(self):
+        async with OpenThesaurus(self.fixture.database) as thesaurus:
+            augmenter = ThesaurusAugmenter(
+                thesaurus, default_rng(DEFAULT_SEED), 5)
+            groups: List[List[DoubleMajorityBallot]] = await augmenter.paraphrase_each(BALLOTS)
+
+        self.assertListEqual([6, 6], [len(group) for group in groups])
+        self.assertIs(BALLOTS[0], groups[0][0])
+        self.assertIs(BALLOTS[1], groups[1][0])
+        for ballot, group in zip(BALLOTS, groups):
+            for variant in group[1:]:
+                self.assertIs(ballot.result, variant.result)
+                self.assertIs(ballot.status, variant.status)
+                self.assertEqual(ballot.bill.date, variant.bill.date)
+        for variant in groups[1][1:]:
+            self.assertIn(variant.bill.title, ["Mann", "Herr"])
+            self.assertEqual("Ohne Synonyme 1234", variant.bill.wording)
+        self.assertTrue(any(variant.bill.title != BALLOTS[0].bill.title or variant.bill.wording !=
+                        BALLOTS[0].bill.wording for variant in groups[0][1:]))
+        for variant in groups[0][1:]:
+            self.assertRegex(variant.bill.title,
+                             "^(Verbot|Untersagung|Unterbindung) für (Junge|Knabe|Bub)$")
+            self.assertRegex(variant.bill.wording,
+                             "^Art\\. 25 Das Schlachten der (Tier|Lebewesen|Viech) ist (untersagt|verboten|nicht erlaubt)\\.$")
+
+    async def test_paraphrase_reproducible(self):
+        async with OpenThesaurus(self.fixture.database) as thesaurus:
+            first: List[DoubleMajorityBallot] = await ThesaurusAugmenter(
+                thesaurus, default_rng(DEFAULT_SEED), 10).paraphrase(BALLOTS)
+            second: List[DoubleMajorityBallot] = await ThesaurusAugmenter(
+                thesaurus, default_rng(DEFAULT_SEED), 10).paraphrase(BALLOTS)
+        self.assertEqual(22, len(first))
+        self.assertListEqual([(ballot.bill.title, ballot.bill.wording) for ballot in first],
+                             [(ballot.bill.title, ballot.bill.wording) for ballot in second])
+
+    async def test_substitution_probability(self):
+        async with OpenThesaurus(self.fixture.database) as thesaurus:
+            unchanged: List[DoubleMajorityBallot] = await ThesaurusAugmenter(
+                thesaurus, default_rng(DEFAULT_SEED), 3, 0.0).paraphrase(BALLOTS[:1])
+            changed: List[DoubleMajorityBallot] = await ThesaurusAugmenter(
+                thesaurus, default_rng(DEFAULT_SEED), 3, 1.0).paraphrase(BALLOTS[:1])
+
+        for variant in unchanged[1:]:
+            self.assertEqual(BALLOTS[0].bill.title, variant.bill.title)
+            self.assertEqual(BALLOTS[0].bill.wording, variant.bill.wording)
+        for variant in changed[1:]:
+            self.assertRegex(variant.bill.title,
+                             "^(Untersagung|Unterbindung) für (Knabe|Bub)$")
+            self.assertRegex(variant.bill.wording,
+                             "^Art\\. 25 Das Schlachten der (Lebewesen|Viech) ist (verboten|nicht erlaubt)\\.$")
+
+    async def test_paraphrase_empty(self):
+        async with OpenThesaurus(self.fixture.database) as thesaurus:
+            augmenter = ThesaurusAugmenter(
+                thesaurus, default_rng(DEFAULT_SEED), 5)
+            self.assertListEqual([], await augmenter.paraphrase([]))
@@ -0,0 +1,56 @@
+from typing import Dict, List, Tuple
+
+import os
+import sqlite3
+import tempfile
+
+
+SYNSETS: Dict[int, List[Tuple[str, str | None]]] = {
+    1: [("Junge", None), ("Knabe", None), ("Bub", None)],
+    2: [("Verbot", None), ("Untersagung", None), ("Unterbindung", None)],
+    3: [("Tier", None), ("Lebewesen", None), ("Viech", None)],
+    4: [("untersagt", None), ("verboten", None), ("(etwas ist) nicht erlaubt", "nicht erlaubt")],
+    5: [("Mann", None), ("Herr", None)],
+    6: [("Frau", None), ("Dame", None)]
+}
+"""Dict[int, List[Tuple[str, str | None]]]: Word and normalised word of the
+terms in each synset of the fixture."""
+
+
+ANTONYMS: List[Tuple[str, str]] = [("Mann", "Frau"), ("verboten", "erlaubt")]
+"""List[Tuple[str, str]]: Antonym links between terms of the fixture."""
+
+
+class ThesaurusFixture:
+    """Creates a tiny OpenThesaurus database with the term and term_link
+    tables used by OpenThesaurus, so that thesaurus based code can be tested
+    without the full dump.
+    """
+
+    def __enter__(self):
+        """Creates the database in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.database: str = os.path.join(
+            self.directory.name, "openthesaurus.db")
+        with sqlite3.connect(self.database) as connection:
+            connection.executescript("""
+                create table term (id integer primary key, synset_id integer not null, word text not null, normalized_word text);
+                create table term_link (id integer primary key, term_id integer not null, target_term_id integer not null, link_type_id integer not null);
+            """)
+            for synset_id, terms in SYNSETS.items():
+                connection.executemany("insert into term (synset_id, word, normalized_word) values (?, ?, ?)", [
+                                       (synset_id, word, normalized_word) for word, normalized_word in terms])
+            connection.execute(
+                "insert into term (synset_id, word) values (7, 'erlaubt')")
+            for word, antonym in ANTONYMS:
+                connection.execute("""
+                    insert into term_link (term_id, target_term_id, link_type_id)
+                    select needle.id, antonym.id, 1 from term needle, term antonym
+                    where needle.word = ? and antonym.word = ?
+                """, [word, antonym])
+        connection.close()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Deletes the database."""
+        self.directory.cleanup()
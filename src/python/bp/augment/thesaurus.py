@@ -0,0 +1,148 @@
+from bp.augment.openthesaurus import OpenThesaurus
+from bp.entity.ballot import DoubleMajorityBallot
+from bp.entity.bill import Bill
+
+import numpy as np
+import re
+from numpy.random import Generator
+from typing import Dict, List, Set
+
+
+TOKEN: re.Pattern = re.compile(r"[^\W\d_]+")
+"""re.Pattern: Words considered for substitution. Numbers and other tokens
+containing digits, such as paragraph numbers, are never substituted."""
+
+
+SYNONYM: re.Pattern = re.compile(r"[^\W\d_]+(?:[ -][^\W\d_]+)*")
+"""re.Pattern: Synonyms used as substitutes. Excludes thesaurus entries with
+annotations, e.g. in parentheses."""
+
+
+MIN_TOKEN_LENGTH: int = 4
+"""int: Minimum length of substituted words, which excludes articles and
+abbreviations."""
+
+
+DEFAULT_SUBSTITUTION_PROBABILITY: float = 0.3
+"""float: Default probability of replacing a word with a synonym."""
+
+
+class ThesaurusAugmenter:
+    """Generates lexical variants of bills by replacing words of their title
+    and wording with random synonyms from OpenThesaurus. Runs offline on the
+    bundled thesaurus database. All distinct words of a batch of ballots are
+    looked up together, after which all variants are generated in memory.
+    """
+
+    def __init__(self, thesaurus: OpenThesaurus, generator: Generator, multiplier: int, substitution_probability: float = DEFAULT_SUBSTITUTION_PROBABILITY):
+        """Initialises the augmenter.
+
+        Args:
+            thesaurus (OpenThesaurus): Open thesaurus providing synonyms.
+            generator (Generator): Random seed used to select substituted
+            words and synonyms.
+            multiplier (int): Number of variants to generate per ballot.
+            substitution_probability (float, optional): Probability of
+            replacing each word that has synonyms. Defaults to
+            DEFAULT_SUBSTITUTION_PROBABILITY.
+        """
+        self.thesaurus = thesaurus
+        self.generator = generator
+        self.multiplier = multiplier
+        self.substitution_probability = substitution_probability
+
+    async def paraphrase(self, ballots: List[DoubleMajorityBallot]) -> List[DoubleMajorityBallot]:
+        """Generates multiplier new ballots for each ballot in ballots with
+        synonyms substituted in title and wording. Since the meaning is
+        unchanged, variants keep the status and result of their ballot.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to augment.
+
+        Returns:
+            List[DoubleMajorityBallot]: Each ballot followed by its variants.
+        """
+        return [new_ballot for group in await self.paraphrase_each(ballots) for new_ballot in group]
+
+    async def paraphrase_each(self, ballots: List[DoubleMajorityBallot]) -> List[List[DoubleMajorityBallot]]:
+        """Generates multiplier new ballots for each ballot in ballots with
+        synonyms substituted in title and wording.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to augment.
+
+        Returns:
+            List[List[DoubleMajorityBallot]]: For each ballot in order, the
+            ballot itself followed by its variants.
+        """
+        words: Set[str] = set()
+        for ballot in ballots:
+            words.update(TOKEN.findall(ballot.bill.title))
+            words.update(TOKEN.findall(ballot.bill.wording))
+        synonyms: Dict[str, List[str]] = await self.__find_synonyms(words)
+
+        groups: List[List[DoubleMajorityBallot]] = []
+        for ballot in ballots:
+            titles: List[str] = self.__substitute(
+                ballot.bill.title, synonyms)
+            wordings: List[str] = self.__substitute(
+                ballot.bill.wording, synonyms)
+            groups.append([ballot] + [DoubleMajorityBallot(
+                Bill(title, wording, ballot.bill.date),
+                ballot.status,
+                ballot.result
+            ) for title, wording in zip(titles, wordings)])
+        return groups
+
+    async def __find_synonyms(self, words: Set[str]) -> Dict[str, List[str]]:
+        """Looks up the substitutable synonyms of words in bulk.
+
+        Args:
+            words (Set[str]): Words to look up.
+
+        Returns:
+            Dict[str, List[str]]: Sorted distinct synonyms of each word of at
+            least MIN_TOKEN_LENGTH characters which has any.
+        """
+        found: Dict[str, List[str]] = await self.thesaurus.find_synonyms_many(
+            sorted(word for word in words if len(word) >= MIN_TOKEN_LENGTH))
+        synonyms: Dict[str, List[str]] = {}
+        for word, candidates in found.items():
+            substitutes: List[str] = sorted({synonym for synonym in candidates
+                                             if synonym != word and SYNONYM.fullmatch(synonym)})
+            if len(substitutes) > 0:
+                synonyms[word] = substitutes
+        return synonyms
+
+    def __substitute(self, text: str, synonyms: Dict[str, List[str]]) -> List[str]:
+        """Generates multiplier variants of text. All random numbers of the
+        variants are drawn in two vectorised calls.
+
+        Args:
+            text (str): Text in which to substitute words.
+            synonyms (Dict[str, List[str]]): Synonyms by word.
+
+        Returns:
+            List[str]: Variants of text.
+        """
+        matches: List[re.Match] = [
+            match for match in TOKEN.finditer(text) if match.group() in synonyms]
+        counts: np.ndarray = np.array(
+            [len(synonyms[match.group()]) for match in matches], dtype=np.int64)
+        substituted: np.ndarray = self.generator.random(
+            (self.multiplier, len(matches))) < self.substitution_probability
+        choices: np.ndarray = self.generator.integers(
+            0, counts, (self.multiplier, len(matches)))
+
+        variants: List[str] = []
+        for variant_substituted, variant_choices in zip(substituted.tolist(), choices.tolist()):
+            parts: List[str] = []
+            position: int = 0
+            for match, is_substituted, choice in zip(matches, variant_substituted, variant_choices):
+                if is_substituted:
+                    parts.append(text[position:match.start()])
+                    parts.append(synonyms[match.group()][choice])
+                    position = match.end()
+            parts.append(text[position:])
+            variants.append("".join(parts))
+        return variants
@@ -0,0 +1,45 @@
+from bp.data.codec import EntityCodec
+from bp.data.dedup import DeduplicatedCodec
+from bp.data.serialisation import AUGMENTED_INITIATIVES
+from bp.entity.ballot import DoubleMajorityBallot
+
+import asyncio
+import jsonpickle
+import timeit
+from typing import List
+
+
+REPETITIONS: int = 5
+"""int: Number of timed runs per format, of which the fastest is reported."""
+
+
+async def main():
+    """Micro-benchmark comparing size and load time of the stored augmented
+    initiatives in JSON against the deduplicated format. Loading the
+    deduplicated format includes rebuilding every ballot. Also counts the
+    ballots which differ after the deduplicated round trip. Excluded from unit
+    test coverage check, since this script is only executed manually.
+    """
+    with open(AUGMENTED_INITIATIVES, "rb") as file:
+        serialised: bytes = file.read()
+    ballots: List[DoubleMajorityBallot] = EntityCodec.decode(serialised)
+    deduplicated: bytes = DeduplicatedCodec.encode(ballots)
+
+    json_seconds: float = min(timeit.repeat(
+        lambda: EntityCodec.decode(serialised), number=1, repeat=REPETITIONS))
+    deduplicated_seconds: float = min(timeit.repeat(
+        lambda: list(DeduplicatedCodec.decode(deduplicated)), number=1, repeat=REPETITIONS))
+
+    decoded: List[DoubleMajorityBallot] = list(
+        DeduplicatedCodec.decode(deduplicated))
+    differences: int = sum(1 for expected, actual in zip(ballots, decoded)
+                           if jsonpickle.encode(expected) != jsonpickle.encode(actual))
+    differences += abs(len(ballots) - len(decoded))
+    print(f"{len(ballots)} augmented initiatives")
+    print(f"json:         {len(serialised)} bytes, {json_seconds:.4f}s")
+    print(f"deduplicated: {len(deduplicated)} bytes, {deduplicated_seconds:.4f}s")
+    print(f"differences: {differences}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
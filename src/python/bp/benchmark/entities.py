@@ -0,0 +1,72 @@
+from bp.data.serialisation import Serialisation
+from bp.entity.ballot import Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.frozen import FrozenDoubleMajorityBallot
+
+import asyncio
+import tracemalloc
+from typing import Any, Callable, List
+
+
+def measure_allocated_memory(function: Callable[[], Any]) -> int:
+    """Measures the memory allocated by Python for the value returned by
+    function, which is kept alive until the measurement is complete.
+
+    Args:
+        function (Callable[[], Any]): Function creating the measured value.
+
+    Returns:
+        int: Allocated bytes.
+    """
+    tracemalloc.start()
+    value: Any = function()
+    allocated: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return allocated
+
+
+def copy_ballot(ballot: DoubleMajorityBallot) -> DoubleMajorityBallot:
+    """Copies ballot, including its bill and result, but sharing the property
+    values, e.g. strings and decimals.
+
+    Args:
+        ballot (DoubleMajorityBallot): Ballot to copy.
+
+    Returns:
+        DoubleMajorityBallot: Mutable copy of ballot.
+    """
+    result: DoubleMajorityBallotResult | None = ballot.result
+    return DoubleMajorityBallot(
+        Bill(ballot.bill.title, ballot.bill.wording, ballot.bill.date),
+        ballot.status,
+        None if result is None else DoubleMajorityBallotResult(
+            result.percentage_yes, result.accepting_cantons),
+        ballot.details_url)
+
+
+async def main():
+    """Memory benchmark comparing the per-ballot footprint of the regular and
+    frozen entity classes on the stored initiatives. Both variants share the
+    same strings, dates and decimals, so that only the entity objects
+    themselves are measured. Excluded from unit test coverage check, since this
+    script is only executed manually.
+    """
+    initiatives: List[DoubleMajorityBallot] = await Serialisation.load_initiatives()
+    regular_bytes: int = measure_allocated_memory(
+        lambda: [copy_ballot(ballot) for ballot in initiatives])
+    frozen_bytes: int = measure_allocated_memory(
+        lambda: [FrozenDoubleMajorityBallot.from_ballot(ballot) for ballot in initiatives])
+    frozen: List[FrozenDoubleMajorityBallot] = [
+        FrozenDoubleMajorityBallot.from_ballot(ballot) for ballot in initiatives]
+    differences: int = sum(1 for ballot, frozen_ballot in zip(initiatives, frozen)
+                           if FrozenDoubleMajorityBallot.from_ballot(frozen_ballot.to_ballot()) != FrozenDoubleMajorityBallot.from_ballot(ballot))
+
+    print(f"{len(initiatives)} initiatives")
+    print(f"regular: {regular_bytes / len(initiatives):.1f} bytes per ballot")
+    print(f"frozen:  {frozen_bytes / len(initiatives):.1f} bytes per ballot")
+    print(f"distinct: {len(set(frozen))}")
+    print(f"differences: {differences}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+from bp.data.binary import BinaryCodec
+from bp.data.codec import EntityCodec
+from bp.data.lazy import BallotCollection
+from bp.data.serialisation import INITIATIVES, Serialisation
+from bp.data.shards import ShardedDataset
+from bp.entity.ballot import Bill, DoubleMajorityBallot
+
+import asyncio
+import jsonpickle
+import os
+import tempfile
+import time
+import timeit
+import tracemalloc
+from typing import Any, Awaitable, Callable, List
+
+
+REPETITIONS: int = 5
+"""int: Number of timed runs per format, of which the fastest is reported."""
+
+
+def measure_peak_memory(function: Callable[[], Any]) -> int:
+    """Measures the peak of memory allocated by Python while running function.
+    Memory-mapped pages are not included, since they are backed by the file.
+
+    Args:
+        function (Callable[[], Any]): Function to measure.
+
+    Returns:
+        int: Peak allocated bytes.
+    """
+    tracemalloc.start()
+    function()
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+async def measure_peak_memory_async(function: Callable[[], Awaitable[Any]]) -> int:
+    """Measures the peak of memory allocated by Python while awaiting function.
+
+    Args:
+        function (Callable[[], Awaitable[Any]]): Function to measure.
+
+    Returns:
+        int: Peak allocated bytes.
+    """
+    tracemalloc.start()
+    await function()
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+async def measure_seconds_async(function: Callable[[], Awaitable[Any]]) -> float:
+    """Measures the fastest of REPETITIONS runs of an asynchronous function.
+
+    Args:
+        function (Callable[[], Awaitable[Any]]): Function to measure.
+
+    Returns:
+        float: Seconds of the fastest run.
+    """
+    seconds: List[float] = []
+    for _ in range(REPETITIONS):
+        start: float = time.perf_counter()
+        await function()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+async def main():
+    """Micro-benchmark comparing loading the stored initiatives from JSON using
+    jsonpickle against EntityCodec, the binary format and a sharded dataset,
+    whose shards are decoded in parallel including process pool start-up. The
+    binary and sharded files are created from the JSON file in a temporary
+    directory. Also counts the initiatives which differ after decoding them with
+    EntityCodec or after the binary and sharded round trips, and reports each
+    load time as a speedup over jsonpickle. Finally compares the memory
+    needed to load all ballots at once against streaming them, and the memory
+    needed to collect all titles by decoding every ballot against iterating
+    over a memory-mapped BallotCollection.
+    Excluded from unit test coverage check, since this script is only executed
+    manually.
+    """
+    initiatives: List[DoubleMajorityBallot] = await Serialisation.load_initiatives()
+    with open(INITIATIVES) as file:
+        serialised: str = file.read()
+    serialised_bytes: bytes = serialised.encode("utf-8")
+    encoded: bytes = BinaryCodec.encode(initiatives)
+
+    json_seconds: float = min(timeit.repeat(
+        lambda: jsonpickle.decode(serialised), number=1, repeat=REPETITIONS))
+    codec_seconds: float = min(timeit.repeat(
+        lambda: EntityCodec.decode(serialised_bytes), number=1, repeat=REPETITIONS))
+    binary_seconds: float = min(timeit.repeat(
+        lambda: BinaryCodec.decode(encoded), number=1, repeat=REPETITIONS))
+
+    decoded: List[DoubleMajorityBallot] = BinaryCodec.decode(encoded)
+    differences: int = sum(1 for expected, actual in zip(initiatives, decoded)
+                           if jsonpickle.encode(expected) != jsonpickle.encode(actual))
+    differences += abs(len(initiatives) - len(decoded))
+    differences += 0 if jsonpickle.encode(initiatives) == jsonpickle.encode(
+        EntityCodec.decode(serialised_bytes)) else 1
+
+    async def count_streamed() -> int:
+        return sum([1 async for _ in Serialisation.iter_initiatives()])
+
+    json_bytes: int = await measure_peak_memory_async(Serialisation.load_initiatives)
+    stream_bytes: int = await measure_peak_memory_async(count_streamed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sharded_path: str = os.path.join(directory, "initiatives.shards")
+        await ShardedDataset.write(initiatives, sharded_path)
+        sharded_size: int = sum(os.path.getsize(os.path.join(sharded_path, file_name))
+                                for file_name in os.listdir(sharded_path))
+        sharded_seconds: float = await measure_seconds_async(
+            lambda: ShardedDataset.read(sharded_path))
+        differences += 0 if jsonpickle.encode(initiatives) == jsonpickle.encode(
+            await ShardedDataset.read(sharded_path)) else 1
+
+        path: str = os.path.join(directory, "initiatives.bin")
+        with open(path, "wb") as file:
+            file.write(encoded)
+        loaded_bytes: int = measure_peak_memory(lambda: [
+            ballot.bill.title for ballot in BinaryCodec.decode(encoded)])
+        with BallotCollection.open(path) as collection:
+            lazy_seconds: float = min(timeit.repeat(lambda: [
+                ballot.bill.title for ballot in collection], number=1, repeat=REPETITIONS))
+            lazy_bytes: int = measure_peak_memory(
+                lambda: [ballot.bill.title for ballot in collection])
+            differences += sum(1 for expected, actual in zip(initiatives, collection)
+                               if jsonpickle.encode(expected) != jsonpickle.encode(DoubleMajorityBallot(
+                                   Bill(actual.bill.title, actual.bill.wording, actual.bill.date), actual.status, actual.result, actual.details_url)))
+
+    print(f"{len(initiatives)} initiatives")
+    print(f"jsonpickle: {len(serialised_bytes)} bytes, {json_seconds:.4f}s")
+    print(f"codec:      {len(serialised_bytes)} bytes, {codec_seconds:.4f}s, {json_seconds / codec_seconds:.1f}x")
+    print(f"binary:     {len(encoded)} bytes, {binary_seconds:.4f}s, {json_seconds / binary_seconds:.1f}x")
+    print(f"sharded:    {sharded_size} bytes, {sharded_seconds:.4f}s, {json_seconds / sharded_seconds:.1f}x")
+    print(f"json loaded:   {json_bytes} bytes peak")
+    print(f"json streamed: {stream_bytes} bytes peak")
+    print(f"titles loaded: {loaded_bytes} bytes peak")
+    print(f"titles lazy:   {lazy_bytes} bytes peak, {lazy_seconds:.3f}s")
+    print(f"differences: {differences}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
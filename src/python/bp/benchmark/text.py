@@ -0,0 +1,134 @@
+from bp.data.scraper import Scraper, SUPERSCRIPT_MARKER
+from bp.data.serialisation import Serialisation
+from bp.entity.ballot import DoubleMajorityBallot
+
+import asyncio
+import re
+import timeit
+from html import escape
+from lxml import html
+from typing import List
+
+
+REPETITIONS: int = 5
+"""int: Number of timed runs per implementation, of which the fastest is
+reported."""
+
+
+SUPERSCRIPT_PATTERN: re.Pattern = re.compile("\\^(\\S+)")
+"""re.Pattern: Superscript in plain text wordings, e.g. "^1"."""
+
+
+SUPERSCRIPT_MARKER_ONLY_PATTERN: re.Pattern = re.compile("^\\s*\\^\\s*$")
+"""re.Pattern: Pattern matching strings which only contain whitespaces and the
+superscript marker."""
+
+
+WHITESPACE_ONLY_PATTERN: re.Pattern = re.compile("^\\s*$")
+"""re.Pattern: Matches strings which only contain whitespaces."""
+
+
+def convert_to_text_recursive(element: List[html.HtmlElement] | html.Element) -> str:
+    """Recursive plain text conversion as implemented before the iterative
+    Scraper.convert_to_text. Used as the baseline.
+
+    Args:
+        element (List[html.HtmlElement] | html.Element): HTML element to
+        convert.
+
+    Returns:
+        str: Plain text representation of element.
+    """
+    if isinstance(element, List):
+        return "".join([convert_to_text_recursive(child) for child in element])
+
+    text: str = ""
+    if element.tag == "ol":
+        index = 1
+        for li in element:
+            text += str(index)
+            text += ". "
+            text += convert_to_text_recursive(li)
+            text += "\n"
+            index += 1
+        text += "\n"
+        return text
+
+    is_paragraph: bool = False
+    if element.tag == "sup":
+        text += SUPERSCRIPT_MARKER
+    elif element.tag == "br":
+        text = text.rstrip(" ")
+        text += "\n"
+    elif element.tag == "p":
+        is_paragraph = True
+    elif element.tag == "div" and element.get("id") == "contentNavigation":
+        return ""
+
+    if element.text:
+        text += element.text
+    text += convert_to_text_recursive([child for child in element])
+
+    if element.tail:
+        text += element.tail
+
+    if text == "" or re.match(SUPERSCRIPT_MARKER_ONLY_PATTERN, text):
+        return ""
+
+    if is_paragraph:
+        if re.match(WHITESPACE_ONLY_PATTERN, text):
+            return ""
+        text = text.rstrip(" ")
+        text += "\n\n"
+    text = text.replace("\xa0", " ")
+    text = text.replace("­", "")
+    text = text.replace("–", "-")
+    text = text.replace("-", "-")
+    return text
+
+
+def to_html(wording: str) -> str:
+    """Reconstructs an HTML wording page from a plain text wording, using the
+    markup which Scraper.convert_to_text converts back to plain text.
+
+    Args:
+        wording (str): Plain text wording of a bill.
+
+    Returns:
+        str: HTML page containing the wording.
+    """
+    paragraphs: List[str] = []
+    for paragraph in wording.split("\n\n"):
+        lines: List[str] = [SUPERSCRIPT_PATTERN.sub(
+            "<sup>\\1</sup>", escape(line)) for line in paragraph.split("\n")]
+        paragraphs.append(f"<p>{'<br>'.join(lines)}</p>")
+    return f"<html><body><div id='contentNavigation'>Navigation</div><div class='mod-text'>{''.join(paragraphs)}</div></body></html>"
+
+
+async def main():
+    """Micro-benchmark comparing the iterative Scraper.convert_to_text against
+    the recursive implementation. Converts HTML pages reconstructed from all
+    stored wordings and verifies that both implementations produce the same
+    text.
+    Excluded from unit test coverage check, since this script is only executed
+    manually.
+    """
+    initiatives: List[DoubleMajorityBallot] = await Serialisation.load_initiatives()
+    pages: List[html.HtmlElement] = [html.fromstring(to_html(
+        initiative.bill.wording)) for initiative in initiatives]
+
+    recursive_seconds: float = min(timeit.repeat(
+        lambda: [convert_to_text_recursive(page) for page in pages], number=1, repeat=REPETITIONS))
+    iterative_seconds: float = min(timeit.repeat(
+        lambda: [Scraper.convert_to_text(page) for page in pages], number=1, repeat=REPETITIONS))
+    differences: int = sum(1 for page in pages if convert_to_text_recursive(
+        page) != Scraper.convert_to_text(page))
+
+    print(f"{len(pages)} pages, {sum(len(page.text_content()) for page in pages)} characters")
+    print(f"recursive: {recursive_seconds:.3f}s")
+    print(f"iterative: {iterative_seconds:.3f}s")
+    print(f"differences: {differences}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
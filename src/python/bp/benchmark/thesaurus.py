@@ -0,0 +1,164 @@
+from bp.augment.openthesaurus import DEFAULT_POOL_SIZE, SQLITE_DUMP, OpenThesaurus
+from bp.augment.seed import DEFAULT_SEED
+
+import aiosqlite
+import asyncio
+import inspect
+import os
+import sqlite3
+import tempfile
+import time
+from numpy.random import default_rng
+from typing import Dict, List, Tuple
+
+
+SYNTHETIC_TERMS: int = 150000
+"""int: Number of terms of the synthetic thesaurus used if the OpenThesaurus
+dump is not available."""
+
+
+SYNTHETIC_SYNSETS: int = 50000
+"""int: Number of synsets of the synthetic thesaurus."""
+
+
+SYNTHETIC_ANTONYMS: int = 10000
+"""int: Number of antonym links of the synthetic thesaurus."""
+
+
+LOOKUPS: int = 500
+"""int: Number of distinct words looked up per measurement."""
+
+
+CALLERS: List[int] = [1, 4, 16]
+"""List[int]: Numbers of concurrent callers for which throughput is
+measured."""
+
+
+def write_synthetic_dump(dump: str) -> None:
+    """Writes an SQL dump of a random thesaurus with the tables and columns
+    used by OpenThesaurus, comparable in size to the OpenThesaurus dump.
+
+    Args:
+        dump (str): Path of the dump to write.
+    """
+    generator = default_rng(DEFAULT_SEED)
+    synset_ids: List[int] = generator.integers(
+        0, SYNTHETIC_SYNSETS, SYNTHETIC_TERMS).tolist()
+    links: List[List[int]] = generator.integers(
+        1, SYNTHETIC_TERMS + 1, (SYNTHETIC_ANTONYMS, 2)).tolist()
+    with sqlite3.connect(":memory:") as connection:
+        connection.executescript("""
+            create table term (id integer primary key, synset_id integer not null, word text not null, normalized_word text);
+            create table term_link (id integer primary key, term_id integer not null, target_term_id integer not null, link_type_id integer not null);
+        """)
+        connection.executemany("insert into term (id, synset_id, word) values (?, ?, ?)", [
+                               (index + 1, synset_id, f"Wort{index}") for index, synset_id in enumerate(synset_ids)])
+        connection.executemany(
+            "insert into term_link (term_id, target_term_id, link_type_id) values (?, ?, 1)", links)
+        with open(dump, "w", encoding="utf8") as file:
+            file.write("\n".join(connection.iterdump()))
+    connection.close()
+
+
+async def measure_latency(database: str, words: List[str]) -> Tuple[float, float, Dict[str, Tuple[List[str], List[str]]]]:
+    """Measures the mean latency of uncached single term lookups.
+
+    Args:
+        database (str): Thesaurus database to open.
+        words (List[str]): Distinct words to look up.
+
+    Returns:
+        Tuple[float, float, Dict[str, Tuple[List[str], List[str]]]]: Mean
+        seconds per find_synonyms and find_antonyms call, and the sorted
+        results of each word.
+    """
+    results: Dict[str, Tuple[List[str], List[str]]] = {}
+    async with OpenThesaurus(database, cache_size=0) as thesaurus:
+        start: float = time.perf_counter()
+        synonyms: List[List[str]] = [await thesaurus.find_synonyms(word) for word in words]
+        synonym_seconds: float = (time.perf_counter() - start) / len(words)
+        start = time.perf_counter()
+        antonyms: List[List[str]] = [await thesaurus.find_antonyms(word) for word in words]
+        antonym_seconds: float = (time.perf_counter() - start) / len(words)
+    for word, word_synonyms, word_antonyms in zip(words, synonyms, antonyms):
+        results[word] = (sorted(word_synonyms), sorted(word_antonyms))
+    return synonym_seconds, antonym_seconds, results
+
+
+async def measure_throughput(database: str, words: List[str], callers: int, pool_size: int) -> float:
+    """Measures the throughput of uncached single term lookups by concurrent
+    callers, which each look up an equal share of words in sequence.
+
+    Args:
+        database (str): Thesaurus database to open.
+        words (List[str]): Words to look up.
+        callers (int): Number of concurrent callers.
+        pool_size (int): Number of pooled connections.
+
+    Returns:
+        float: find_synonyms and find_antonyms calls per second.
+    """
+    async with OpenThesaurus(database, cache_size=0, pool_size=pool_size) as thesaurus:
+        async def call(share: List[str]) -> None:
+            for word in share:
+                await thesaurus.find_synonyms(word)
+                await thesaurus.find_antonyms(word)
+
+        start: float = time.perf_counter()
+        await asyncio.gather(*[call(words[caller::callers]) for caller in range(callers)])
+        return 2 * len(words) / (time.perf_counter() - start)
+
+
+async def main():
+    """Micro-benchmark comparing thesaurus lookup latency on a database
+    imported from the SQL dump as is, against the indexed and analysed
+    database built by OpenThesaurus.build_database. Also measures lookup
+    throughput on the built database for different numbers of concurrent
+    callers, with a single connection and a pool. Uses the OpenThesaurus
+    dump if available and a synthetic thesaurus of similar size otherwise.
+    Also counts the words whose results differ. Excluded from unit test
+    coverage check, since this script is only executed manually.
+    """
+    module_location: str = os.path.dirname(inspect.getfile(OpenThesaurus))
+    dump: str = os.path.join(module_location, SQLITE_DUMP)
+    with tempfile.TemporaryDirectory() as directory:
+        if not os.path.isfile(dump):
+            dump = os.path.join(directory, "dump.sql")
+            write_synthetic_dump(dump)
+
+        imported: str = os.path.join(directory, "imported.db")
+        start: float = time.perf_counter()
+        async with aiosqlite.connect(imported) as connection:
+            with open(dump, encoding="utf8") as file:
+                await connection.executescript(file.read())
+        import_seconds: float = time.perf_counter() - start
+
+        built: str = os.path.join(directory, "built.db")
+        start = time.perf_counter()
+        await OpenThesaurus.build_database(built, dump)
+        build_seconds: float = time.perf_counter() - start
+
+        with sqlite3.connect(built) as connection:
+            all_words: List[str] = [row[0] for row in connection.execute(
+                "select distinct word from term order by word")]
+        connection.close()
+        words: List[str] = default_rng(DEFAULT_SEED).choice(
+            all_words, LOOKUPS, replace=False).tolist()
+
+        imported_synonyms, imported_antonyms, imported_results = await measure_latency(imported, words)
+        built_synonyms, built_antonyms, built_results = await measure_latency(built, words)
+        throughputs: List[Tuple[int, float, float]] = [(callers, await measure_throughput(built, words, callers, 1), await measure_throughput(built, words, callers, DEFAULT_POOL_SIZE))
+                                                      for callers in CALLERS]
+
+    differences: int = sum(
+        1 for word in words if imported_results[word] != built_results[word])
+    print(f"{len(all_words)} words, {LOOKUPS} lookups")
+    print(f"imported: {import_seconds:.2f}s to import, synonyms {imported_synonyms * 1e6:.0f}us, antonyms {imported_antonyms * 1e6:.0f}us")
+    print(f"built:    {build_seconds:.2f}s to build,  synonyms {built_synonyms * 1e6:.0f}us, antonyms {built_antonyms * 1e6:.0f}us")
+    for callers, single_throughput, pooled_throughput in throughputs:
+        print(f"{callers:2d} callers: 1 connection {single_throughput:.0f}/s, {DEFAULT_POOL_SIZE} connections {pooled_throughput:.0f}/s")
+    print(f"differences: {differences}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
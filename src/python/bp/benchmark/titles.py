@@ -0,0 +1,122 @@
+from bp.data.fetcher import CachedFetcher
+from bp.data.matcher import TitleMatcher
+from bp.data.results import RESULT_TITLE_ALIASES, VoteResultPage
+from bp.data.scraper import Scraper
+from bp.data.serialisation import Serialisation
+from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
+
+import asyncio
+import Levenshtein
+import timeit
+from thefuzz import fuzz
+from typing import List
+
+
+REPETITIONS: int = 5
+"""int: Number of timed runs per implementation, of which the fastest is
+reported."""
+
+
+def find_unindexed(titles: List[str], title: str) -> int | None:
+    """Title matching as implemented before TitleMatcher, which normalises and
+    scores every candidate title on every call. Used as the baseline.
+
+    Args:
+        titles (List[str]): Lower case candidate titles.
+        title (str): Title to search for.
+
+    Raises:
+        ValueError: If the two similarity measures disagree.
+
+    Returns:
+        int | None: Index of the most similar candidate in titles.
+    """
+    for alias, replacement in RESULT_TITLE_ALIASES.items():
+        title = title.replace(alias, replacement)
+    title = title.lower()
+    max_levenshtein_ratio: float = 0.0
+    max_levenshtein_title: str = ""
+    max_token_sort_ratio: int = 0
+    max_token_sort_title: str = ""
+    best_index: int | None = None
+    for index, actual_title in enumerate(titles):
+        levenshtein_ratio: float = Levenshtein.ratio(title, actual_title)
+        token_sort_ratio: int = fuzz.partial_token_sort_ratio(
+            title, actual_title)
+        if levenshtein_ratio > max_levenshtein_ratio and token_sort_ratio > max_token_sort_ratio:
+            best_index = index
+        if levenshtein_ratio > max_levenshtein_ratio:
+            max_levenshtein_ratio = levenshtein_ratio
+            max_levenshtein_title = actual_title
+        if token_sort_ratio > max_token_sort_ratio:
+            max_token_sort_ratio = token_sort_ratio
+            max_token_sort_title = actual_title
+    if (max_levenshtein_title != max_token_sort_title):
+        raise ValueError(f"Inconclusive similarity evaluation for: {title}")
+    return best_index
+
+
+def find(find_index, title: str) -> int | None | ValueError:
+    """Runs a title search, capturing inconclusive results.
+
+    Args:
+        find_index (Callable[[str], int | None]): Search implementation.
+        title (str): Title to search for.
+
+    Returns:
+        int | None | ValueError: Search result or error.
+    """
+    try:
+        return find_index(title)
+    except ValueError as e:
+        return e
+
+
+async def main():
+    """Micro-benchmark comparing TitleMatcher against the unindexed title
+    matching. Matches the titles of all completed initiatives against every
+    vote result page of a previous `python -m bp.data.collector --cache` run,
+    which are read from the cache without network access. Also counts the
+    searches in which both implementations disagree. Since every title is
+    searched on every page, this includes titles which are not on the page at
+    all, for which the candidates pruned by TitleMatcher can make a difference.
+    Excluded from unit test coverage check, since this script is only executed
+    manually.
+    """
+    initiatives: List[DoubleMajorityBallot] = await Serialisation.load_initiatives()
+    titles: List[str] = [
+        initiative.bill.title for initiative in initiatives if initiative.status == BallotStatus.COMPLETED]
+
+    async with CachedFetcher(None, offline=True) as fetcher:
+        urls: List[str] = [url for url in fetcher.index if "/pore/va/" in url]
+        pages: List[VoteResultPage] = [VoteResultPage(Scraper.parse(await fetcher.get(url))) for url in urls]
+
+    def run_unindexed() -> List[List[int | None | ValueError]]:
+        return [[find(lambda title: find_unindexed(page.titles, title), title)
+                 for title in titles] for page in pages]
+
+    def run_indexed() -> List[List[int | None | ValueError]]:
+        results: List[List[int | None | ValueError]] = []
+        for page in pages:
+            matcher = TitleMatcher(page.titles, RESULT_TITLE_ALIASES)
+            results.append([find(matcher.find, title) for title in titles])
+        return results
+
+    unindexed_seconds: float = min(timeit.repeat(
+        run_unindexed, number=1, repeat=REPETITIONS))
+    indexed_seconds: float = min(timeit.repeat(
+        run_indexed, number=1, repeat=REPETITIONS))
+    unindexed: List[List[int | None | ValueError]] = run_unindexed()
+    indexed: List[List[int | None | ValueError]] = run_indexed()
+
+    differences: int = sum(1 for expected_page, actual_page in zip(unindexed, indexed)
+                           for expected, actual in zip(expected_page, actual_page)
+                           if type(expected) != type(actual) or (not isinstance(expected, ValueError) and expected != actual))
+    print(f"{len(titles)} titles, {len(pages)} pages")
+    print(f"unindexed: {unindexed_seconds:.3f}s")
+    print(f"indexed:   {indexed_seconds:.3f}s")
+    print(f"differences: {differences}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,5 @@
 from bp.entity.ballot import BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.frozen import FrozenBill, FrozenDoubleMajorityBallot, FrozenDoubleMajorityBallotResult
 from bp.data.serialisation import BallotStatusHandler, BillHandler, DatetimeHandler, DecimalHandler, DoubleMajorityBallotHandler, DoubleMajorityBallotResultHandler
 
 import jsonpickle
@@ -13,5 +14,10 @@ jsonpickle.handlers.registry.register(
     DoubleMajorityBallot, DoubleMajorityBallotHandler)
 jsonpickle.handlers.registry.register(
     DoubleMajorityBallotResult, DoubleMajorityBallotResultHandler)
+jsonpickle.handlers.registry.register(FrozenBill, BillHandler)
+jsonpickle.handlers.registry.register(
+    FrozenDoubleMajorityBallot, DoubleMajorityBallotHandler)
+jsonpickle.handlers.registry.register(
+    FrozenDoubleMajorityBallotResult, DoubleMajorityBallotResultHandler)
 jsonpickle.set_decoder_options("json", strict=False)
 jsonpickle.set_encoder_options("json", sort_keys=True, indent=4)
@@ -0,0 +1,201 @@
+from bp.entity.ballot import STATUSES_BY_VALUE, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.fixed_point import from_fixed_point, to_fixed_point
+
+import struct
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+
+MAGIC: bytes = b"BPBS"
+"""bytes: File signature of the binary ballot format."""
+
+
+VERSION: int = 1
+"""int: Version of the binary ballot format written by BinaryCodec."""
+
+
+HEADER: struct.Struct = struct.Struct("<4sHI")
+"""struct.Struct: Signature, version and number of ballots."""
+
+
+HAS_RESULT: int = 1
+"""int: Flag set for ballots with a result."""
+
+
+HAS_DETAILS_URL: int = 2
+"""int: Flag set for ballots with a details URL."""
+
+
+STRING_COLUMNS: int = 3
+"""int: Number of string columns, which are title, wording and details URL."""
+
+
+EPOCH: datetime = datetime.min
+"""datetime: Reference point of the date column."""
+
+
+MICROSECOND: timedelta = timedelta(microseconds=1)
+"""timedelta: Unit of the date column."""
+
+
+class BinaryCodec:
+    """Compact binary encoding of double majority ballots, which can be loaded
+    considerably faster than the jsonpickle JSON format. Ballot properties are
+    stored column by column after the header, in little endian byte order:
+
+    - status: uint8 per ballot, the BallotStatus value
+    - flags: uint8 per ballot, HAS_RESULT and HAS_DETAILS_URL
+    - date: int64 per ballot, microseconds since EPOCH
+    - percentage_yes, accepting_cantons: int64 coefficient and int8 exponent
+      per ballot each, which retains the exact Decimal representation
+    - string offsets: uint32 byte offsets into the string blob of all titles,
+      followed by all wordings and all details URLs, plus the blob end offset
+    - string blob: UTF-8 encoded strings
+
+    Columns of ballots without result or details URL contain zeros or empty
+    strings respectively. Dates need to be naive.
+    """
+
+    @staticmethod
+    def encode(ballots: List[DoubleMajorityBallot]) -> bytes:
+        """Encodes ballots in the binary format.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to encode.
+
+        Raises:
+            ValueError: If a date is not naive or a result does not fit into
+            the fixed width columns.
+
+        Returns:
+            bytes: Encoded ballots.
+        """
+        count: int = len(ballots)
+        statuses: List[int] = []
+        flags: List[int] = []
+        dates: List[int] = []
+        percentages_yes: List[Tuple[int, int]] = []
+        accepting_cantons: List[Tuple[int, int]] = []
+        strings: List[List[bytes]] = [[] for _ in range(STRING_COLUMNS)]
+        for ballot in ballots:
+            statuses.append(ballot.status.value)
+            result: DoubleMajorityBallotResult | None = ballot.result
+            flags.append((0 if result is None else HAS_RESULT) | (
+                0 if ballot.details_url is None else HAS_DETAILS_URL))
+            if ballot.bill.date.tzinfo is not None:
+                raise ValueError(
+                    f"Binary format only supports naive dates: {ballot.bill.date}")
+            dates.append((ballot.bill.date - EPOCH) // MICROSECOND)
+            percentages_yes.append((0, 0) if result is None else to_fixed_point(
+                result.percentage_yes))
+            accepting_cantons.append((0, 0) if result is None else to_fixed_point(
+                result.accepting_cantons))
+            strings[0].append(ballot.bill.title.encode("utf-8"))
+            strings[1].append(ballot.bill.wording.encode("utf-8"))
+            strings[2].append((ballot.details_url or "").encode("utf-8"))
+
+        offsets: List[int] = [0]
+        for column in strings:
+            for string in column:
+                offsets.append(offsets[-1] + len(string))
+
+        try:
+            return b"".join([
+                HEADER.pack(MAGIC, VERSION, count),
+                struct.pack(f"<{count}B", *statuses),
+                struct.pack(f"<{count}B", *flags),
+                struct.pack(f"<{count}q", *dates),
+                struct.pack(f"<{count}q", *[coefficient for coefficient, _ in percentages_yes]),
+                struct.pack(f"<{count}b", *[exponent for _, exponent in percentages_yes]),
+                struct.pack(f"<{count}q", *[coefficient for coefficient, _ in accepting_cantons]),
+                struct.pack(f"<{count}b", *[exponent for _, exponent in accepting_cantons]),
+                struct.pack(f"<{len(offsets)}I", *offsets)
+            ] + [string for column in strings for string in column])
+        except struct.error as e:
+            raise ValueError(f"Ballots exceed binary format limits: {e}")
+
+    @staticmethod
+    def decode(data: bytes) -> List[DoubleMajorityBallot]:
+        """Decodes ballots encoded in the binary format.
+
+        Args:
+            data (bytes): Encoded ballots.
+
+        Raises:
+            ValueError: If data is not in a supported version of the binary
+            format.
+
+        Returns:
+            List[DoubleMajorityBallot]: Decoded ballots.
+        """
+        count: int = BinaryCodec.read_count(data)
+        offset: int = HEADER.size
+        statuses, offset = BinaryCodec.__unpack_column(data, offset, "B", count)
+        flags, offset = BinaryCodec.__unpack_column(data, offset, "B", count)
+        dates, offset = BinaryCodec.__unpack_column(data, offset, "q", count)
+        percentage_yes_coefficients, offset = BinaryCodec.__unpack_column(
+            data, offset, "q", count)
+        percentage_yes_exponents, offset = BinaryCodec.__unpack_column(
+            data, offset, "b", count)
+        accepting_cantons_coefficients, offset = BinaryCodec.__unpack_column(
+            data, offset, "q", count)
+        accepting_cantons_exponents, offset = BinaryCodec.__unpack_column(
+            data, offset, "b", count)
+        string_offsets, offset = BinaryCodec.__unpack_column(
+            data, offset, "I", STRING_COLUMNS * count + 1)
+
+        blob: memoryview = memoryview(data)[offset:]
+        strings: List[str] = [str(blob[start:end], "utf-8") for start, end in zip(
+            string_offsets, string_offsets[1:])]
+        ballots: List[DoubleMajorityBallot] = []
+        for index in range(count):
+            ballot_flags: int = flags[index]
+            result: DoubleMajorityBallotResult | None = None
+            if ballot_flags & HAS_RESULT:
+                result = DoubleMajorityBallotResult(
+                    from_fixed_point(
+                        percentage_yes_coefficients[index], percentage_yes_exponents[index]),
+                    from_fixed_point(accepting_cantons_coefficients[index], accepting_cantons_exponents[index]))
+            bill = Bill(strings[index], strings[count + index],
+                        EPOCH + dates[index] * MICROSECOND)
+            details_url: str | None = strings[2 * count +
+                                              index] if ballot_flags & HAS_DETAILS_URL else None
+            ballots.append(DoubleMajorityBallot(
+                bill, STATUSES_BY_VALUE[statuses[index]], result, details_url))
+        return ballots
+
+    @staticmethod
+    def read_count(data: bytes) -> int:
+        """Validates the header of data.
+
+        Args:
+            data (bytes): Encoded ballots, or any buffer starting with them.
+
+        Raises:
+            ValueError: If data is not in a supported version of the binary
+            format.
+
+        Returns:
+            int: Number of ballots in data.
+        """
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(
+                f"Unsupported binary ballot format: {magic} version {version}")
+        return count
+
+    @staticmethod
+    def __unpack_column(data: bytes, offset: int, value_format: str, count: int) -> Tuple[Tuple, int]:
+        """Reads a fixed width column.
+
+        Args:
+            data (bytes): Encoded ballots.
+            offset (int): Start of the column in data.
+            value_format (str): struct format character of the column values.
+            count (int): Number of values in the column.
+
+        Returns:
+            Tuple[Tuple, int]: Column values and the offset after the column.
+        """
+        column: struct.Struct = struct.Struct(f"<{count}{value_format}")
+        return column.unpack_from(data, offset), offset + column.size
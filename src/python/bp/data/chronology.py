@@ -1,17 +1,18 @@
 
+from bp.data.details import BillDetailsPage, FAILURE_ROW_PREFIXES, VOTE_ROW_PREFIXES
+from bp.data.fetcher import Fetcher, HttpFetcher
+from bp.data.results import VoteResultPage, VoteResultPages
 from bp.data.scraper import Scraper
 from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
 from bp.entity.bill import Bill
 from bp.entity.result import DoubleMajorityBallotResult
 
-import Levenshtein
+import asyncio
 import re
-import requests
 from datetime import datetime
 from decimal import Decimal
-from thefuzz import fuzz
-from lxml import html
-from typing import List
+from lxml import etree, html
+from typing import Awaitable, Callable, Dict, List, Tuple, TypeVar
 
 
 POPULAR_INITIATIVES_CHRONOLOGY: str = 'https://www.bk.admin.ch/ch/d/pore/vi/vis_2_2_5_1.html'
@@ -25,9 +26,35 @@ title, e.g. extracting "MyTitle" from "My prefix: 'MyTitle'"
 """
 
 
+BILL_LINKS: etree.XPath = etree.XPath("//td/a")
+"""etree.XPath: Links to bill details pages on the chronology page."""
+
+
+TITLE_H2: etree.XPath = etree.XPath("//div[@class='contentHead']//h2")
+"""etree.XPath: Prefixed bill title on a bill details page."""
+
+
+TITLE_H1: etree.XPath = etree.XPath("//div[@class='contentHead']//h1")
+"""etree.XPath: Prefixed bill title on bill details pages without TITLE_H2."""
+
+
+CELLS: etree.XPath = etree.XPath("td")
+"""etree.XPath: Cells of a table row."""
+
+
+BODY_ROWS: etree.XPath = etree.XPath("tbody/tr")
+"""etree.XPath: Body rows of a table."""
+
+
+T = TypeVar("T")
+"""TypeVar: Result type of operations executed with a default fetcher."""
+
+
 class Chronology:
     """Bill information download helper
-    Downloads bill information from chronology websites.
+    Downloads bill information from chronology websites. The synchronous
+    methods use a default HttpFetcher, while the asynchronous fetch_* methods
+    accept a Fetcher which may be shared between many concurrent downloads.
     """
 
     @staticmethod
@@ -39,7 +66,7 @@ class Chronology:
             List[str]: Details page URLs for all bills, ordered newest to
             oldest.
         """
-        return Chronology.__get_bills(POPULAR_INITIATIVES_CHRONOLOGY)
+        return Chronology.__run(Chronology.fetch_initiative_urls)
 
     @staticmethod
     def get_initiative(bill_details_url: str) -> DoubleMajorityBallot:
@@ -52,23 +79,178 @@ class Chronology:
         Returns:
             DoubleMajorityBallot: Bill information with optional result.
         """
-        response: requests.Response = requests.get(bill_details_url)
-        response.encoding = response.apparent_encoding
-        content: html.HtmlElement = html.fromstring(response.text)
-        vote_row: html.HtmlElement = Chronology.__find_row(
-            content, "Abgestimmt am")
-        if vote_row is None:
-            vote_row = Chronology.__find_row(
-                content, "Abstimmung über Gegenentwurf")
+        return Chronology.__run(lambda fetcher: Chronology.fetch_initiative(bill_details_url, fetcher))
+
+    @staticmethod
+    async def fetch_initiative_urls(fetcher: Fetcher) -> List[str]:
+        """Asynchronous version of get_initiatives.
 
-        bill: Bill = Chronology.__get_bill(bill_details_url, content)
-        status: BallotStatus = Chronology.__get_status(content, vote_row)
-        result: DoubleMajorityBallotResult | None = Chronology.__get_initiative_result(
-            bill.title, vote_row)
-        return DoubleMajorityBallot(bill, status, result)
+        Args:
+            fetcher (Fetcher): Fetcher to download the chronology with.
+
+        Returns:
+            List[str]: Details page URLs for all bills, ordered newest to
+            oldest.
+        """
+        return await Chronology.__get_bills(POPULAR_INITIATIVES_CHRONOLOGY, fetcher)
+
+    @staticmethod
+    async def fetch_initiatives(bill_details_urls: List[str], fetcher: Fetcher, on_fetched: Callable[[int, int, str], None] | None = None) -> List[DoubleMajorityBallot]:
+        """Retrieves all given initiatives concurrently. The degree of
+        parallelism is controlled by fetcher.
+
+        Args:
+            bill_details_urls (List[str]): Bill details pages from which to
+            extract data.
+            fetcher (Fetcher): Fetcher shared by all downloads.
+            on_fetched (Callable[[int, int, str], None] | None, optional):
+            Invoked whenever an initiative was retrieved, in order of
+            completion, with the number of initiatives retrieved so far, the
+            number of initiatives being retrieved and the bill details URL.
+            Defaults to None.
+
+        Returns:
+            List[DoubleMajorityBallot]: Bill information with optional result,
+            in the same order as bill_details_urls.
+        """
+        vote_result_pages = VoteResultPages(fetcher)
+        count: int = len(bill_details_urls)
+        fetched: int = 0
+
+        async def fetch(bill_details_url: str) -> DoubleMajorityBallot:
+            nonlocal fetched
+            ballot: DoubleMajorityBallot = await Chronology.fetch_initiative(bill_details_url, fetcher, vote_result_pages)
+            fetched += 1
+            if on_fetched is not None:
+                on_fetched(fetched, count, bill_details_url)
+            return ballot
+
+        return list(await asyncio.gather(*[fetch(bill_details_url) for bill_details_url in bill_details_urls]))
 
     @staticmethod
-    def __get_initiative_result(title: str, vote_row: html.HtmlElement) -> DoubleMajorityBallotResult | None:
+    async def fetch_updated_initiatives(bill_details_urls: List[str], known_ballots: List[DoubleMajorityBallot], fetcher: Fetcher, on_fetched: Callable[[int, int, str], None] | None = None) -> List[DoubleMajorityBallot]:
+        """Incremental version of fetch_initiatives. Only initiatives which are
+        new or whose ballot is still pending are retrieved, all other ones are
+        taken from known_ballots unchanged. Known ballots which are no longer
+        listed in bill_details_urls are dropped.
+
+        Known ballots are matched by details URL. Ballots stored before the
+        details URL was recorded are matched by title and date instead, for
+        which only the details page of each unmatched initiative is
+        downloaded. Such ballots are returned with their details URL, so that
+        they are matched by URL once stored again.
+
+        Args:
+            bill_details_urls (List[str]): Bill details pages of all
+            initiatives, usually retrieved using fetch_initiative_urls.
+            known_ballots (List[DoubleMajorityBallot]): Previously retrieved
+            ballots.
+            fetcher (Fetcher): Fetcher shared by all downloads.
+            on_fetched (Callable[[int, int, str], None] | None, optional):
+            Invoked whenever an initiative was retrieved, in order of
+            completion, with the number of initiatives retrieved so far, the
+            number of initiatives being retrieved and the bill details URL.
+            Defaults to None.
+
+        Returns:
+            List[DoubleMajorityBallot]: Bill information with optional result,
+            in the same order as bill_details_urls.
+        """
+        final_ballots: Dict[str, DoubleMajorityBallot] = {
+            ballot.details_url: ballot for ballot in known_ballots
+            if ballot.details_url is not None and ballot.status is not BallotStatus.PENDING}
+        unmatched_urls: List[str] = [
+            url for url in bill_details_urls if url not in final_ballots]
+        ballots_without_url: Dict[Tuple[str, datetime], DoubleMajorityBallot] = {
+            (ballot.bill.title, ballot.bill.date): ballot for ballot in known_ballots
+            if ballot.details_url is None and ballot.status is not BallotStatus.PENDING}
+        if len(ballots_without_url) > 0:
+            matched_ballots: List[DoubleMajorityBallot | None] = await asyncio.gather(*[
+                Chronology.__match_ballot(url, ballots_without_url, fetcher) for url in unmatched_urls])
+            final_ballots.update((url, ballot) for url, ballot in zip(
+                unmatched_urls, matched_ballots) if ballot is not None)
+
+        stale_urls: List[str] = [
+            url for url in unmatched_urls if url not in final_ballots]
+        fetched_ballots: List[DoubleMajorityBallot] = await Chronology.fetch_initiatives(
+            stale_urls, fetcher, on_fetched)
+        final_ballots.update(zip(stale_urls, fetched_ballots))
+        return [final_ballots[url] for url in bill_details_urls]
+
+    @staticmethod
+    async def __match_ballot(bill_details_url: str, ballots: Dict[Tuple[str, datetime], DoubleMajorityBallot], fetcher: Fetcher) -> DoubleMajorityBallot | None:
+        """Finds the known ballot of an initiative by the title and date on
+        its details page.
+
+        Args:
+            bill_details_url (str): Bill details page of the initiative.
+            ballots (Dict[Tuple[str, datetime], DoubleMajorityBallot]): Known
+            ballots without details URL by title and date.
+            fetcher (Fetcher): Fetcher to download the details page with.
+
+        Returns:
+            DoubleMajorityBallot | None: Known ballot with bill_details_url as
+            its details URL, or None if no known ballot matches.
+        """
+        content: html.HtmlElement = Scraper.parse(await fetcher.get(bill_details_url))
+        details: BillDetailsPage = BillDetailsPage(content)
+        ballot: DoubleMajorityBallot | None = ballots.get((Chronology.__extract_title(
+            bill_details_url, content), Chronology.__extract_date(details)))
+        if ballot is None:
+            return None
+        return DoubleMajorityBallot(ballot.bill, ballot.status, ballot.result, bill_details_url)
+
+    @staticmethod
+    async def fetch_initiative(bill_details_url: str, fetcher: Fetcher, vote_result_pages: VoteResultPages | None = None) -> DoubleMajorityBallot:
+        """Asynchronous version of get_initiative. The details and wording
+        pages are downloaded concurrently.
+
+        Args:
+            bill_details_url (str): Bill details page from which to extract data.
+            fetcher (Fetcher): Fetcher to download all pages with.
+            vote_result_pages (VoteResultPages | None, optional): Vote result
+            pages shared with other initiatives retrieved in the same run. If
+            None, the vote result page is downloaded for this initiative only.
+            Defaults to None.
+
+        Returns:
+            DoubleMajorityBallot: Bill information with optional result.
+        """
+        bill_wording_url: str = bill_details_url.replace(".html", "t.html")
+        details_page, wording_page = await asyncio.gather(
+            fetcher.get(bill_details_url), fetcher.get(bill_wording_url))
+        content: html.HtmlElement = Scraper.parse(details_page)
+        details: BillDetailsPage = BillDetailsPage(content)
+        vote_row: html.HtmlElement | None = details.find_row(
+            VOTE_ROW_PREFIXES)
+
+        bill: Bill = Chronology.__get_bill(
+            bill_details_url, content, details, wording_page)
+        status: BallotStatus = Chronology.__get_status(details, vote_row)
+        if vote_result_pages is None:
+            vote_result_pages = VoteResultPages(fetcher)
+        result: DoubleMajorityBallotResult | None = await Chronology.__get_initiative_result(
+            bill.title, vote_row, vote_result_pages)
+        return DoubleMajorityBallot(bill, status, result, bill_details_url)
+
+    @staticmethod
+    def __run(operation: Callable[[Fetcher], Awaitable[T]]) -> T:
+        """Executes an asynchronous operation using a new default fetcher.
+
+        Args:
+            operation (Callable[[Fetcher], Awaitable[T]]): Operation to
+            execute.
+
+        Returns:
+            T: Result of operation.
+        """
+        async def run() -> T:
+            async with HttpFetcher() as fetcher:
+                return await operation(fetcher)
+        return asyncio.run(run())
+
+    @staticmethod
+    async def __get_initiative_result(title: str, vote_row: html.HtmlElement, vote_result_pages: VoteResultPages) -> DoubleMajorityBallotResult | None:
         """Look up the result of the vote for the given initiative, if present.
 
         Args:
@@ -78,6 +260,7 @@ class Chronology:
             indicates when the date was held. Ballot results are categorised by
             date on www.bk.admin.ch, and this date allows us to derive the URL
             which contains the ballot results for title.
+            vote_result_pages (VoteResultPages): Vote result pages by date.
 
         Returns:
             DoubleMajorityBallotResult | None: If a vote was already held,
@@ -88,20 +271,14 @@ class Chronology:
         if vote_row is None:
             return None
 
-        formatted_date: str = vote_row.xpath("td")[1].text_content().strip()
+        formatted_date: str = CELLS(vote_row)[1].text_content().strip()
         date: datetime = Chronology.__parse_timestamp(formatted_date)
-        vote_result_url: str = f"https://www.bk.admin.ch/ch/d/pore/va/{date.year}{date.month:02d}{date.day:02d}/index.html"
-        response: requests.Response = requests.get(vote_result_url)
-        response.encoding = response.apparent_encoding
-        content: html.HtmlElement = html.fromstring(response.text)
-
-        initiative_title: html.HtmlElement = Chronology.__find_result_table(
-            content, title)
-        table: List[html.HtmlElement] = initiative_title.xpath(
-            "following-sibling::table[1]")
-        rows: List[html.HtmlElement] = table[0].xpath("tbody/tr")
-        popular_vote_voting_yes = Decimal(
-            rows[0].xpath("td")[3].text_content())
+        vote_result_page: VoteResultPage = await vote_result_pages.get(date)
+
+        table: html.HtmlElement = Chronology.__find_result_table(
+            vote_result_page, title)
+        rows: List[html.HtmlElement] = BODY_ROWS(table)
+        popular_vote_voting_yes = Decimal(CELLS(rows[0])[3].text_content())
         accepting_cantons: Decimal = Chronology.__extract_accepting_cantons(
             title, rows)
 
@@ -136,7 +313,7 @@ class Chronology:
                     3) / number_of_canton_votes_before_1979
 
         if (share_of_canton_votes is None):
-            canton_cells: List[html.HtmlElement] = rows[1].xpath("td")
+            canton_cells: List[html.HtmlElement] = CELLS(rows[1])
             accepting_cantons: Decimal = Chronology.__parse_canton_count(
                 canton_cells[1].text_content())
             rejecting_cantons: Decimal = Chronology.__parse_canton_count(
@@ -147,124 +324,79 @@ class Chronology:
         return (Decimal(100) * share_of_canton_votes).quantize(Decimal("0.01"))
 
     @staticmethod
-    def __find_result_table(content: html.HtmlElement, title: str) -> html.HtmlElement:
+    def __find_result_table(vote_result_page: VoteResultPage, title: str) -> html.HtmlElement | None:
         """Vote results are published per voting day, so multiple vote results
         are on the same page. This method identifies the correct results table
-        for the given bill using string similarity ratios. Also contains a few
-        explicit mappings where the name in the results document was changed to
-        a degree that it can no longer be associated with the bill.
+        for the given bill using the string similarity index of the page. Bills
+        whose name in the results document was changed to a degree that it can
+        no longer be associated with the bill are mapped explicitly using
+        RESULT_TITLE_ALIASES.
 
         Args:
-            content (html.HtmlElement): Voting day results page.
+            vote_result_page (VoteResultPage): Voting day results page.
             title (str): Name of the bill to find.
 
+        Raises:
+            ValueError: If the similarity ratios disagree on the best match.
+
         Returns:
-            html.HtmlElement: Table containing the vote results.
+            html.HtmlElement | None: Table containing the vote results, or
+            None if the page does not contain any results.
         """
-        title = title.replace(
-            "für eine Reichtumssteuer", "Volksbegehren 'zur Steuerharmonisierung, zur stärkeren Besteuerung des Reichtums und zur Entlastung der unteren Einkommen (Reichtumsteuer-Initiative)'").replace(
-                "für die Mitbestimmung der Arbeitnehmer", "Bundesbeschluss vom 04.10.1974 betreffend das Volksbegehren über die Mitbestimmung").replace(
-                    "Förderung des Wohnungsbaus", "Bundesbeschluss vom 17.12.1971 betreffend die Ergänzung der Bundesverfassung durch einen Artikel 34sexies über den Wohnungsbau und betreffend das Volksbegehren zur Bildung eines Wohnbaufonds (Denner-Initiative)").replace(
-                        "Soziale Krankenversicherung", "Bundesbeschluss vom 22.03.1974 über das Volksbegehren für die soziale Krankenversicherung und die Aenderung der Bundesverfassung auf dem Gebiet der Kranken-, Unfall- und Mutterschaftsversicherung").replace(
-                            "betreffend die Erlangung des Schweizerbürgerrechts, Teil I; betreffend die Ausweisung von Ausländern, Teil II", "Eidgenössische Volksinitiative 'betreffend die Ausweisung von Ausländern, Teil II'").lower()
-        initiative_titles: List[html.HtmlElement] = content.xpath(
-            "//div[contains(@class, 'mod-text')]//h3")
-        max_levenshtein_ratio: float = 0.0
-        max_levenshtein_title: str = ""
-        max_token_sort_ratio: int = 0
-        max_token_sort_title: str = ""
-        best_initiative_element: html.HtmlElement = None
-
-        for initiative_title in initiative_titles:
-            actual_title: str = Scraper.convert_to_text(initiative_title)
-            actual_title = actual_title.lower()
-
-            levenshtein_ratio: float = Levenshtein.ratio(title, actual_title)
-            token_sort_ratio: int = fuzz.partial_token_sort_ratio(
-                title, actual_title)
-            if levenshtein_ratio > max_levenshtein_ratio and token_sort_ratio > max_token_sort_ratio:
-                best_initiative_element = initiative_title
-            if levenshtein_ratio > max_levenshtein_ratio:
-                max_levenshtein_ratio = levenshtein_ratio
-                max_levenshtein_title = actual_title
-            if token_sort_ratio > max_token_sort_ratio:
-                max_token_sort_ratio = token_sort_ratio
-                max_token_sort_title = actual_title
-
-        if (max_levenshtein_title != max_token_sort_title):
-            raise ValueError(
-                f"Inconclusive similarity evaluation for: {title}")
-        return best_initiative_element
+        index: int | None = vote_result_page.matcher.find(title)
+        return None if index is None else vote_result_page.tables[index]
 
     @staticmethod
-    def __get_status(content: html.HtmlElement, vote_row: html.HtmlElement | None) -> BallotStatus:
+    def __get_status(details: BillDetailsPage, vote_row: html.HtmlElement | None) -> BallotStatus:
         """Interprets the timetable on a bill details page to identify the
         current status of the bill.
 
         Args:
-            content (html.HtmlElement): Bill details HTML page.
+            details (BillDetailsPage): Row index of the bill details page.
             vote_row (html.HtmlElement): Row containing the ballot vote date,
             if found. This row is used to extract other information by other
             methods. Since it is already extracted, if present we can use it as
-            a shortcut and avoid searching content using XPath entirely.
+            a shortcut and avoid the row index lookups entirely.
 
         Returns:
             BallotStatus: Status of the ballot.
         """
         if not vote_row is None:
             return BallotStatus.COMPLETED
-        if not Chronology.__find_row(content, "Nicht zustandegekommen am") is None or \
-           not Chronology.__find_row(content, "Im Sammelstadium gescheitert") is None or \
-           not Chronology.__find_row(content, "Zurückgezogen") is None or \
-           not Chronology.__find_row(content, "Bedingter Rückzug") is None:
+        if not details.find_row(FAILURE_ROW_PREFIXES) is None:
             return BallotStatus.FAILED
         return BallotStatus.PENDING
 
     @staticmethod
-    def __find_row(content: html.HtmlElement, firstColumnValue: str) -> html.HtmlElement | None:
-        """Helper to identify a row in any table in content whose first column
-        value starts with firstColumnValue.
-
-        Args:
-            content (html.HtmlElement): HTML website content in which to
-            search.
-            firstColumnValue (str): Search string to find.
-
-        Returns:
-            html.HtmlElement | None: "tr" row containing firstColumnValue in
-            the first column, or None if no match was found.
-        """
-        cell: List[html.HtmlElement] = content.xpath(
-            f"//tr/td[starts-with(text(), '{firstColumnValue}')]")
-        if not cell:
-            return None
-        return cell[0].getparent()
-
-    @staticmethod
-    def __get_bill(bill_details_url: str, content: html.HtmlElement) -> Bill:
+    def __get_bill(bill_details_url: str, content: html.HtmlElement, details: BillDetailsPage, wording_page: bytes) -> Bill:
         """Retrieve bill details information.
 
         Args:
             bill_details_url (str): URL of bill details page.
             content (html.HtmlElement): Page content of bill_details_url.
+            details (BillDetailsPage): Row index of content.
+            wording_page (bytes): Raw content of the bill wording page.
 
         Returns:
             Bill: Bill details information retrieved from bill details page.
         """
-        return Bill(Chronology.__extract_title(bill_details_url, content), Chronology.__extract_wording(bill_details_url), Chronology.__extract_date(content))
+        return Bill(Chronology.__extract_title(bill_details_url, content), Chronology.__extract_wording(wording_page), Chronology.__extract_date(details))
 
     @staticmethod
-    def __get_bills(url: str) -> List[str]:
+    async def __get_bills(url: str, fetcher: Fetcher) -> List[str]:
         """Retrieve details page URL for each bill on url.
 
+        Args:
+            url (str): Chronology page listing the bills.
+            fetcher (Fetcher): Fetcher to download url with.
+
         Returns:
             List[str]: Details page URLs for all bills, ordered newest to
             oldest.
         """
         parent_path: str = Scraper.get_parent(url)
-        response: requests.Response = requests.get(url)
-        content: html.HtmlElement = html.fromstring(response.text)
-        table_rows: List[html.HtmlElement] = content.xpath("//td/a")
+        content: html.HtmlElement = Scraper.parse(await fetcher.get(url))
+        table_rows: List[html.HtmlElement] = BILL_LINKS(content)
         return [parent_path + "/" + element.get("href") for element in table_rows]
 
     @staticmethod
@@ -284,11 +416,10 @@ class Chronology:
         Returns:
             str: Bill title text without any prefixes.
         """
-        prefixed_title: List[html.HtmlElement] = bill_details_page_content.xpath(
-            "//div[@class='contentHead']//h2")
+        prefixed_title: List[html.HtmlElement] = TITLE_H2(
+            bill_details_page_content)
         if len(prefixed_title) == 0:
-            prefixed_title = bill_details_page_content.xpath(
-                "//div[@class='contentHead']//h1")
+            prefixed_title = TITLE_H1(bill_details_page_content)
         if len(prefixed_title) == 0:
             raise ValueError(
                 f"Bill details page did not contain an <h2> or <h1> header in expected <div class='contentHead'> location: {bill_details_url}")
@@ -303,40 +434,31 @@ class Chronology:
         return match.group(1)
 
     @staticmethod
-    def __extract_wording(bill_details_url: str) -> str:
-        """Download and extract bill wording for the given bill.
+    def __extract_wording(wording_page: bytes) -> str:
+        """Extract bill wording from the wording page of a bill.
 
         Args:
-            bill_details_url (str): URL of details page of bill for which to
-            download and extract the wording. The wording is stored in a
-            companion page that can be statically derived from this URL.
+            wording_page (bytes): Raw content of the bill wording page. This is
+            a companion page that can be statically derived from the bill
+            details page URL.
 
         Returns:
             str: Text representation of the wording of the bill, suitable for
             predictions.
         """
-        billWordingUrl: str = bill_details_url.replace(".html", "t.html")
-        response: requests.Response = requests.get(billWordingUrl)
-        response.encoding = response.apparent_encoding
-        content: html.HtmlElement = html.fromstring(response.text)
-        paragraphs: List[html.HtmlElement] = content.xpath(
-            "//div[contains(@class, 'mod-text')]")
-        return Scraper.convert_to_text(paragraphs).strip()
+        return Scraper.convert_divs_to_text(wording_page, "mod-text").strip()
 
     @staticmethod
-    def __extract_date(bill_details_page_content: html.HtmlElement) -> datetime:
+    def __extract_date(details: BillDetailsPage) -> datetime:
         """Extracts a single date to associate with the bill.
 
         Args:
-            bill_details_page_content (html.HtmlElement): Bill details HTML
-            content.
+            details (BillDetailsPage): Row index of the bill details page.
 
         Returns:
             datetime: Date timestamp parsed from details page.
         """
-        last_table_row: html.HtmlElement = bill_details_page_content.xpath(
-            "//tr")[-1]
-        second_cell: html.HtmlElement = last_table_row.xpath("td")[1]
+        second_cell: html.HtmlElement = CELLS(details.last_row)[1]
         formatted_date: str = second_cell.text_content()
         return Chronology.__parse_timestamp(formatted_date)
 
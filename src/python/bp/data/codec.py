@@ -0,0 +1,161 @@
+from bp.entity.ballot import BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+
+import json
+import jsonpickle
+import orjson
+from datetime import datetime
+from decimal import Decimal
+from jsonpickle.tags import OBJECT
+from typing import Any, Dict, List
+
+
+BILL_OBJECT: str = "bp.entity.bill.Bill"
+"""str: jsonpickle class tag of bills."""
+
+
+BALLOT_OBJECT: str = "bp.entity.ballot.DoubleMajorityBallot"
+"""str: jsonpickle class tag of double majority ballots."""
+
+
+RESULT_OBJECT: str = "bp.entity.result.DoubleMajorityBallotResult"
+"""str: jsonpickle class tag of double majority ballot results."""
+
+
+STATUS_NAMES: Dict[BallotStatus, str] = {
+    status: status.name.lower() for status in BallotStatus}
+"""Dict[BallotStatus, str]: Serialised name of each ballot status."""
+
+
+STATUSES: Dict[str, BallotStatus] = {
+    name: status for status, name in STATUS_NAMES.items()}
+"""Dict[str, BallotStatus]: Ballot status by serialised name."""
+
+
+class EntityCodec:
+    """JSON codec for lists of double majority ballots, which is wire
+    compatible with the jsonpickle handlers in bp.data.serialisation. Instead
+    of dispatching every property to a registered handler, entities are mapped
+    to and from plain dicts in one pass. Decoding uses orjson, encoding uses
+    the standard library, since orjson does not support the indentation of the
+    existing files.
+    """
+
+    @staticmethod
+    def encode(ballots: List[DoubleMajorityBallot]) -> str:
+        """Serialises ballots exactly like jsonpickle.encode with the
+        configured encoder options.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to serialise.
+
+        Returns:
+            str: Pretty-printed JSON list of ballots.
+        """
+        return json.dumps([EntityCodec.to_dict(ballot) for ballot in ballots], sort_keys=True, indent=4)
+
+    @staticmethod
+    def encode_ballot(ballot: DoubleMajorityBallot) -> str:
+        """Serialises a single ballot exactly like jsonpickle.encode with the
+        configured encoder options.
+
+        Args:
+            ballot (DoubleMajorityBallot): Ballot to serialise.
+
+        Returns:
+            str: Pretty-printed JSON object.
+        """
+        return json.dumps(EntityCodec.to_dict(ballot), sort_keys=True, indent=4)
+
+    @staticmethod
+    def decode(serialised: str | bytes) -> Any:
+        """Deserialises a JSON list of ballots. Documents which are not plain
+        lists of ballots, e.g. because they contain jsonpickle references, are
+        restored by jsonpickle instead.
+
+        Args:
+            serialised (str | bytes): JSON document.
+
+        Returns:
+            Any: Deserialised ballots.
+        """
+        data: Any
+        try:
+            data = orjson.loads(serialised)
+        except orjson.JSONDecodeError:
+            data = json.JSONDecoder(strict=False).decode(
+                serialised if isinstance(serialised, str) else serialised.decode("utf-8"))
+        try:
+            return [EntityCodec.from_dict(ballot) for ballot in data]
+        except (KeyError, TypeError):
+            return jsonpickle.Unpickler().restore(data)
+
+    @staticmethod
+    def restore(flattened: Any) -> Any:
+        """Deserialises a single decoded JSON value, falling back to jsonpickle
+        if it is not a plain serialised ballot.
+
+        Args:
+            flattened (Any): Decoded JSON value.
+
+        Returns:
+            Any: Deserialised ballot, or whatever jsonpickle restores.
+        """
+        try:
+            return EntityCodec.from_dict(flattened)
+        except (KeyError, TypeError):
+            return jsonpickle.Unpickler().restore(flattened)
+
+    @staticmethod
+    def to_dict(ballot: DoubleMajorityBallot) -> Dict[str, Any]:
+        """Converts a ballot to the dict jsonpickle would serialise.
+
+        Args:
+            ballot (DoubleMajorityBallot): Ballot to convert.
+
+        Returns:
+            Dict[str, Any]: JSON compatible representation of ballot.
+        """
+        bill: Bill = ballot.bill
+        result: DoubleMajorityBallotResult | None = ballot.result
+        flattened: Dict[str, Any] = {
+            "bill": {
+                "date": bill.date.isoformat(),
+                OBJECT: BILL_OBJECT,
+                "title": bill.title,
+                "wording": bill.wording
+            },
+            OBJECT: BALLOT_OBJECT,
+            "result": None if result is None else {
+                "accepting_cantons": str(result.accepting_cantons),
+                "percentage_yes": str(result.percentage_yes),
+                OBJECT: RESULT_OBJECT
+            },
+            "status": STATUS_NAMES[ballot.status]
+        }
+        if ballot.details_url is not None:
+            flattened["details_url"] = ballot.details_url
+        return flattened
+
+    @staticmethod
+    def from_dict(flattened: Dict[str, Any]) -> DoubleMajorityBallot:
+        """Converts the dict representation of a ballot back to a ballot.
+
+        Args:
+            flattened (Dict[str, Any]): Ballot as serialised by jsonpickle.
+
+        Raises:
+            KeyError: If flattened is not a serialised ballot.
+            TypeError: If flattened is not a serialised ballot.
+
+        Returns:
+            DoubleMajorityBallot: Deserialised ballot.
+        """
+        bill: Dict[str, str] = flattened["bill"]
+        result: Dict[str, str] | None = flattened["result"]
+        return DoubleMajorityBallot(
+            Bill(bill["title"], bill["wording"],
+                 datetime.fromisoformat(bill["date"])),
+            STATUSES[flattened["status"]],
+            None if result is None else DoubleMajorityBallotResult(
+                Decimal(result["percentage_yes"]), Decimal(result["accepting_cantons"])),
+            flattened.get("details_url"))
@@ -1,30 +1,66 @@
 from bp.data.chronology import Chronology
+from bp.data.fetcher import CachedFetcher, DEFAULT_MAX_CONCURRENCY, DEFAULT_REQUESTS_PER_SECOND_PER_HOST, Fetcher, HttpFetcher
 from bp.data.serialisation import Serialisation
 from bp.entity.ballot import DoubleMajorityBallot
 
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
 from typing import List
 
 
-def main():
+async def main():
     """Helper script to download all training data from www.bk.admin.ch.
-    Updates src/python/bp/resources with most recent data. Excluded from unit
-    test coverage check, since this script is only executed manually during
-    experimental and training preparations.
+    Updates src/python/bp/resources with most recent data. Initiatives are
+    downloaded concurrently, with the degree of parallelism and the request
+    rate configurable on the command line. In incremental mode, only new and
+    pending initiatives are downloaded and merged with the existing data.
+    Downloaded pages can be cached on disk and replayed offline, which is
+    useful when iterating on the parsers.
+    Excluded from unit test coverage check, since this script is only executed
+    manually during experimental and training preparations.
     """
-    initiativeUrls: List[str] = Chronology.get_initiatives()
-    initiatives: List[DoubleMajorityBallot] = []
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--concurrency", type=int,
+                        default=DEFAULT_MAX_CONCURRENCY,
+                        help="Maximum number of concurrent HTTP requests.")
+    parser.add_argument("--requests-per-second", type=float,
+                        default=DEFAULT_REQUESTS_PER_SECOND_PER_HOST,
+                        help="Maximum request rate per host.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only download new and pending initiatives.")
+    parser.add_argument("--cache", action="store_true",
+                        help="Cache downloaded pages on disk and revalidate them on subsequent runs.")
+    parser.add_argument("--offline", action="store_true",
+                        help="Only use pages from the cache, without any network access.")
+    arguments: argparse.Namespace = parser.parse_args()
 
-    index: int = 1
-    count: int = len(initiativeUrls)
-    for billDetailsUrl in initiativeUrls:
-        print(f"{index}/{count}: {billDetailsUrl}")
-        index += 1
-        ballot: DoubleMajorityBallot = Chronology.get_initiative(
-            billDetailsUrl)
-        initiatives.append(ballot)
+    known_initiatives: List[DoubleMajorityBallot] = []
+    if arguments.incremental:
+        try:
+            known_initiatives = await Serialisation.load_initiatives()
+        except FileNotFoundError:
+            pass
 
-    Serialisation.write_initiatives(initiatives)
+    async with AsyncExitStack() as stack:
+        fetcher: Fetcher | None = None
+        if not arguments.offline:
+            fetcher = await stack.enter_async_context(
+                HttpFetcher(arguments.concurrency, arguments.requests_per_second))
+        if arguments.cache or arguments.offline:
+            fetcher = await stack.enter_async_context(
+                CachedFetcher(fetcher, offline=arguments.offline))
+
+        initiativeUrls: List[str] = await Chronology.fetch_initiative_urls(fetcher)
+
+        def print_progress(index: int, count: int, billDetailsUrl: str) -> None:
+            print(f"{index}/{count}: {billDetailsUrl}")
+
+        initiatives: List[DoubleMajorityBallot] = await Chronology.fetch_updated_initiatives(
+            initiativeUrls, known_initiatives, fetcher, print_progress)
+
+    await Serialisation.write_initiatives(initiatives)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+from bp.data.codec import STATUS_NAMES, STATUSES
+from bp.entity.ballot import Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+
+import orjson
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+
+VERSION: int = 1
+"""int: Version of the deduplicated ballot format written by
+DeduplicatedCodec."""
+
+
+NO_DETAILS_URL: int = -1
+"""int: String index of ballots without details URL."""
+
+
+class DeduplicatedBallots(Sequence):
+    """Read-only sequence of ballots decoded from the deduplicated format.
+    Ballots are rebuilt on every access from the shared string and date
+    tables, so that all ballots referencing the same title, wording or date
+    share a single str or datetime instance. Slices share the tables as well.
+    """
+
+    def __init__(self, strings: List[str], dates: List[datetime], ballots: List[List[Any]], order: List[int]):
+        """Initialises the sequence with the decoded tables.
+
+        Args:
+            strings (List[str]): Interned titles, wordings and details URLs.
+            dates (List[datetime]): Interned bill dates.
+            ballots (List[List[Any]]): Distinct ballots, each consisting of
+            title, wording and date index, status name, percentage_yes and
+            accepting_cantons as str or None, and details URL index.
+            order (List[int]): Index into ballots for every element of the
+            sequence.
+        """
+        self.strings = strings
+        self.dates = dates
+        self.ballots = ballots
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index: int | slice) -> "DoubleMajorityBallot | DeduplicatedBallots":
+        if isinstance(index, slice):
+            return DeduplicatedBallots(self.strings, self.dates, self.ballots, self.order[index])
+
+        title, wording, date, status, percentage_yes, accepting_cantons, details_url = self.ballots[
+            self.order[index]]
+        return DoubleMajorityBallot(
+            Bill(self.strings[title], self.strings[wording], self.dates[date]),
+            STATUSES[status],
+            None if percentage_yes is None else DoubleMajorityBallotResult(
+                Decimal(percentage_yes), Decimal(accepting_cantons)),
+            None if details_url == NO_DETAILS_URL else self.strings[details_url])
+
+
+class DeduplicatedCodec:
+    """Compact JSON encoding of ballots for augmented datasets, in which many
+    ballots repeat the titles, wordings and dates of their source ballots.
+    Every distinct string and date is stored once and referenced by index.
+    Ballots with equal properties, such as source ballots included next to
+    their augmentations, are stored once as well and referenced by ID from
+    the ordered list of all ballots.
+    """
+
+    @staticmethod
+    def encode(ballots: List[DoubleMajorityBallot]) -> bytes:
+        """Encodes ballots in the deduplicated format.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to encode.
+
+        Returns:
+            bytes: Encoded ballots as UTF-8 JSON.
+        """
+        strings: Dict[str, int] = {}
+        dates: Dict[datetime, int] = {}
+        distinct_ballots: Dict[Tuple, int] = {}
+        order: List[int] = []
+        for ballot in ballots:
+            result: DoubleMajorityBallotResult | None = ballot.result
+            row: Tuple = (
+                strings.setdefault(ballot.bill.title, len(strings)),
+                strings.setdefault(ballot.bill.wording, len(strings)),
+                dates.setdefault(ballot.bill.date, len(dates)),
+                STATUS_NAMES[ballot.status],
+                None if result is None else str(result.percentage_yes),
+                None if result is None else str(result.accepting_cantons),
+                NO_DETAILS_URL if ballot.details_url is None else strings.setdefault(
+                    ballot.details_url, len(strings)))
+            order.append(distinct_ballots.setdefault(
+                row, len(distinct_ballots)))
+
+        return orjson.dumps({
+            "ballots": list(distinct_ballots),
+            "dates": [date.isoformat() for date in dates],
+            "order": order,
+            "strings": list(strings),
+            "version": VERSION
+        })
+
+    @staticmethod
+    def decode(data: bytes) -> DeduplicatedBallots:
+        """Decodes ballots encoded in the deduplicated format. Only the tables
+        are decoded, ballots are rebuilt on access.
+
+        Args:
+            data (bytes): Encoded ballots.
+
+        Raises:
+            ValueError: If data is not in a supported version of the
+            deduplicated format.
+
+        Returns:
+            DeduplicatedBallots: Decoded ballots.
+        """
+        decoded: Any = orjson.loads(data)
+        version: Any = decoded.get("version") if isinstance(
+            decoded, dict) else None
+        if version != VERSION:
+            raise ValueError(
+                f"Unsupported deduplicated ballot format version: {version}")
+        return DeduplicatedBallots(
+            decoded["strings"],
+            [datetime.fromisoformat(date) for date in decoded["dates"]],
+            decoded["ballots"],
+            decoded["order"])
@@ -0,0 +1,88 @@
+from lxml import etree, html
+from typing import Dict, List
+
+
+VOTE_ROW_PREFIXES: List[str] = [
+    "Abgestimmt am", "Abstimmung über Gegenentwurf"]
+"""List[str]: First column values of timetable rows containing the vote date of
+a bill, in order of preference."""
+
+
+FAILURE_ROW_PREFIXES: List[str] = ["Nicht zustandegekommen am",
+                                   "Im Sammelstadium gescheitert", "Zurückgezogen", "Bedingter Rückzug"]
+"""List[str]: First column values of timetable rows indicating that a bill
+failed without vote."""
+
+
+ROWS_AND_CELLS: etree.XPath = etree.XPath("//tr | //tr/td")
+"""etree.XPath: All table rows and their cells in document order."""
+
+
+class BillDetailsPage:
+    """Row index of a bill details page on www.bk.admin.ch. The timetable rows
+    of the page are collected in a single pass over all table cells, so that
+    looking up rows by the value of one of their cells does not need to search
+    the page again.
+    """
+
+    def __init__(self, content: html.HtmlElement, prefixes: List[str] = VOTE_ROW_PREFIXES + FAILURE_ROW_PREFIXES):
+        """Indexes all rows of content which contain a cell starting with one
+        of prefixes.
+
+        Args:
+            content (html.HtmlElement): Bill details HTML page.
+            prefixes (List[str], optional): Cell values by which rows can be
+            looked up. Defaults to VOTE_ROW_PREFIXES + FAILURE_ROW_PREFIXES.
+        """
+        self.rows: Dict[str, html.HtmlElement] = {}
+        """Dict[str, html.HtmlElement]: First row containing a cell whose text
+        starts with the key, for all prefixes found on the page."""
+        self.last_row: html.HtmlElement | None = None
+        """html.HtmlElement | None: Last table row on the page, if any."""
+
+        for element in ROWS_AND_CELLS(content):
+            if element.tag == "tr":
+                self.last_row = element
+                continue
+
+            text: str | None = BillDetailsPage.__get_first_text(element)
+            if text is None:
+                continue
+            for prefix in prefixes:
+                if prefix not in self.rows and text.startswith(prefix):
+                    self.rows[prefix] = element.getparent()
+
+    def find_row(self, prefixes: List[str]) -> html.HtmlElement | None:
+        """Looks up the row of the first prefix in prefixes found on the page.
+
+        Args:
+            prefixes (List[str]): Indexed cell value prefixes to look up.
+
+        Returns:
+            html.HtmlElement | None: "tr" row with a cell starting with the
+            first prefix found, or None if none of prefixes was found.
+        """
+        for prefix in prefixes:
+            row: html.HtmlElement | None = self.rows.get(prefix)
+            if row is not None:
+                return row
+        return None
+
+    @staticmethod
+    def __get_first_text(cell: html.HtmlElement) -> str | None:
+        """Provides the first text node of cell, which is the value the XPath
+        expression text() evaluates to in string comparisons.
+
+        Args:
+            cell (html.HtmlElement): Table cell.
+
+        Returns:
+            str | None: First text node directly inside of cell, or None if
+            cell has no text of its own.
+        """
+        if cell.text is not None:
+            return cell.text
+        for child in cell:
+            if child.tail is not None:
+                return child.tail
+        return None
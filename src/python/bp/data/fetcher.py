@@ -0,0 +1,279 @@
+import aiofiles
+import asyncio
+import httpx
+import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from hashlib import sha256
+from typing import Coroutine, Dict
+from urllib.parse import urlparse
+
+
+DEFAULT_MAX_CONCURRENCY: int = 8
+"""int: Default maximum number of HTTP requests in flight at the same time."""
+
+
+DEFAULT_REQUESTS_PER_SECOND_PER_HOST: float = 10.0
+"""float: Default maximum rate at which requests are started against a single
+host. Keeps full refreshes of www.bk.admin.ch polite despite the concurrency."""
+
+
+DEFAULT_TIMEOUT_SECONDS: float = 30.0
+"""float: Default timeout for a single HTTP request."""
+
+
+CACHE_DIRECTORY: str = "../resources/bk.admin.ch/cache"
+"""str: Location of the HTTP response cache relative to this module."""
+
+
+CACHE_INDEX: str = "index.json"
+"""str: Name of the file in the cache directory mapping URLs to cached
+responses."""
+
+
+CACHE_OBJECTS: str = "objects"
+"""str: Name of the directory in the cache directory containing response
+bodies, named by their SHA-256 hash."""
+
+
+class Fetcher(ABC):
+    """Implementing classes download the raw content of web pages. Chronology
+    uses this abstraction for all of its page downloads, which allows to
+    exchange the transport for tests or to add caching.
+    """
+
+    @abstractmethod
+    async def get(self, url: str) -> bytes:
+        """Downloads the page at url.
+
+        Args:
+            url (str): URL of the page to download.
+
+        Returns:
+            bytes: Raw, undecoded body of the page.
+        """
+        pass
+
+
+class HttpFetcher(Fetcher):
+    """Fetcher implementation based on a pooled httpx.AsyncClient with
+    keep-alive connections. Limits the number of concurrent requests and the
+    rate at which requests are sent to each host. Needs to be used as an async
+    context manager, which opens and disposes the connection pool.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, requests_per_second_per_host: float | None = DEFAULT_REQUESTS_PER_SECOND_PER_HOST, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        """Configures the fetcher without opening any connections.
+
+        Args:
+            max_concurrency (int, optional): Maximum number of requests in
+            flight at the same time. Also used as the connection pool size.
+            Defaults to DEFAULT_MAX_CONCURRENCY.
+            requests_per_second_per_host (float | None, optional): Maximum rate
+            at which requests are started against a single host, or None to
+            disable rate limiting. Defaults to
+            DEFAULT_REQUESTS_PER_SECOND_PER_HOST.
+            timeout (float, optional): Timeout in seconds for a single request.
+            Defaults to DEFAULT_TIMEOUT_SECONDS.
+        """
+        self.max_concurrency = max_concurrency
+        self.requests_per_second_per_host = requests_per_second_per_host
+        self.timeout = timeout
+
+    async def __aenter__(self):
+        """Opens the connection pool."""
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency)
+        self.client = httpx.AsyncClient(
+            limits=limits, timeout=self.timeout, follow_redirects=True)
+        await self.client.__aenter__()
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.next_request_times: Dict[str, float] = {}
+        return self
+
+    async def get(self, url: str) -> bytes:
+        """Downloads the page at url, waiting for a free concurrency slot and
+        for the rate limit of the host if necessary.
+
+        Args:
+            url (str): URL of the page to download.
+
+        Raises:
+            httpx.HTTPStatusError: If the server responded with an error
+            status code.
+
+        Returns:
+            bytes: Raw, undecoded body of the page.
+        """
+        response: httpx.Response = await self.send(url)
+        response.raise_for_status()
+        return response.content
+
+    async def send(self, url: str, headers: Dict[str, str] | None = None) -> httpx.Response:
+        """Sends a GET request to url, waiting for a free concurrency slot and
+        for the rate limit of the host if necessary. Unlike get, this gives
+        access to the full response and does not raise on error status codes,
+        which allows callers to send conditional requests.
+
+        Args:
+            url (str): URL of the page to download.
+            headers (Dict[str, str] | None, optional): Additional request
+            headers. Defaults to None.
+
+        Returns:
+            httpx.Response: Full response.
+        """
+        async with self.semaphore:
+            await self.__wait_for_rate_limit(urlparse(url).netloc)
+            return await self.client.get(url, headers=headers)
+
+    async def __wait_for_rate_limit(self, host: str) -> None:
+        """Reserves the next free request slot for host and sleeps until that
+        slot is reached.
+
+        Args:
+            host (str): Host to which the next request will be sent.
+        """
+        if self.requests_per_second_per_host is None:
+            return
+
+        now: float = asyncio.get_running_loop().time()
+        slot: float = max(now, self.next_request_times.get(host, now))
+        self.next_request_times[host] = slot + \
+            1.0 / self.requests_per_second_per_host
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> Coroutine:
+        """Disposes the connection pool."""
+        await self.client.__aexit__(exc_type, exc_val, exc_tb)
+
+
+class CachedFetcher(Fetcher):
+    """Decorator Fetcher implementation caching response bodies on disk.
+    Bodies are stored content-addressed by their SHA-256 hash, so identical
+    pages are only stored once. Cached pages are revalidated using conditional
+    requests based on their ETag and Last-Modified headers, unless the fetcher
+    is offline, in which case only cached pages are served. The URL index is
+    loaded in __aenter__ and written in __aexit__.
+    """
+
+    def __init__(self, fetcher: HttpFetcher | None, cache_directory: str = CACHE_DIRECTORY, offline: bool = False):
+        """Configures the cache without loading it.
+
+        Args:
+            fetcher (HttpFetcher | None): Fetcher to download and revalidate
+            pages with. May be None if offline is set.
+            cache_directory (str, optional): Directory in which to store the
+            cache, relative to this module. Defaults to CACHE_DIRECTORY.
+            offline (bool, optional): Whether to serve pages exclusively from
+            the cache without any network access. Defaults to False.
+        """
+        self.fetcher = fetcher
+        self.cache_directory = cache_directory
+        self.offline = offline
+
+    async def __aenter__(self):
+        """Loads the URL index of the cache."""
+        module_location: str = os.path.dirname(__file__)
+        self.path: str = os.path.join(module_location, self.cache_directory)
+        os.makedirs(os.path.join(self.path, CACHE_OBJECTS), exist_ok=True)
+        index_path: str = os.path.join(self.path, CACHE_INDEX)
+        if os.path.isfile(index_path):
+            async with aiofiles.open(index_path) as file:
+                self.index: Dict[str, Dict[str, str | None]] = json.loads(await file.read())
+        else:
+            self.index = {}
+        return self
+
+    async def get(self, url: str) -> bytes:
+        """Provides the page at url from the cache, revalidating it first
+        unless offline.
+
+        Args:
+            url (str): URL of the page to download.
+
+        Raises:
+            LookupError: If offline and url is not cached.
+            httpx.HTTPStatusError: If the server responded with an error
+            status code.
+
+        Returns:
+            bytes: Raw, undecoded body of the page.
+        """
+        entry: Dict[str, str | None] | None = self.index.get(url)
+        if self.offline:
+            if entry is None:
+                raise LookupError(f"Page is not cached: {url}")
+            return await self.__read(entry["sha256"])
+
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry["etag"] is not None:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"] is not None:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response: httpx.Response = await self.fetcher.send(url, headers)
+        if entry is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            return await self.__read(entry["sha256"])
+
+        response.raise_for_status()
+        content: bytes = response.content
+        digest: str = sha256(content).hexdigest()
+        await self.__write(digest, content)
+        self.index[url] = {
+            "sha256": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        return content
+
+    async def __read(self, digest: str) -> bytes:
+        """Reads a cached response body.
+
+        Args:
+            digest (str): SHA-256 hash of the response body.
+
+        Returns:
+            bytes: Cached response body.
+        """
+        async with aiofiles.open(self.__get_object_path(digest), "rb") as file:
+            return await file.read()
+
+    async def __write(self, digest: str, content: bytes) -> None:
+        """Stores a response body, unless an identical one is already cached.
+        Bodies are written to a temporary file first, so that an interrupted
+        run never leaves a truncated body behind.
+
+        Args:
+            digest (str): SHA-256 hash of content.
+            content (bytes): Response body to cache.
+        """
+        path: str = self.__get_object_path(digest)
+        if os.path.isfile(path):
+            return
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(path))
+        os.close(descriptor)
+        async with aiofiles.open(temporary_path, "wb") as file:
+            await file.write(content)
+        os.replace(temporary_path, path)
+
+    def __get_object_path(self, digest: str) -> str:
+        """Provides the path to the file storing a cached response body.
+
+        Args:
+            digest (str): SHA-256 hash of the response body.
+
+        Returns:
+            str: Path to the cached response body.
+        """
+        return os.path.join(self.path, CACHE_OBJECTS, digest)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> Coroutine:
+        """Writes the URL index of the cache."""
+        async with aiofiles.open(os.path.join(self.path, CACHE_INDEX), "w") as file:
+            await file.write(json.dumps(self.index, sort_keys=True, indent=4))
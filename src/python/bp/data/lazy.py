@@ -0,0 +1,295 @@
+from bp.data.binary import EPOCH, HAS_DETAILS_URL, HAS_RESULT, HEADER, MICROSECOND, STRING_COLUMNS, BinaryCodec
+from bp.entity.ballot import STATUSES_BY_VALUE, BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.fixed_point import from_fixed_point
+
+import mmap
+import struct
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+from functools import cached_property
+
+
+INT8: struct.Struct = struct.Struct("<b")
+"""struct.Struct: Exponent of a fixed point decimal."""
+
+
+INT64: struct.Struct = struct.Struct("<q")
+"""struct.Struct: Date or coefficient of a fixed point decimal."""
+
+
+UINT32: struct.Struct = struct.Struct("<I")
+"""struct.Struct: Offset into the string blob."""
+
+
+TITLE: int = 0
+"""int: String column of bill titles."""
+
+
+WORDING: int = 1
+"""int: String column of bill wordings."""
+
+
+DETAILS_URL: int = 2
+"""int: String column of details URLs."""
+
+
+class BallotCollection(Sequence):
+    """Read-only sequence of ballots in the binary format of BinaryCodec, which
+    are decoded lazily from an underlying buffer such as a memory-mapped file.
+    Accessing an element only creates a BallotView, whose properties are
+    decoded from the buffer on first access. Slicing and filtering share the
+    buffer and only select ballot indices, so that e.g. iterating over all
+    titles never decodes a single wording.
+
+    Collections opened from a file need to be closed, which invalidates all
+    collections and views sharing the same buffer.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap, indices: Sequence[int] | None = None):
+        """Validates the header of buffer and locates its columns.
+
+        Args:
+            buffer (bytes | mmap.mmap): Ballots encoded by BinaryCodec.
+            indices (Sequence[int] | None, optional): Indices of the encoded
+            ballots contained in this collection, in order. Defaults to None,
+            which selects all ballots.
+
+        Raises:
+            ValueError: If buffer is not in a supported version of the binary
+            format.
+        """
+        self.buffer = buffer
+        self.count: int = BinaryCodec.read_count(buffer)
+        """int: Number of ballots in buffer."""
+        self.indices: Sequence[int] = range(
+            self.count) if indices is None else indices
+        """Sequence[int]: Indices of ballots in buffer which are part of this
+        collection."""
+
+        count: int = self.count
+        self.status_offset: int = HEADER.size
+        self.flags_offset: int = self.status_offset + count
+        self.date_offset: int = self.flags_offset + count
+        self.percentage_yes_offset: int = self.date_offset + INT64.size * count
+        self.percentage_yes_exponent_offset: int = self.percentage_yes_offset + \
+            INT64.size * count
+        self.accepting_cantons_offset: int = self.percentage_yes_exponent_offset + count
+        self.accepting_cantons_exponent_offset: int = self.accepting_cantons_offset + \
+            INT64.size * count
+        self.string_offsets_offset: int = self.accepting_cantons_exponent_offset + count
+        self.blob_offset: int = self.string_offsets_offset + \
+            UINT32.size * (STRING_COLUMNS * count + 1)
+
+    @staticmethod
+    def open(file_path: str) -> "BallotCollection":
+        """Memory-maps a file in the binary format.
+
+        Args:
+            file_path (str): Path to the binary file.
+
+        Raises:
+            ValueError: If the file is not in a supported version of the
+            binary format.
+
+        Returns:
+            BallotCollection: All ballots in the file.
+        """
+        with open(file_path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return BallotCollection(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+
+    def close(self) -> None:
+        """Releases the memory map, if any."""
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "BallotCollection":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index: int | slice) -> "BallotView | BallotCollection":
+        if isinstance(index, slice):
+            return self.__select(self.indices[index])
+        return BallotView(self, self.indices[index])
+
+    def with_status(self, status: BallotStatus) -> "BallotCollection":
+        """Selects all ballots with the given status. Only the status column
+        is read.
+
+        Args:
+            status (BallotStatus): Status to filter by.
+
+        Returns:
+            BallotCollection: Ballots of this collection with status, in
+            order.
+        """
+        value: int = status.value
+        buffer: bytes | mmap.mmap = self.buffer
+        offset: int = self.status_offset
+        return self.__select([index for index in self.indices if buffer[offset + index] == value])
+
+    def read_status(self, index: int) -> BallotStatus:
+        """Decodes the status of a ballot.
+
+        Args:
+            index (int): Index of the ballot in buffer.
+
+        Returns:
+            BallotStatus: Status of the ballot.
+        """
+        return STATUSES_BY_VALUE[self.buffer[self.status_offset + index]]
+
+    def read_date(self, index: int) -> datetime:
+        """Decodes the bill date of a ballot.
+
+        Args:
+            index (int): Index of the ballot in buffer.
+
+        Returns:
+            datetime: Bill date of the ballot.
+        """
+        microseconds: int = INT64.unpack_from(
+            self.buffer, self.date_offset + INT64.size * index)[0]
+        return EPOCH + microseconds * MICROSECOND
+
+    def read_result(self, index: int) -> DoubleMajorityBallotResult | None:
+        """Decodes the result of a ballot.
+
+        Args:
+            index (int): Index of the ballot in buffer.
+
+        Returns:
+            DoubleMajorityBallotResult | None: Result of the ballot, if any.
+        """
+        if not self.buffer[self.flags_offset + index] & HAS_RESULT:
+            return None
+        return DoubleMajorityBallotResult(
+            self.__read_decimal(
+                self.percentage_yes_offset, self.percentage_yes_exponent_offset, index),
+            self.__read_decimal(self.accepting_cantons_offset, self.accepting_cantons_exponent_offset, index))
+
+    def read_details_url(self, index: int) -> str | None:
+        """Decodes the details URL of a ballot.
+
+        Args:
+            index (int): Index of the ballot in buffer.
+
+        Returns:
+            str | None: Details URL of the ballot, if any.
+        """
+        if not self.buffer[self.flags_offset + index] & HAS_DETAILS_URL:
+            return None
+        return self.read_string(DETAILS_URL, index)
+
+    def read_string(self, column: int, index: int) -> str:
+        """Decodes a string property of a ballot.
+
+        Args:
+            column (int): TITLE, WORDING or DETAILS_URL.
+            index (int): Index of the ballot in buffer.
+
+        Returns:
+            str: Decoded string.
+        """
+        position: int = self.string_offsets_offset + \
+            UINT32.size * (column * self.count + index)
+        start: int = UINT32.unpack_from(self.buffer, position)[0]
+        end: int = UINT32.unpack_from(
+            self.buffer, position + UINT32.size)[0]
+        return str(self.buffer[self.blob_offset + start:self.blob_offset + end], "utf-8")
+
+    def __select(self, indices: Sequence[int]) -> "BallotCollection":
+        """Creates a collection sharing the buffer of this one.
+
+        Args:
+            indices (Sequence[int]): Indices of the selected ballots in buffer.
+
+        Returns:
+            BallotCollection: Collection of the selected ballots.
+        """
+        return BallotCollection(self.buffer, indices)
+
+    def __read_decimal(self, coefficient_offset: int, exponent_offset: int, index: int) -> Decimal:
+        """Decodes a fixed point decimal.
+
+        Args:
+            coefficient_offset (int): Start of the coefficient column.
+            exponent_offset (int): Start of the exponent column.
+            index (int): Index of the ballot in buffer.
+
+        Returns:
+            Decimal: Decoded decimal.
+        """
+        coefficient: int = INT64.unpack_from(
+            self.buffer, coefficient_offset + INT64.size * index)[0]
+        exponent: int = INT8.unpack_from(
+            self.buffer, exponent_offset + index)[0]
+        return from_fixed_point(coefficient, exponent)
+
+
+class BillView(Bill):
+    """Bill of a BallotView, whose properties are decoded on first access."""
+
+    def __init__(self, collection: BallotCollection, index: int):
+        """Initialises the view without decoding any property.
+
+        Args:
+            collection (BallotCollection): Collection containing the bill.
+            index (int): Index of the ballot in the collection buffer.
+        """
+        self.collection = collection
+        self.index = index
+
+    @cached_property
+    def title(self) -> str:
+        return self.collection.read_string(TITLE, self.index)
+
+    @cached_property
+    def wording(self) -> str:
+        return self.collection.read_string(WORDING, self.index)
+
+    @cached_property
+    def date(self) -> datetime:
+        return self.collection.read_date(self.index)
+
+
+class BallotView(DoubleMajorityBallot):
+    """Ballot in a BallotCollection, whose properties are decoded on first
+    access.
+    """
+
+    def __init__(self, collection: BallotCollection, index: int):
+        """Initialises the view without decoding any property.
+
+        Args:
+            collection (BallotCollection): Collection containing the ballot.
+            index (int): Index of the ballot in the collection buffer.
+        """
+        self.collection = collection
+        self.index = index
+
+    @cached_property
+    def bill(self) -> Bill:
+        return BillView(self.collection, self.index)
+
+    @cached_property
+    def status(self) -> BallotStatus:
+        return self.collection.read_status(self.index)
+
+    @cached_property
+    def result(self) -> DoubleMajorityBallotResult | None:
+        return self.collection.read_result(self.index)
+
+    @cached_property
+    def details_url(self) -> str | None:
+        return self.collection.read_details_url(self.index)
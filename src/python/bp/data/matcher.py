@@ -0,0 +1,103 @@
+import Levenshtein
+import re
+from thefuzz import fuzz, utils
+from typing import Dict, FrozenSet, List
+
+
+class TitleMatcher:
+    """Fuzzy index over a fixed list of candidate titles, e.g. all ballot
+    titles on a vote result page. All normalisation of the candidates is done
+    once on construction, so that matching many titles against the same
+    candidates only scores the titles themselves. Candidates which do not share
+    a single word with the title are pruned before scoring, unless no candidate
+    shares a word with the title at all.
+    """
+
+    def __init__(self, titles: List[str], aliases: Dict[str, str] | None = None):
+        """Normalises and tokenises all candidate titles.
+
+        Args:
+            titles (List[str]): Lower case candidate titles.
+            aliases (Dict[str, str] | None, optional): Replacements applied to
+            each searched title before matching. Used for titles which were
+            renamed to a degree that they can no longer be associated with
+            their candidate. Defaults to None.
+        """
+        self.titles = titles
+        self.aliases: Dict[str, str] = aliases or {}
+        self.alias_pattern: re.Pattern | None = re.compile("|".join(
+            re.escape(alias) for alias in self.aliases)) if self.aliases else None
+        self.sorted_tokens: List[str] = []
+        self.token_sets: List[FrozenSet[str]] = []
+        for title in titles:
+            tokens: List[str] = TitleMatcher.__tokenise(title)
+            self.sorted_tokens.append(" ".join(sorted(tokens)))
+            self.token_sets.append(frozenset(tokens))
+
+    def find(self, title: str) -> int | None:
+        """Identifies the candidate most similar to title. A candidate needs to
+        be the most similar one according to both the Levenshtein ratio and the
+        partial token sort ratio.
+
+        Args:
+            title (str): Title to search for.
+
+        Raises:
+            ValueError: If the two similarity measures disagree on the most
+            similar candidate.
+
+        Returns:
+            int | None: Index of the most similar candidate in titles, or None
+            if there are no candidates.
+        """
+        if self.alias_pattern is not None:
+            title = self.alias_pattern.sub(
+                lambda match: self.aliases[match.group(0)], title)
+        title = title.lower()
+        tokens: List[str] = TitleMatcher.__tokenise(title)
+        sorted_tokens: str = " ".join(sorted(tokens))
+        token_set: FrozenSet[str] = frozenset(tokens)
+
+        candidates: List[int] = [index for index, candidate_tokens in enumerate(
+            self.token_sets) if not token_set.isdisjoint(candidate_tokens)]
+        if not candidates:
+            candidates = list(range(len(self.titles)))
+
+        max_levenshtein_ratio: float = 0.0
+        max_levenshtein_title: str = ""
+        max_token_sort_ratio: int = 0
+        max_token_sort_title: str = ""
+        best_index: int | None = None
+
+        for index in candidates:
+            actual_title: str = self.titles[index]
+            levenshtein_ratio: float = Levenshtein.ratio(title, actual_title)
+            token_sort_ratio: int = fuzz.partial_ratio(
+                sorted_tokens, self.sorted_tokens[index])
+            if levenshtein_ratio > max_levenshtein_ratio and token_sort_ratio > max_token_sort_ratio:
+                best_index = index
+            if levenshtein_ratio > max_levenshtein_ratio:
+                max_levenshtein_ratio = levenshtein_ratio
+                max_levenshtein_title = actual_title
+            if token_sort_ratio > max_token_sort_ratio:
+                max_token_sort_ratio = token_sort_ratio
+                max_token_sort_title = actual_title
+
+        if max_levenshtein_title != max_token_sort_title:
+            raise ValueError(
+                f"Inconclusive similarity evaluation for: {title}")
+        return best_index
+
+    @staticmethod
+    def __tokenise(title: str) -> List[str]:
+        """Splits title into words using the same normalisation as
+        fuzz.partial_token_sort_ratio, so that sorting and joining the tokens
+        yields exactly the string that function compares.
+
+        Args:
+            title (str): Title to tokenise.
+
+        Returns:
+            List[str]: Normalised words of title.
+        """
+        return utils.full_process(title, force_ascii=True).split()
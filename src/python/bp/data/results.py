@@ -0,0 +1,100 @@
+from bp.data.fetcher import Fetcher
+from bp.data.matcher import TitleMatcher
+from bp.data.scraper import Scraper
+
+import asyncio
+from datetime import datetime
+from lxml import etree, html
+from typing import Dict, List
+
+
+RESULT_TITLE_ALIASES: Dict[str, str] = {
+    "für eine Reichtumssteuer": "Volksbegehren 'zur Steuerharmonisierung, zur stärkeren Besteuerung des Reichtums und zur Entlastung der unteren Einkommen (Reichtumsteuer-Initiative)'",
+    "für die Mitbestimmung der Arbeitnehmer": "Bundesbeschluss vom 04.10.1974 betreffend das Volksbegehren über die Mitbestimmung",
+    "Förderung des Wohnungsbaus": "Bundesbeschluss vom 17.12.1971 betreffend die Ergänzung der Bundesverfassung durch einen Artikel 34sexies über den Wohnungsbau und betreffend das Volksbegehren zur Bildung eines Wohnbaufonds (Denner-Initiative)",
+    "Soziale Krankenversicherung": "Bundesbeschluss vom 22.03.1974 über das Volksbegehren für die soziale Krankenversicherung und die Aenderung der Bundesverfassung auf dem Gebiet der Kranken-, Unfall- und Mutterschaftsversicherung",
+    "betreffend die Erlangung des Schweizerbürgerrechts, Teil I; betreffend die Ausweisung von Ausländern, Teil II": "Eidgenössische Volksinitiative 'betreffend die Ausweisung von Ausländern, Teil II'"
+}
+"""
+Dict[str, str]: Bill titles which were changed on the vote result page to a
+degree that they can no longer be associated with the bill, mapped to their
+title on the vote result page.
+"""
+
+
+RESULT_HEADINGS: etree.XPath = etree.XPath(
+    "//div[contains(@class, 'mod-text')]//h3")
+"""etree.XPath: Ballot titles on a vote result page."""
+
+
+RESULT_TABLE: etree.XPath = etree.XPath("following-sibling::table[1]")
+"""etree.XPath: Result table following a ballot title."""
+
+
+class VoteResultPage:
+    """Index of a vote result page on www.bk.admin.ch. Vote results are
+    published per voting day, so a single page contains the results of all
+    ballots held on that day. The page is parsed once and all ballot titles
+    and their result tables are extracted up front.
+    """
+
+    def __init__(self, content: html.HtmlElement):
+        """Extracts all ballot titles and result tables from content.
+
+        Args:
+            content (html.HtmlElement): Voting day results page.
+        """
+        headings: List[html.HtmlElement] = RESULT_HEADINGS(content)
+        self.titles: List[str] = [
+            Scraper.convert_to_text(heading).lower() for heading in headings]
+        """List[str]: Lower case plain text titles of all ballots."""
+        self.tables: List[html.HtmlElement | None] = [
+            next(iter(RESULT_TABLE(heading)), None) for heading in headings]
+        """List[html.HtmlElement | None]: Result table following each title in
+        titles, if any."""
+        self.matcher = TitleMatcher(self.titles, RESULT_TITLE_ALIASES)
+        """TitleMatcher: Fuzzy index over titles."""
+
+
+class VoteResultPages:
+    """Memoises vote result pages by voting day during a single collection
+    run. Ballots held on the same day share one download and one parse of the
+    result page, even if they are collected concurrently.
+    """
+
+    def __init__(self, fetcher: Fetcher):
+        """Initialises an empty memo.
+
+        Args:
+            fetcher (Fetcher): Fetcher to download result pages with.
+        """
+        self.fetcher = fetcher
+        self.pages: Dict[datetime, asyncio.Future[VoteResultPage]] = {}
+
+    async def get(self, date: datetime) -> VoteResultPage:
+        """Provides the vote result page of a voting day, downloading it only
+        on first access.
+
+        Args:
+            date (datetime): Voting day.
+
+        Returns:
+            VoteResultPage: Vote results of all ballots held on date.
+        """
+        page: asyncio.Future[VoteResultPage] | None = self.pages.get(date)
+        if page is None:
+            page = asyncio.ensure_future(self.__load(date))
+            self.pages[date] = page
+        return await page
+
+    async def __load(self, date: datetime) -> VoteResultPage:
+        """Downloads and indexes the vote result page of a voting day.
+
+        Args:
+            date (datetime): Voting day.
+
+        Returns:
+            VoteResultPage: Vote results of all ballots held on date.
+        """
+        vote_result_url: str = f"https://www.bk.admin.ch/ch/d/pore/va/{date.year}{date.month:02d}{date.day:02d}/index.html"
+        return VoteResultPage(Scraper.parse(await self.fetcher.get(vote_result_url)))
@@ -1,6 +1,8 @@
-import re
-from lxml import html
-from typing import List
+import charset_normalizer
+import codecs
+from enum import Enum
+from lxml import etree, html
+from typing import Dict, Iterator, List, Tuple
 from urllib.parse import urlparse, ParseResult
 
 
@@ -8,14 +10,40 @@ SUPERSCRIPT_MARKER: str = "^"
 """str: Superscript prefix used in HTML to plain text conversions."""
 
 
-SUPERSCRIPT_MARKER_ONLY_PATTERN: re.Pattern = re.compile("^\s*\^\s*$")
-"""re.Pattern: Pattern matching strings which only contain whitespaces and the
-superscript marker."""
+STREAM_CHUNK_SIZE: int = 64 * 1024
+"""int: Number of bytes fed to the incremental HTML parser at once."""
 
 
-WHITESPACE_ONLY_PATTERN: re.Pattern = re.compile("^\s*$")
-"""re.Pattern: Matches strings which only contain whitespaces. Used for removal
-of empty lines."""
+CHARACTER_REPLACEMENTS: Dict[str, str] = {
+    "\xa0": " ",
+    "\u00ad": "",
+    "\u2013": "-"
+}
+"""Dict[str, str]: Mapping of special characters to their ASCII equivalents in
+plain text conversions."""
+
+
+CHARACTER_TRANSLATION: Dict[int, str] = str.maketrans(CHARACTER_REPLACEMENTS)
+"""Dict[int, str]: CHARACTER_REPLACEMENTS as a str.translate table, which
+replaces all special characters in a single pass."""
+
+
+class TextContent(Enum):
+    """Kinds of plain text content of an element, which determine whether the
+    element is omitted from plain text conversions.
+    """
+
+    EMPTY = 1
+    """No text at all."""
+
+    WHITESPACE = 2
+    """Only whitespaces. Paragraphs containing only whitespaces are omitted."""
+
+    SUPERSCRIPT_MARKER = 3
+    """Only the superscript marker and whitespaces, which is omitted."""
+
+    TEXT = 4
+    """Actual text."""
 
 
 class Scraper:
@@ -36,6 +64,107 @@ class Scraper:
         new_path: str = "/".join(parsed_url.path.split("/")[:-1])
         return parsed_url._replace(path=new_path).geturl()
 
+    @staticmethod
+    def parse(content: bytes) -> html.HtmlElement:
+        """Parses a downloaded HTML page. The character encoding is detected
+        from the content itself, since the HTTP headers of www.bk.admin.ch do
+        not reliably declare it.
+
+        Args:
+            content (bytes): Raw page content.
+
+        Returns:
+            html.HtmlElement: Root element of the parsed page.
+        """
+        return html.fromstring(Scraper.decode(content))
+
+    @staticmethod
+    def decode(content: bytes) -> str:
+        """Decodes raw page content using its detected character encoding.
+        Undecodable bytes are replaced instead of raising an error.
+
+        Args:
+            content (bytes): Raw page content.
+
+        Returns:
+            str: Decoded page content.
+        """
+        return str(content, Scraper.detect_encoding(content), errors="replace")
+
+    @staticmethod
+    def detect_encoding(content: bytes) -> str:
+        """Detects the character encoding of raw page content. Falls back to
+        UTF-8 if the encoding cannot be detected.
+
+        Args:
+            content (bytes): Raw page content.
+
+        Returns:
+            str: Name of the detected encoding.
+        """
+        encoding: str | None = charset_normalizer.detect(content)["encoding"]
+        try:
+            return codecs.lookup(encoding).name
+        except (LookupError, TypeError):
+            return "utf-8"
+
+    @staticmethod
+    def convert_divs_to_text(content: bytes, class_name: str) -> str:
+        """Streaming equivalent of parsing content and converting all div
+        elements whose class attribute contains class_name to plain text. The
+        page is parsed incrementally and all elements outside of these divs are
+        discarded as soon as they are complete, so that the parsed tree never
+        holds much more than the divs themselves. content is passed to the
+        parser undecoded, unless the parser does not support its encoding.
+
+        Args:
+            content (bytes): Raw page content.
+            class_name (str): Class of the divs to convert.
+
+        Returns:
+            str: Plain text of all matching divs in document order.
+        """
+        encoding: str = Scraper.detect_encoding(content)
+        data: bytes | str = content
+        try:
+            parser = etree.HTMLPullParser(
+                events=("start", "end"), tag="div", encoding=encoding)
+        except LookupError:
+            parser = etree.HTMLPullParser(
+                events=("start", "end"), tag="div")
+            data = str(content, encoding, errors="replace")
+
+        def read_events() -> Iterator[Tuple[str, etree._Element]]:
+            for offset in range(0, len(data), STREAM_CHUNK_SIZE):
+                parser.feed(data[offset:offset + STREAM_CHUNK_SIZE])
+                yield from parser.read_events()
+            parser.close()
+            yield from parser.read_events()
+
+        texts: List[str] = []
+        open_divs: List[int] = []
+        finished_divs: List[Tuple[int, etree._Element]] = []
+        for event, element in read_events():
+            for index, div in finished_divs:
+                texts[index] = Scraper.convert_to_text(div)
+            finished_divs.clear()
+
+            is_text_div: bool = class_name in element.get("class", "")
+            if event == "start":
+                if is_text_div:
+                    open_divs.append(len(texts))
+                    texts.append("")
+            elif is_text_div:
+                finished_divs.append((open_divs.pop(), element))
+            elif not open_divs:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+        for index, div in finished_divs:
+            texts[index] = Scraper.convert_to_text(div)
+        return "".join(texts)
+
     @staticmethod
     def convert_to_text(element: List[html.HtmlElement] | html.Element) -> str:
         """Helper to convert an HTML element to plain text. Insofar as useful
@@ -53,49 +182,143 @@ class Scraper:
             str: Plain text with equivalent formatting using special characters
             to represent the original formatted HTML.
         """
-        if isinstance(element, List):
-            return "".join([Scraper.convert_to_text(child) for child in element])
-        
-        text: str = ""
-        if element.tag == "ol":
-            index = 1
-            for li in element:
-                text += str(index)
-                text += ". "
-                text += Scraper.convert_to_text(li)
-                text += "\n"
-                index += 1
-            text += "\n"
-            return text
-
-        is_paragraph: bool = False
-        if element.tag == "sup":
-            text += SUPERSCRIPT_MARKER
-        elif element.tag == "br":
-            text = text.rstrip(" ")
-            text += "\n"
-        elif element.tag == "p":
-            is_paragraph = True
-        elif element.tag == "div" and element.get("id") == "contentNavigation":
-            return ""
-
-        if element.text:
-            text += element.text
-        text += Scraper.convert_to_text([child for child in element])
-
-        if element.tail:
-            text += element.tail
-
-        if text == "" or re.match(SUPERSCRIPT_MARKER_ONLY_PATTERN, text):
-            return ""
-
-        if is_paragraph:
-            if re.match(WHITESPACE_ONLY_PATTERN, text):
-                return ""
-            text = text.rstrip(" ")
-            text += "\n\n"
-        text = text.replace("\xa0", " ")
-        text = text.replace("\u00ad", "")
-        text = text.replace("\u2013", "-")
-        text = text.replace("\u002d", "-")
-        return text
+        fragments: List[str] = []
+        depths: List[int] = []
+        elements: List[html.HtmlElement] = element if isinstance(
+            element, List) else [element]
+        for root in elements:
+            Scraper.__append_text(root, fragments, depths)
+        return "".join(fragments).translate(CHARACTER_TRANSLATION)
+
+    @staticmethod
+    def __append_text(root: html.HtmlElement, fragments: List[str], depths: List[int]) -> None:
+        """Converts root to plain text using an explicit stack instead of
+        recursion. Text is appended to fragments without any character
+        normalisation, which convert_to_text applies once to the joined text.
+        Each fragment is recorded with the depth of the element it belongs to
+        in depths, which allows to tell text of an element from text of its
+        descendants. Descendant text is treated as already normalised when
+        deciding whether an element is empty.
+
+        Args:
+            root (html.HtmlElement): Element to convert.
+            fragments (List[str]): Plain text fragments to append to.
+            depths (List[int]): Depth of the element each fragment belongs to.
+        """
+        stack: List[Tuple[html.HtmlElement, str, Iterator, int]] = []
+        element: html.HtmlElement | None = root
+        while True:
+            if element is not None:
+                tag: str = element.tag
+                if tag == "div" and element.get("id") == "contentNavigation":
+                    if not stack:
+                        return
+                    if stack[-1][1] == "ol":
+                        fragments.append("\n")
+                        depths.append(len(stack) - 1)
+                else:
+                    depth: int = len(stack)
+                    start: int = len(fragments)
+                    if tag == "sup":
+                        fragments.append(SUPERSCRIPT_MARKER)
+                        depths.append(depth)
+                    elif tag == "br":
+                        fragments.append("\n")
+                        depths.append(depth)
+                    if tag == "ol":
+                        stack.append((element, tag, enumerate(element, 1), start))
+                    else:
+                        text: str | None = element.text
+                        if text:
+                            fragments.append(text)
+                            depths.append(depth)
+                        stack.append((element, tag, iter(element), start))
+
+            element, tag, children, start = stack[-1]
+            child: html.HtmlElement | Tuple[int, html.HtmlElement] | None = next(
+                children, None)
+            if child is not None:
+                if tag == "ol":
+                    index, child = child
+                    fragments.append(f"{index}. ")
+                    depths.append(len(stack) - 1)
+                element = child
+                continue
+
+            stack.pop()
+            depth = len(stack)
+            if tag == "ol":
+                fragments.append("\n")
+                depths.append(depth)
+            else:
+                tail: str | None = element.tail
+                if tail:
+                    fragments.append(tail)
+                    depths.append(depth)
+                content: TextContent = Scraper.__classify(
+                    fragments, depths, start, depth)
+                if content == TextContent.EMPTY or content == TextContent.SUPERSCRIPT_MARKER or (content == TextContent.WHITESPACE and tag == "p"):
+                    del fragments[start:]
+                    del depths[start:]
+                elif tag == "p":
+                    Scraper.__strip_trailing_spaces(fragments, depths, depth)
+                    fragments.append("\n\n")
+                    depths.append(depth)
+
+            if not stack:
+                return
+            if stack[-1][1] == "ol":
+                fragments.append("\n")
+                depths.append(depth - 1)
+            element = None
+
+    @staticmethod
+    def __classify(fragments: List[str], depths: List[int], start: int, depth: int) -> TextContent:
+        """Classifies the plain text of an element, stopping at the first
+        fragment which contains actual text.
+
+        Args:
+            fragments (List[str]): Plain text fragments.
+            depths (List[int]): Depth of the element each fragment belongs to.
+            start (int): Index of the first fragment of the element.
+            depth (int): Depth of the element.
+
+        Returns:
+            TextContent: Kind of text the element contains.
+        """
+        content: TextContent = TextContent.EMPTY
+        for index in range(start, len(fragments)):
+            fragment: str = fragments[index]
+            if depths[index] != depth:
+                fragment = fragment.replace("\u00ad", "")
+            if not fragment:
+                continue
+            fragment = fragment.strip()
+            if not fragment:
+                if content == TextContent.EMPTY:
+                    content = TextContent.WHITESPACE
+            elif fragment == SUPERSCRIPT_MARKER and content != TextContent.SUPERSCRIPT_MARKER:
+                content = TextContent.SUPERSCRIPT_MARKER
+            else:
+                return TextContent.TEXT
+        return content
+
+    @staticmethod
+    def __strip_trailing_spaces(fragments: List[str], depths: List[int], depth: int) -> None:
+        """Removes trailing spaces from the plain text of an element, which
+        needs to contain text other than spaces. Characters which are mapped to
+        a space or removed by normalisation are treated as spaces in descendant
+        text, since it is already normalised.
+
+        Args:
+            fragments (List[str]): Plain text fragments.
+            depths (List[int]): Depth of the element each fragment belongs to.
+            depth (int): Depth of the element.
+        """
+        index: int = len(fragments)
+        fragment: str = ""
+        while not fragment:
+            index -= 1
+            characters: str = " " if depths[index] == depth else " \xa0\u00ad"
+            fragment = fragments[index].rstrip(characters)
+            fragments[index] = fragment
@@ -1,14 +1,21 @@
+from bp.data.binary import BinaryCodec
+from bp.data.codec import EntityCodec
+from bp.data.dedup import DeduplicatedCodec
+from bp.data.lazy import BallotCollection
+from bp.data.shards import ShardedDataset
 from bp.entity.ballot import Bill, DoubleMajorityBallot, DoubleMajorityBallotResult, BallotStatus
 
 import aiofiles
+import json
 import jsonpickle
 import os
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from jsonpickle import Pickler, Unpickler
 from jsonpickle.handlers import BaseHandler
 from jsonpickle.tags import OBJECT
-from typing import Any, List
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List
 
 
 INITIATIVES: str = "../resources/bk.admin.ch/initiatives.json"
@@ -20,75 +27,343 @@ AUGMENTED_INITIATIVES: str = "../resources/bk.admin.ch/augmented-initiatives.jso
 file."""
 
 
+STREAM_CHUNK_SIZE: int = 64 * 1024
+"""int: Number of characters read at once when streaming ballots from JSON."""
+
+
+STREAM_INDENT: str = "    "
+"""str: Indentation of list elements in jsonpickle JSON files, matching the
+configured encoder options."""
+
+
+BINARY_EXTENSION: str = ".bin"
+"""str: File extension replacing ".json" for files in StorageFormat.BINARY."""
+
+
+SHARDED_EXTENSION: str = ".shards"
+"""str: Extension replacing ".json" for directories in StorageFormat.SHARDED.
+"""
+
+
+DEDUPLICATED_EXTENSION: str = ".dedup.json"
+"""str: File extension replacing ".json" for files in
+StorageFormat.DEDUPLICATED."""
+
+
+class StorageFormat(Enum):
+    """File formats in which ballots can be persisted."""
+
+    JSON = 1
+    """Human-readable jsonpickle JSON, which is the default."""
+
+    BINARY = 2
+    """Compact binary format implemented by BinaryCodec, which loads
+    considerably faster than JSON. Stored next to the JSON file, with the
+    extension replaced by BINARY_EXTENSION.
+    """
+
+    SHARDED = 3
+    """Directory of compressed shards implemented by ShardedDataset, which are
+    decoded in parallel for large datasets. Stored next to the JSON file, with
+    the extension replaced by SHARDED_EXTENSION.
+    """
+
+    DEDUPLICATED = 4
+    """Compact JSON implemented by DeduplicatedCodec, which stores repeated
+    strings, dates and ballots once, as is typical for augmented datasets.
+    Loaded as a DeduplicatedBallots sequence, which rebuilds ballots on
+    access. Stored next to the JSON file, with the extension replaced by
+    DEDUPLICATED_EXTENSION.
+    """
+
+
 class Serialisation:
     """Helper to serialise and deserialise JSON data."""
 
     @staticmethod
-    async def write_initiatives(ballots: List[DoubleMajorityBallotResult]):
+    async def write_initiatives(ballots: List[DoubleMajorityBallotResult], storage_format: StorageFormat = StorageFormat.JSON):
         """Persist original initiatives downloaded from bk.admin.ch.
 
         Args:
             ballots (List[DoubleMajorityBallotResult]): Downloaded double
             majority ballots.
+            storage_format (StorageFormat, optional): Format in which to
+            persist. Defaults to StorageFormat.JSON.
         """
-        await Serialisation.__encode_and_write(ballots, INITIATIVES)
+        await Serialisation.__encode_and_write(ballots, INITIATIVES, storage_format)
 
     @staticmethod
-    async def write_augmented_initiatives(ballots: List[DoubleMajorityBallotResult]):
+    async def write_augmented_initiatives(ballots: List[DoubleMajorityBallotResult], storage_format: StorageFormat = StorageFormat.JSON):
         """Persist augmented initiatives downloaded from bk.admin.ch.
 
         Args:
             ballots (List[DoubleMajorityBallotResult]): Augmented double
             majority ballots.
+            storage_format (StorageFormat, optional): Format in which to
+            persist. Defaults to StorageFormat.JSON.
         """
-        await Serialisation.__encode_and_write(ballots, AUGMENTED_INITIATIVES)
+        await Serialisation.__encode_and_write(ballots, AUGMENTED_INITIATIVES, storage_format)
 
     @staticmethod
-    async def load_initiatives() -> List[DoubleMajorityBallot]:
+    async def load_initiatives(storage_format: StorageFormat = StorageFormat.JSON) -> List[DoubleMajorityBallot]:
         """Deserialise persisted initiatives.
 
+        Args:
+            storage_format (StorageFormat, optional): Format from which to
+            load. Defaults to StorageFormat.JSON.
+
         Returns:
             List[DoubleMajorityBallotResult]: Previously persisted initiatives.
         """
-        return await Serialisation.__decode_and_read(INITIATIVES)
+        return await Serialisation.__decode_and_read(INITIATIVES, storage_format)
 
     @staticmethod
-    async def load_augmented_initiatives() -> List[DoubleMajorityBallot]:
+    async def load_augmented_initiatives(storage_format: StorageFormat = StorageFormat.JSON) -> List[DoubleMajorityBallot]:
         """Deserialise persisted augmented initiatives.
 
+        Args:
+            storage_format (StorageFormat, optional): Format from which to
+            load. Defaults to StorageFormat.JSON.
+
         Returns:
             List[DoubleMajorityBallotResult]: Previously persisted augmented
             initiatives.
         """
-        return await Serialisation.__decode_and_read(AUGMENTED_INITIATIVES)
+        return await Serialisation.__decode_and_read(AUGMENTED_INITIATIVES, storage_format)
+
+    @staticmethod
+    async def write_initiatives_stream(ballots: Iterable[DoubleMajorityBallot] | AsyncIterable[DoubleMajorityBallot]):
+        """Persist original initiatives one at a time, without holding the
+        whole JSON document in memory. See __encode_stream.
+
+        Args:
+            ballots (Iterable[DoubleMajorityBallot] |
+            AsyncIterable[DoubleMajorityBallot]): Downloaded double majority
+            ballots.
+        """
+        await Serialisation.__encode_stream(ballots, INITIATIVES)
+
+    @staticmethod
+    async def write_augmented_initiatives_stream(ballots: Iterable[DoubleMajorityBallot] | AsyncIterable[DoubleMajorityBallot]):
+        """Persist augmented initiatives one at a time, without holding the
+        whole JSON document in memory. See __encode_stream.
+
+        Args:
+            ballots (Iterable[DoubleMajorityBallot] |
+            AsyncIterable[DoubleMajorityBallot]): Augmented double majority
+            ballots.
+        """
+        await Serialisation.__encode_stream(ballots, AUGMENTED_INITIATIVES)
+
+    @staticmethod
+    def iter_initiatives() -> AsyncIterator[DoubleMajorityBallot]:
+        """Deserialise persisted initiatives one at a time, without holding the
+        whole JSON document in memory.
+
+        Returns:
+            AsyncIterator[DoubleMajorityBallot]: Previously persisted
+            initiatives.
+        """
+        return Serialisation.__decode_stream(INITIATIVES)
+
+    @staticmethod
+    def iter_augmented_initiatives() -> AsyncIterator[DoubleMajorityBallot]:
+        """Deserialise persisted augmented initiatives one at a time, without
+        holding the whole JSON document in memory.
+
+        Returns:
+            AsyncIterator[DoubleMajorityBallot]: Previously persisted augmented
+            initiatives.
+        """
+        return Serialisation.__decode_stream(AUGMENTED_INITIATIVES)
 
     @staticmethod
-    async def __decode_and_read(file_path: str) -> Any:
-        """Helper to decode a JSON object from a file.
+    def open_initiatives() -> BallotCollection:
+        """Memory-maps persisted initiatives in StorageFormat.BINARY, which
+        are decoded lazily on access.
+
+        Returns:
+            BallotCollection: Previously persisted initiatives, which need to
+            be closed after use.
+        """
+        return BallotCollection.open(Serialisation.get_path(INITIATIVES, StorageFormat.BINARY))
+
+    @staticmethod
+    def open_augmented_initiatives() -> BallotCollection:
+        """Memory-maps persisted augmented initiatives in StorageFormat.BINARY,
+        which are decoded lazily on access.
+
+        Returns:
+            BallotCollection: Previously persisted augmented initiatives, which
+            need to be closed after use.
+        """
+        return BallotCollection.open(Serialisation.get_path(AUGMENTED_INITIATIVES, StorageFormat.BINARY))
+
+    @staticmethod
+    def get_path(file_path: str, storage_format: StorageFormat) -> str:
+        """Provides the location of a ballot file in the given format.
+
+        Args:
+            file_path (str): Path to the JSON file.
+            storage_format (StorageFormat): Format of the file.
+
+        Returns:
+            str: file_path for JSON, otherwise file_path with the extension
+            of storage_format.
+        """
+        if storage_format == StorageFormat.JSON:
+            return file_path
+        extension: str = {
+            StorageFormat.BINARY: BINARY_EXTENSION,
+            StorageFormat.SHARDED: SHARDED_EXTENSION,
+            StorageFormat.DEDUPLICATED: DEDUPLICATED_EXTENSION
+        }[storage_format]
+        return os.path.splitext(file_path)[0] + extension
+
+    @staticmethod
+    async def __decode_and_read(file_path: str, storage_format: StorageFormat) -> Any:
+        """Helper to decode a Python object from a file.
 
         Args:
             file_path (str): Path to JSON file.
+            storage_format (StorageFormat): Format of the file.
 
         Returns:
             Any: Deserialised python object.
         """
-        serialised: str
-        async with aiofiles.open(file_path) as file:
+        path: str = Serialisation.get_path(file_path, storage_format)
+        if storage_format == StorageFormat.SHARDED:
+            return await ShardedDataset.read(path)
+
+        serialised: bytes
+        async with aiofiles.open(path, "rb") as file:
             serialised = await file.read()
-        return jsonpickle.decode(serialised)
+        if storage_format == StorageFormat.BINARY:
+            return BinaryCodec.decode(serialised)
+        if storage_format == StorageFormat.DEDUPLICATED:
+            return DeduplicatedCodec.decode(serialised)
+        return EntityCodec.decode(serialised)
 
     @staticmethod
-    async def __encode_and_write(value: Any, file_path: str):
-        """Helper to encode a Python object to a JSON file.
+    async def __encode_and_write(value: Any, file_path: str, storage_format: StorageFormat):
+        """Helper to encode a Python object to a file.
 
         Args:
             value (Any): Object to serialise.
-            file_path (str): JSON file to write.
+            file_path (str): Path to JSON file.
+            storage_format (StorageFormat): Format of the file.
         """
-        serialised: str = jsonpickle.encode(value)
-        async with aiofiles.open(file_path, "w") as file:
+        path: str = Serialisation.get_path(file_path, storage_format)
+        if storage_format in [StorageFormat.BINARY, StorageFormat.DEDUPLICATED]:
+            encoded: bytes = BinaryCodec.encode(value) if storage_format == StorageFormat.BINARY else DeduplicatedCodec.encode(
+                value)
+            async with aiofiles.open(path, "wb") as file:
+                await file.write(encoded)
+            return
+        if storage_format == StorageFormat.SHARDED:
+            await ShardedDataset.write(value, path)
+            return
+
+        serialised: str = EntityCodec.encode(value)
+        async with aiofiles.open(path, "w") as file:
             await file.write(serialised)
 
+    @staticmethod
+    async def __encode_stream(ballots: Iterable[DoubleMajorityBallot] | AsyncIterable[DoubleMajorityBallot], file_path: str):
+        """Helper to encode ballots to a JSON file one at a time. Each ballot
+        is encoded as a separate jsonpickle document and indented as a list
+        element, so that the file is identical to the one written by
+        __encode_and_write, as long as ballots do not share objects which
+        jsonpickle would otherwise encode as references.
+
+        Args:
+            ballots (Iterable[DoubleMajorityBallot] |
+            AsyncIterable[DoubleMajorityBallot]): Ballots to serialise.
+            file_path (str): Path to JSON file.
+        """
+        if not isinstance(ballots, AsyncIterable):
+            ballots = Serialisation.__to_async_iterable(ballots)
+
+        separator: str = "[\n" + STREAM_INDENT
+        async with aiofiles.open(file_path, "w") as file:
+            async for ballot in ballots:
+                await file.write(separator)
+                await file.write(EntityCodec.encode_ballot(ballot).replace("\n", "\n" + STREAM_INDENT))
+                separator = ",\n" + STREAM_INDENT
+            await file.write("[]" if separator.startswith("[") else "\n]")
+
+    @staticmethod
+    async def __decode_stream(file_path: str) -> AsyncIterator[DoubleMajorityBallot]:
+        """Helper to decode the elements of a JSON list file one at a time.
+        The file is read in chunks of STREAM_CHUNK_SIZE characters, so that
+        only the current chunk and ballot are held in memory.
+
+        Args:
+            file_path (str): Path to JSON file.
+
+        Raises:
+            ValueError: If the file does not contain a JSON list of objects.
+
+        Yields:
+            DoubleMajorityBallot: Deserialised list elements, in order.
+        """
+        decoder = json.JSONDecoder(strict=False)
+        buffer: str = ""
+        position: int = 0
+        expected: str = "["
+        value_allowed: bool = False
+        end_of_file: bool = False
+        async with aiofiles.open(file_path) as file:
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position == len(buffer):
+                    if end_of_file:
+                        raise ValueError(
+                            f"Unexpected end of JSON list: {file_path}")
+                    buffer = await file.read(STREAM_CHUNK_SIZE)
+                    position = 0
+                    end_of_file = not buffer
+                    continue
+
+                character: str = buffer[position]
+                if character in expected:
+                    if character == "]":
+                        return
+                    position += 1
+                    expected = "]" if character == "[" else ""
+                    value_allowed = True
+                    continue
+                if not value_allowed:
+                    raise ValueError(
+                        f"Expected one of '{expected}' in JSON list: {file_path}")
+
+                try:
+                    value, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    chunk: str = await file.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        raise
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                yield EntityCodec.restore(value)
+                expected = ",]"
+                value_allowed = False
+
+    @staticmethod
+    async def __to_async_iterable(values: Iterable[Any]) -> AsyncIterator[Any]:
+        """Adapts a synchronous iterable to an asynchronous one.
+
+        Args:
+            values (Iterable[Any]): Values to iterate.
+
+        Yields:
+            Any: Elements of values.
+        """
+        for value in values:
+            yield value
+
     @staticmethod
     def __to_module_path(file_path: str) -> str:
         """Takes a relative path and applies it relative to the module
@@ -144,24 +419,29 @@ class DoubleMajorityBallotHandler(BaseHandler):
     """jsonpickle handler to serialise DoubleMajorityBallot instances. This
     explicit handler is necessary since the default serialisation deserialises
     enums and Decimal instances as str. This handler instantiates them
-    correctly.
+    correctly. The optional details URL is only written if present, which keeps
+    files without URLs, such as augmented initiatives, unchanged.
     """
 
     def flatten(self, obj: DoubleMajorityBallot, _) -> dict[str, Any]:
         pickler: Pickler = self.context
-        return {
+        flattened: dict[str, Any] = {
             "bill": pickler.flatten(obj.bill, False),
             "status": BallotStatusHandler(self.context).flatten(obj.status, _),
             "result": pickler.flatten(obj.result, False),
             OBJECT: "bp.entity.ballot.DoubleMajorityBallot"
         }
+        if obj.details_url is not None:
+            flattened["details_url"] = obj.details_url
+        return flattened
 
     def restore(self, obj: dict[str, Any]) -> DoubleMajorityBallot:
         unpickler: Unpickler = self.context
         return DoubleMajorityBallot(
             unpickler.restore(obj["bill"], False),
             BallotStatusHandler(self.context).restore(obj["status"]),
-            unpickler.restore(obj["result"], False)
+            unpickler.restore(obj["result"], False),
+            obj.get("details_url")
         )
 
 
@@ -0,0 +1,162 @@
+from bp.data.codec import EntityCodec
+from bp.entity.ballot import DoubleMajorityBallot
+
+import aiofiles
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Set
+
+
+MANIFEST: str = "manifest.json"
+"""str: File name of the manifest inside a sharded dataset directory."""
+
+
+MANIFEST_VERSION: int = 1
+"""int: Version of the manifest written by ShardedDataset."""
+
+
+DEFAULT_SHARD_SIZE: int = 128
+"""int: Default maximum number of ballots per shard."""
+
+
+PARALLEL_THRESHOLD: int = 10000
+"""int: Minimum number of ballots of a dataset for its shards to be decoded
+in a process pool. Smaller datasets are decoded in process, since starting the
+pool and returning the decoded ballots from the workers takes longer than
+decoding them."""
+
+
+SHARD_PREFIX: str = "shard-"
+"""str: File name prefix of shards."""
+
+
+SHARD_SUFFIX: str = ".json.gz"
+"""str: File name suffix of shards."""
+
+
+class ShardedDataset:
+    """Dataset layout splitting ballots into gzip compressed shards of a
+    configurable maximum number of ballots, each in the JSON format of
+    EntityCodec. A manifest lists the shards in order, together with their
+    number of ballots and the SHA-256 checksum of the compressed shard. Shards
+    of large datasets are decoded in parallel in a process pool.
+    """
+
+    @staticmethod
+    async def write(ballots: List[DoubleMajorityBallot], directory: str, shard_size: int = DEFAULT_SHARD_SIZE) -> None:
+        """Writes ballots as sharded dataset, replacing any previous one.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to persist.
+            directory (str): Dataset directory, which is created if necessary.
+            shard_size (int, optional): Maximum number of ballots per shard.
+            Defaults to DEFAULT_SHARD_SIZE.
+        """
+        os.makedirs(directory, exist_ok=True)
+        shards: List[Dict[str, Any]] = []
+        for start in range(0, len(ballots), shard_size):
+            shard: List[DoubleMajorityBallot] = ballots[start:start + shard_size]
+            compressed: bytes = gzip.compress(
+                EntityCodec.encode(shard).encode("utf-8"), mtime=0)
+            file_name: str = f"{SHARD_PREFIX}{len(shards):05d}{SHARD_SUFFIX}"
+            async with aiofiles.open(os.path.join(directory, file_name), "wb") as file:
+                await file.write(compressed)
+            shards.append({
+                "count": len(shard),
+                "file": file_name,
+                "sha256": hashlib.sha256(compressed).hexdigest()
+            })
+
+        manifest: Dict[str, Any] = {
+            "count": len(ballots),
+            "shards": shards,
+            "version": MANIFEST_VERSION
+        }
+        async with aiofiles.open(os.path.join(directory, MANIFEST), "w") as file:
+            await file.write(json.dumps(manifest, sort_keys=True, indent=4))
+
+        current: Set[str] = {shard["file"] for shard in shards}
+        for file_name in os.listdir(directory):
+            if file_name.startswith(SHARD_PREFIX) and file_name not in current:
+                os.remove(os.path.join(directory, file_name))
+
+    @staticmethod
+    async def read(directory: str, max_workers: int | None = None, parallel_threshold: int = PARALLEL_THRESHOLD) -> List[DoubleMajorityBallot]:
+        """Reads a sharded dataset. Shards are decoded in parallel if the
+        dataset has at least parallel_threshold ballots in several shards and
+        more than one worker is available, and in process otherwise.
+
+        Args:
+            directory (str): Dataset directory.
+            max_workers (int | None, optional): Maximum number of processes
+            decoding shards. Defaults to None, which uses the number of CPUs.
+            parallel_threshold (int, optional): Minimum number of ballots for
+            parallel decoding. Defaults to PARALLEL_THRESHOLD.
+
+        Raises:
+            ValueError: If the manifest version is not supported, a shard does
+            not match its checksum or number of ballots, or the total number of
+            ballots does not match the manifest.
+
+        Returns:
+            List[DoubleMajorityBallot]: Ballots of all shards, in order.
+        """
+        async with aiofiles.open(os.path.join(directory, MANIFEST)) as file:
+            manifest: Dict[str, Any] = json.loads(await file.read())
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(
+                f"Unsupported sharded dataset version: {manifest.get('version')}")
+
+        shards: List[Dict[str, Any]] = manifest["shards"]
+        workers: int = max_workers or os.cpu_count() or 1
+        decoded: List[List[DoubleMajorityBallot]]
+        if workers > 1 and len(shards) > 1 and manifest["count"] >= parallel_threshold:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(workers) as executor:
+                decoded = await asyncio.gather(*[
+                    loop.run_in_executor(executor, ShardedDataset.decode_shard, os.path.join(
+                        directory, shard["file"]), shard["count"], shard["sha256"])
+                    for shard in shards])
+        else:
+            decoded = [ShardedDataset.decode_shard(os.path.join(
+                directory, shard["file"]), shard["count"], shard["sha256"]) for shard in shards]
+
+        ballots: List[DoubleMajorityBallot] = [
+            ballot for shard in decoded for ballot in shard]
+        if len(ballots) != manifest["count"]:
+            raise ValueError(
+                f"Expected {manifest['count']} ballots in {directory}, found {len(ballots)}")
+        return ballots
+
+    @staticmethod
+    def decode_shard(file_path: str, count: int, checksum: str) -> List[DoubleMajorityBallot]:
+        """Reads and decodes a single shard. Executed in worker processes when
+        decoding in parallel.
+
+        Args:
+            file_path (str): Path to the compressed shard.
+            count (int): Number of ballots in the shard according to the
+            manifest.
+            checksum (str): Hex SHA-256 checksum of the compressed shard
+            according to the manifest.
+
+        Raises:
+            ValueError: If the shard does not match checksum or count.
+
+        Returns:
+            List[DoubleMajorityBallot]: Ballots of the shard, in order.
+        """
+        with open(file_path, "rb") as file:
+            compressed: bytes = file.read()
+        if hashlib.sha256(compressed).hexdigest() != checksum:
+            raise ValueError(f"Checksum mismatch in shard: {file_path}")
+        ballots: List[DoubleMajorityBallot] = EntityCodec.decode(
+            gzip.decompress(compressed))
+        if len(ballots) != count:
+            raise ValueError(
+                f"Expected {count} ballots in shard {file_path}, found {len(ballots)}")
+        return ballots
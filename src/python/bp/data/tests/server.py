@@ -0,0 +1,89 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Tuple
+
+import time
+
+
+class StubServer:
+    """Local HTTP server serving fixed pages, used to test fetchers without
+    network access. Records every request and the maximum number of requests
+    served concurrently. Answers conditional requests with 304 if the page has
+    a matching ETag in headers.
+    """
+
+    def __init__(self, pages: Dict[str, bytes], delay: float = 0.0):
+        """Configures the served pages without starting the server.
+
+        Args:
+            pages (Dict[str, bytes]): Page content by request path. All other
+            paths are answered with 404.
+            delay (float, optional): Seconds to wait before answering each
+            request. Defaults to 0.0.
+        """
+        self.pages = pages
+        self.delay = delay
+        self.headers: Dict[str, Dict[str, str]] = {}
+        self.requests: List[Tuple[str, float, Dict[str, str]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = Lock()
+
+    def url(self, path: str) -> str:
+        """Absolute URL of path on this server.
+
+        Args:
+            path (str): Request path, starting with "/".
+
+        Returns:
+            str: URL to request path from this server.
+        """
+        host, port = self.server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        """Starts serving on a free local port in a background thread."""
+        stub: StubServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.requests.append(
+                        (self.path, time.monotonic(), dict(self.headers)))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(
+                        stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.in_flight -= 1
+                body: bytes | None = stub.pages.get(self.path)
+                headers: Dict[str, str] = stub.headers.get(self.path, {})
+                etag: str | None = headers.get("ETag")
+                if etag is not None and etag == self.headers.get("If-None-Match"):
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                if body is None:
+                    self.send_response(404)
+                    body = b""
+                else:
+                    self.send_response(200)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stops the server."""
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,67 @@
+from bp.data.binary import BinaryCodec
+from bp.entity.ballot import BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+
+TEST_BALLOTS: List[DoubleMajorityBallot] = [
+    DoubleMajorityBallot(
+        Bill("Für eine Reichtumssteuer", "Art. 1^1 Änderung – neu",
+             datetime(1976, 3, 12)),
+        BallotStatus.COMPLETED,
+        DoubleMajorityBallotResult(Decimal("37.1"), Decimal("0.00")),
+        "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"),
+    DoubleMajorityBallot(
+        Bill("", "", datetime(2024, 1, 1, 12, 30, 15, 7)),
+        BallotStatus.FAILED,
+        None),
+    DoubleMajorityBallot(
+        Bill("Title", "The wording.", datetime(1891, 1, 1)),
+        BallotStatus.PENDING,
+        DoubleMajorityBallotResult(Decimal("-12E+3"), Decimal("65.217391")),
+        "")
+]
+
+
+class TestBinaryCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        decoded: List[DoubleMajorityBallot] = BinaryCodec.decode(
+            BinaryCodec.encode(TEST_BALLOTS))
+        self.assertEqual(len(TEST_BALLOTS), len(decoded))
+        for expected, actual in zip(TEST_BALLOTS, decoded):
+            self.assertEqual(expected.bill.title, actual.bill.title)
+            self.assertEqual(expected.bill.wording, actual.bill.wording)
+            self.assertEqual(expected.bill.date, actual.bill.date)
+            self.assertEqual(expected.status, actual.status)
+            self.assertEqual(expected.details_url, actual.details_url)
+            if expected.result is None:
+                self.assertIsNone(actual.result)
+            else:
+                self.assertEqual(str(expected.result.percentage_yes),
+                                 str(actual.result.percentage_yes))
+                self.assertEqual(str(expected.result.accepting_cantons),
+                                 str(actual.result.accepting_cantons))
+
+    def test_empty(self):
+        self.assertListEqual([], BinaryCodec.decode(BinaryCodec.encode([])))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            BinaryCodec.decode(b"{\n    \"py/object\": \"\"\n}")
+
+    def test_timezone(self):
+        ballot = DoubleMajorityBallot(Bill("Title", "The wording.", datetime(
+            2024, 1, 1, tzinfo=timezone.utc)), BallotStatus.PENDING, None)
+        with self.assertRaises(ValueError):
+            BinaryCodec.encode([ballot])
+
+    def test_result_limits(self):
+        for value in [Decimal("NaN"), Decimal("1E+200"), Decimal("1" * 20)]:
+            ballot = DoubleMajorityBallot(Bill("Title", "The wording.", datetime(
+                2024, 1, 1)), BallotStatus.COMPLETED, DoubleMajorityBallotResult(value, Decimal(1)))
+            with self.assertRaises(ValueError):
+                BinaryCodec.encode([ballot])
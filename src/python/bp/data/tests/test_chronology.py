@@ -1,11 +1,14 @@
 from bp.data.chronology import Chronology
+from bp.data.fetcher import Fetcher
+from bp.data.results import VoteResultPage
 from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
 from bp.entity.bill import Bill
 
+import asyncio
 import unittest
 from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import Dict, List
 from lxml import html
 
 
@@ -46,7 +49,7 @@ class TestChronology(unittest.TestCase):
     def test_find_result_table_no_match(self):
         page: html.HtmlElement = html.fromstring("<p></p>")
         self.assertIsNone(
-            Chronology._Chronology__find_result_table(page, "unknown bill"))
+            Chronology._Chronology__find_result_table(VoteResultPage(page), "unknown bill"))
 
     def test_find_result_table_inconclusive(self):
         page: html.HtmlElement = html.fromstring("""
@@ -63,7 +66,7 @@ class TestChronology(unittest.TestCase):
             """)
         with self.assertRaises(ValueError):
             Chronology._Chronology__find_result_table(
-                page, "Für eine Reichtumssteuer")
+                VoteResultPage(page), "Für eine Reichtumssteuer")
 
     def test_extract_accepting_cantons_incomplete_info_on_website(self):
         self.assertEqual(Decimal(0), Chronology._Chronology__extract_accepting_cantons(
@@ -576,3 +579,176 @@ Der deutsche Text der Initiative ist massgebend.""", ballot.bill.wording)
         self.assertAlmostEqual(Decimal(42.2), ballot.result.percentage_yes, 2)
         self.assertAlmostEqual(
             Decimal(2.27), ballot.result.accepting_cantons, 2)
+
+
+class MockFetcher(Fetcher):
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = pages
+        self.requests: List[str] = []
+
+    async def get(self, url: str) -> bytes:
+        self.requests.append(url)
+        # Answer later requests first to verify that results keep their order.
+        await asyncio.sleep(0.01 * (len(self.pages) - len(self.requests) % len(self.pages)))
+        return self.pages[url].encode("utf-8")
+
+
+def create_details_page(title: str, rows: List[tuple[str, str]]) -> str:
+    cells: str = "".join(
+        f"<tr><td>{label}</td><td>{date}</td></tr>" for label, date in rows)
+    return f"""<html><body>
+        <div class="contentHead"><h2>Eidgenössische Volksinitiative '{title}'</h2></div>
+        <table>{cells}</table>
+        </body></html>"""
+
+
+def create_wording_page(wording: str) -> str:
+    return f"""<html><body>
+        <div id="contentNavigation"><p>Navigation</p></div>
+        <div class="mod-text"><p>{wording}</p></div>
+        </body></html>"""
+
+
+def create_result_page(results: List[tuple[str, str, str, str]]) -> str:
+    tables: str = "".join(f"""<h3>{title}</h3>
+        <table><tbody>
+            <tr><td>Volk</td><td>1</td><td>1</td><td>{percentage_yes}</td></tr>
+            <tr><td>Stände</td><td>{accepting}</td><td>{rejecting}</td></tr>
+        </tbody></table>""" for title, percentage_yes, accepting, rejecting in results)
+    return f"""<html><body><div class="mod-text">{tables}</div></body></html>"""
+
+
+MOCK_PAGES: Dict[str, str] = {
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis_2_2_5_1.html": """<html><body><table>
+        <tr><td><a href="vis3.html">Drei</a></td></tr>
+        <tr><td><a href="vis2.html">Zwei</a></td></tr>
+        <tr><td><a href="vis1.html">Eins</a></td></tr>
+        </table></body></html>""",
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis3.html": create_details_page(
+        "Für sauberes Trinkwasser", [("Abgestimmt am", "13.06.2021"), ("Vorprüfung", "18.04.2017")]),
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis3t.html": create_wording_page("Wasser ist sauber."),
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis2.html": create_details_page(
+        "Für eine neue Bundesverfassung", [("Nicht zustandegekommen am", "19.10.2023"), ("Vorprüfung", "19.04.2022")]),
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis2t.html": create_wording_page("Die Bundesverfassung wird totalrevidiert."),
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html": create_details_page(
+        "Für eine Landwirtschaft ohne Pestizide", [("Abgestimmt am", "13.06.2021"), ("Vorprüfung", "21.11.2017")]),
+    "https://www.bk.admin.ch/ch/d/pore/vi/vis1t.html": create_wording_page("Pestizide werden verboten."),
+    "https://www.bk.admin.ch/ch/d/pore/va/20210613/index.html": create_result_page([
+        ("Volksinitiative 'Für sauberes Trinkwasser'", "39.3", "3 1/2", "17 5/2"),
+        ("Volksinitiative 'Für eine Schweiz ohne synthetische Pestizide'", "39.4", "3", "17 6/2"),
+        ("Volksinitiative 'Für eine Landwirtschaft ohne Pestizide'", "39.6", "4", "16 6/2")]),
+}
+
+
+class TestChronologyFetcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_fetch_initiative_urls(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        self.assertListEqual([
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis3.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis2.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"
+        ], await Chronology.fetch_initiative_urls(fetcher))
+
+    async def test_fetch_initiatives(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        fetched: List[tuple[int, int, str]] = []
+        ballots: List[DoubleMajorityBallot] = await Chronology.fetch_initiatives(
+            await Chronology.fetch_initiative_urls(fetcher), fetcher, lambda *progress: fetched.append(progress))
+
+        self.assertListEqual([
+            "Für sauberes Trinkwasser",
+            "Für eine neue Bundesverfassung",
+            "Für eine Landwirtschaft ohne Pestizide"
+        ], [ballot.bill.title for ballot in ballots])
+        self.assertListEqual([1, 2, 3], [index for index, _, _ in fetched])
+        self.assertListEqual([3, 3, 3], [count for _, count, _ in fetched])
+        self.assertCountEqual(
+            [ballot.details_url for ballot in ballots], [url for _, _, url in fetched])
+        self.assertEqual(
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis3.html", ballots[0].details_url)
+        self.assertEqual("Wasser ist sauber.", ballots[0].bill.wording)
+        self.assertEqual(datetime(2017, 4, 18), ballots[0].bill.date)
+        self.assertEqual(BallotStatus.COMPLETED, ballots[0].status)
+        self.assertEqual(Decimal("39.3"), ballots[0].result.percentage_yes)
+        self.assertEqual(Decimal("15.22"), ballots[0].result.accepting_cantons)
+        self.assertEqual(BallotStatus.FAILED, ballots[1].status)
+        self.assertIsNone(ballots[1].result)
+        self.assertEqual(Decimal("39.6"), ballots[2].result.percentage_yes)
+        self.assertEqual(Decimal("17.39"), ballots[2].result.accepting_cantons)
+
+    async def test_fetch_initiatives_without_callback(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        ballots: List[DoubleMajorityBallot] = await Chronology.fetch_initiatives(
+            ["https://www.bk.admin.ch/ch/d/pore/vi/vis2.html"], fetcher)
+        self.assertEqual("Die Bundesverfassung wird totalrevidiert.",
+                         ballots[0].bill.wording)
+
+    async def test_fetch_updated_initiatives(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        completed = DoubleMajorityBallot(Bill("Eins", "", datetime(2017, 11, 21)), BallotStatus.COMPLETED, None,
+                                         "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html")
+        pending = DoubleMajorityBallot(Bill("Zwei", "", datetime(2022, 4, 19)), BallotStatus.PENDING, None,
+                                       "https://www.bk.admin.ch/ch/d/pore/vi/vis2.html")
+        removed = DoubleMajorityBallot(Bill("Null", "", datetime(1891, 1, 1)), BallotStatus.FAILED, None,
+                                       "https://www.bk.admin.ch/ch/d/pore/vi/vis0.html")
+        unknown = DoubleMajorityBallot(
+            Bill("Unbekannt", "", datetime(1891, 1, 1)), BallotStatus.FAILED, None)
+        fetched: List[tuple[int, int, str]] = []
+
+        ballots: List[DoubleMajorityBallot] = await Chronology.fetch_updated_initiatives([
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis3.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis2.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"
+        ], [pending, completed, removed, unknown], fetcher, lambda *progress: fetched.append(progress))
+
+        self.assertEqual(3, len(ballots))
+        self.assertListEqual([2, 2], [count for _, count, _ in fetched])
+        self.assertEqual("Für sauberes Trinkwasser", ballots[0].bill.title)
+        self.assertEqual("Für eine neue Bundesverfassung",
+                         ballots[1].bill.title)
+        self.assertEqual(BallotStatus.FAILED, ballots[1].status)
+        self.assertIs(completed, ballots[2])
+        self.assertNotIn(
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html", fetcher.requests)
+
+    async def test_fetch_updated_initiatives_without_details_url(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        completed = DoubleMajorityBallot(Bill("Für eine Landwirtschaft ohne Pestizide", "Pestizide.", datetime(2017, 11, 21)),
+                                         BallotStatus.COMPLETED, None)
+        pending = DoubleMajorityBallot(Bill("Für eine neue Bundesverfassung", "", datetime(2022, 4, 19)),
+                                       BallotStatus.PENDING, None)
+        other_date = DoubleMajorityBallot(Bill("Für sauberes Trinkwasser", "", datetime(1891, 1, 1)),
+                                          BallotStatus.FAILED, None)
+
+        ballots: List[DoubleMajorityBallot] = await Chronology.fetch_updated_initiatives([
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis3.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis2.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"
+        ], [completed, pending, other_date], fetcher)
+
+        self.assertEqual("Wasser ist sauber.", ballots[0].bill.wording)
+        self.assertEqual(BallotStatus.FAILED, ballots[1].status)
+        self.assertIs(completed.bill, ballots[2].bill)
+        self.assertEqual(BallotStatus.COMPLETED, ballots[2].status)
+        self.assertEqual(
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html", ballots[2].details_url)
+        self.assertNotIn(
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1t.html", fetcher.requests)
+
+        fetcher = MockFetcher(MOCK_PAGES)
+        ballots = await Chronology.fetch_updated_initiatives(
+            ["https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"], [], fetcher)
+        self.assertEqual("Pestizide werden verboten.", ballots[0].bill.wording)
+        self.assertEqual(1, fetcher.requests.count(
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"))
+
+    async def test_fetch_initiatives_shares_vote_result_page(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        await Chronology.fetch_initiatives([
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis3.html",
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"
+        ], fetcher)
+        self.assertEqual(1, fetcher.requests.count(
+            "https://www.bk.admin.ch/ch/d/pore/va/20210613/index.html"))
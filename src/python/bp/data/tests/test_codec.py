@@ -0,0 +1,45 @@
+from bp.data.codec import EntityCodec
+from bp.data.tests.test_binary import TEST_BALLOTS
+from bp.entity.ballot import DoubleMajorityBallot
+
+import jsonpickle
+import unittest
+from typing import List
+
+
+class TestEntityCodec(unittest.TestCase):
+
+    def test_encode(self):
+        self.assertEqual(jsonpickle.encode(TEST_BALLOTS),
+                         EntityCodec.encode(TEST_BALLOTS))
+        self.assertEqual(jsonpickle.encode(TEST_BALLOTS[1]),
+                         EntityCodec.encode_ballot(TEST_BALLOTS[1]))
+
+    def test_decode(self):
+        decoded: List[DoubleMajorityBallot] = EntityCodec.decode(
+            jsonpickle.encode(TEST_BALLOTS).encode("utf-8"))
+        self.assertEqual(jsonpickle.encode(TEST_BALLOTS),
+                         jsonpickle.encode(decoded))
+
+    def test_decode_references(self):
+        ballot: DoubleMajorityBallot = TEST_BALLOTS[0]
+        shared: List[DoubleMajorityBallot] = [ballot, DoubleMajorityBallot(
+            ballot.bill, ballot.status, ballot.result)]
+        decoded: List[DoubleMajorityBallot] = EntityCodec.decode(
+            jsonpickle.encode(shared))
+        self.assertEqual(2, len(decoded))
+        self.assertIs(decoded[0].bill, decoded[1].bill)
+        self.assertEqual(ballot.bill.title, decoded[1].bill.title)
+        self.assertIsNone(decoded[1].details_url)
+
+    def test_decode_other_values(self):
+        self.assertDictEqual({"a": 1}, EntityCodec.decode('{"a": 1}'))
+        self.assertEqual("a", EntityCodec.restore("a"))
+
+    def test_decode_control_characters(self):
+        serialised: str = jsonpickle.encode(TEST_BALLOTS[:1]).replace(
+            "Reichtumssteuer", "Reichtums\tsteuer")
+        for value in [serialised, serialised.encode("utf-8")]:
+            decoded: List[DoubleMajorityBallot] = EntityCodec.decode(value)
+            self.assertEqual("Für eine Reichtums\tsteuer",
+                             decoded[0].bill.title)
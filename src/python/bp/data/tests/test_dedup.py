@@ -0,0 +1,51 @@
+from bp.data.dedup import DeduplicatedBallots, DeduplicatedCodec
+from bp.data.tests.test_binary import TEST_BALLOTS
+from bp.entity.ballot import Bill, DoubleMajorityBallot
+
+import jsonpickle
+import orjson
+import unittest
+from typing import Any, Dict, List
+
+
+class TestDeduplicatedCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        ballots: DeduplicatedBallots = DeduplicatedCodec.decode(
+            DeduplicatedCodec.encode(TEST_BALLOTS))
+        self.assertEqual(len(TEST_BALLOTS), len(ballots))
+        self.assertEqual(jsonpickle.encode(TEST_BALLOTS), jsonpickle.encode(list(ballots)))
+
+    def test_deduplicates(self):
+        source: DoubleMajorityBallot = TEST_BALLOTS[0]
+        variant = DoubleMajorityBallot(Bill("Paraphrase", source.bill.wording, source.bill.date),
+                                       source.status, None)
+        encoded: bytes = DeduplicatedCodec.encode([source, variant, source, TEST_BALLOTS[2]])
+        decoded: Dict[str, Any] = orjson.loads(encoded)
+        self.assertListEqual([0, 1, 0, 2], decoded["order"])
+        self.assertEqual(2, len(decoded["dates"]))
+        self.assertListEqual([source.bill.title, source.bill.wording, source.details_url,
+                              "Paraphrase", "Title", "The wording.", ""], decoded["strings"])
+
+        ballots: DeduplicatedBallots = DeduplicatedCodec.decode(encoded)
+        self.assertIs(ballots[0].bill.wording, ballots[1].bill.wording)
+        self.assertIs(ballots[0].bill.date, ballots[1].bill.date)
+        self.assertIsNot(ballots[0], ballots[2])
+        self.assertIsNone(ballots[1].result)
+        self.assertIsNone(ballots[1].details_url)
+
+    def test_slice(self):
+        ballots: DeduplicatedBallots = DeduplicatedCodec.decode(
+            DeduplicatedCodec.encode(TEST_BALLOTS))
+        sliced: DeduplicatedBallots = ballots[1:]
+        self.assertIs(ballots.strings, sliced.strings)
+        self.assertListEqual(["", "Title"], [ballot.bill.title for ballot in sliced])
+        self.assertEqual("Title", ballots[-1].bill.title)
+
+    def test_empty(self):
+        self.assertEqual(0, len(DeduplicatedCodec.decode(DeduplicatedCodec.encode([]))))
+
+    def test_unsupported_format(self):
+        for data in [jsonpickle.encode(TEST_BALLOTS), '{"version": 2}']:
+            with self.assertRaises(ValueError):
+                DeduplicatedCodec.decode(data.encode("utf-8"))
@@ -0,0 +1,29 @@
+from bp.data.details import BillDetailsPage, FAILURE_ROW_PREFIXES, VOTE_ROW_PREFIXES
+
+import unittest
+from lxml import html
+
+
+class TestBillDetailsPage(unittest.TestCase):
+
+    def test_rows(self):
+        page: html.HtmlElement = html.fromstring("""<table>
+            <tr id="first"><td>Vorprüfung</td><td>01.02.2000</td></tr>
+            <tr id="vote"><td><!-- Termin -->Abstimmung über Gegenentwurf am</td><td>03.04.2001</td></tr>
+            <tr id="counter"><td><b>Hinweis</b></td><td>Abgestimmt am</td></tr>
+            <tr id="later"><td>Abgestimmt am</td><td>05.06.2002</td></tr>
+            <tr id="empty"><td><b>Zurückgezogen</b></td><td></td></tr>
+            <tr id="last"><th>Ende</th></tr>
+            </table>""")
+        details = BillDetailsPage(page)
+        self.assertEqual("vote", details.rows[VOTE_ROW_PREFIXES[1]].get("id"))
+        self.assertEqual("counter", details.rows[VOTE_ROW_PREFIXES[0]].get("id"))
+        self.assertEqual("counter", details.find_row(VOTE_ROW_PREFIXES).get("id"))
+        self.assertIsNone(details.find_row(FAILURE_ROW_PREFIXES))
+        self.assertEqual("last", details.last_row.get("id"))
+
+    def test_no_rows(self):
+        details = BillDetailsPage(html.fromstring("<p>Keine Tabelle</p>"))
+        self.assertDictEqual({}, details.rows)
+        self.assertIsNone(details.last_row)
+        self.assertIsNone(details.find_row(VOTE_ROW_PREFIXES))
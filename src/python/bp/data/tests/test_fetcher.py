@@ -0,0 +1,125 @@
+from bp.data.fetcher import CachedFetcher, Fetcher, HttpFetcher
+from bp.data.tests.server import StubServer
+
+import asyncio
+import httpx
+import os
+import tempfile
+import unittest
+from typing import List
+
+
+class MockFetcher(Fetcher):
+
+    async def get(self, url: str) -> bytes:
+        return await super().get(url)
+
+
+class TestFetcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get(self):
+        self.assertIsNone(await MockFetcher().get("https://www.example.com/"))
+
+
+class TestHttpFetcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get(self):
+        with StubServer({"/page.html": b"<p>content</p>"}) as server:
+            async with HttpFetcher() as fetcher:
+                self.assertEqual(b"<p>content</p>", await fetcher.get(server.url("/page.html")))
+
+    async def test_get_not_found(self):
+        with StubServer({}) as server:
+            async with HttpFetcher() as fetcher:
+                with self.assertRaises(httpx.HTTPStatusError):
+                    await fetcher.get(server.url("/missing.html"))
+
+    async def test_max_concurrency(self):
+        pages: dict[str, bytes] = {
+            f"/{index}.html": str(index).encode() for index in range(12)}
+        with StubServer(pages, delay=0.05) as server:
+            async with HttpFetcher(3, None) as fetcher:
+                contents: List[bytes] = await asyncio.gather(
+                    *[fetcher.get(server.url(path)) for path in pages])
+        self.assertListEqual(list(pages.values()), contents)
+        self.assertEqual(3, server.max_in_flight)
+
+    async def test_rate_limit(self):
+        pages: dict[str, bytes] = {
+            f"/{index}.html": b"" for index in range(5)}
+        with StubServer(pages) as server:
+            async with HttpFetcher(5, 20.0) as fetcher:
+                await asyncio.gather(
+                    *[fetcher.get(server.url(path)) for path in pages])
+        times: List[float] = sorted(
+            request[1] for request in server.requests)
+        self.assertGreaterEqual(times[-1] - times[0], 4 * 0.05 * 0.9)
+
+
+class TestCachedFetcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_revalidate_with_etag(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with StubServer({"/page.html": b"version 1"}) as server:
+                server.headers["/page.html"] = {"ETag": '"v1"'}
+                async with HttpFetcher() as http_fetcher:
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        self.assertEqual(b"version 1", await fetcher.get(server.url("/page.html")))
+
+                    server.pages["/page.html"] = b"ignored, since not modified"
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        self.assertEqual(b"version 1", await fetcher.get(server.url("/page.html")))
+
+                    server.pages["/page.html"] = b"version 2"
+                    server.headers["/page.html"] = {"ETag": '"v2"'}
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        self.assertEqual(b"version 2", await fetcher.get(server.url("/page.html")))
+
+            self.assertListEqual([None, '"v1"', '"v1"'], [
+                request[2].get("If-None-Match") for request in server.requests])
+            self.assertEqual(2, len(os.listdir(
+                os.path.join(cache_directory, "objects"))))
+
+    async def test_revalidate_with_last_modified(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with StubServer({"/page.html": b"content"}) as server:
+                server.headers["/page.html"] = {
+                    "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+                async with HttpFetcher() as http_fetcher:
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        await fetcher.get(server.url("/page.html"))
+                        await fetcher.get(server.url("/page.html"))
+
+            self.assertEqual("Wed, 21 Oct 2015 07:28:00 GMT",
+                             server.requests[1][2].get("If-Modified-Since"))
+
+    async def test_content_addressed(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with StubServer({"/a.html": b"same", "/b.html": b"same"}) as server:
+                async with HttpFetcher() as http_fetcher:
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        await asyncio.gather(fetcher.get(server.url("/a.html")), fetcher.get(server.url("/b.html")))
+                        await fetcher.get(server.url("/a.html"))
+
+            self.assertEqual(1, len(os.listdir(
+                os.path.join(cache_directory, "objects"))))
+
+    async def test_offline(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with StubServer({"/page.html": b"content"}) as server:
+                async with HttpFetcher() as http_fetcher:
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        await fetcher.get(server.url("/page.html"))
+
+            async with CachedFetcher(None, cache_directory, True) as fetcher:
+                self.assertEqual(b"content", await fetcher.get(server.url("/page.html")))
+                with self.assertRaises(LookupError):
+                    await fetcher.get(server.url("/missing.html"))
+
+    async def test_not_found(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            with StubServer({}) as server:
+                async with HttpFetcher() as http_fetcher:
+                    async with CachedFetcher(http_fetcher, cache_directory) as fetcher:
+                        with self.assertRaises(httpx.HTTPStatusError):
+                            await fetcher.get(server.url("/missing.html"))
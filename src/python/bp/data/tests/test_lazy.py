@@ -0,0 +1,72 @@
+from bp.data.binary import BinaryCodec
+from bp.data.lazy import BallotCollection, BallotView
+from bp.data.tests.test_binary import TEST_BALLOTS
+from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
+
+import os
+import tempfile
+import unittest
+from typing import List
+
+
+class TestBallotCollection(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = BallotCollection(BinaryCodec.encode(TEST_BALLOTS))
+
+    def test_get(self):
+        self.assertEqual(3, len(self.collection))
+        for expected, actual in zip(TEST_BALLOTS, self.collection):
+            self.assertIsInstance(actual, DoubleMajorityBallot)
+            self.assertEqual(expected.bill.title, actual.bill.title)
+            self.assertEqual(expected.bill.wording, actual.bill.wording)
+            self.assertEqual(expected.bill.date, actual.bill.date)
+            self.assertEqual(expected.status, actual.status)
+            self.assertEqual(expected.details_url, actual.details_url)
+        self.assertIsNone(self.collection[1].result)
+        self.assertEqual("-1.2E+4", str(self.collection[-1].result.percentage_yes))
+        self.assertEqual("65.217391", str(self.collection[-1].result.accepting_cantons))
+        with self.assertRaises(IndexError):
+            self.collection[3]
+
+    def test_decodes_on_access(self):
+        ballot: BallotView = self.collection[0]
+        self.assertNotIn("bill", vars(ballot))
+        self.assertEqual("Für eine Reichtumssteuer", ballot.bill.title)
+        self.assertNotIn("wording", vars(ballot.bill))
+        self.assertNotIn("result", vars(ballot))
+
+    def test_slice(self):
+        sliced: BallotCollection = self.collection[1:]
+        self.assertIs(self.collection.buffer, sliced.buffer)
+        self.assertListEqual(["", "Title"], [ballot.bill.title for ballot in sliced])
+        self.assertListEqual(["Title"], [ballot.bill.title for ballot in sliced[::-1][:1]])
+
+    def test_with_status(self):
+        completed: BallotCollection = self.collection.with_status(BallotStatus.COMPLETED)
+        self.assertListEqual(["Für eine Reichtumssteuer"], [ballot.bill.title for ballot in completed])
+        self.assertEqual(0, len(self.collection[1:].with_status(BallotStatus.COMPLETED)))
+
+    def test_open(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "initiatives.bin")
+            with open(path, "wb") as file:
+                file.write(BinaryCodec.encode(TEST_BALLOTS))
+            with BallotCollection.open(path) as collection:
+                titles: List[str] = [ballot.bill.title for ballot in collection]
+            self.assertListEqual([ballot.bill.title for ballot in TEST_BALLOTS], titles)
+            with self.assertRaises(ValueError):
+                collection[0].bill.title
+
+    def test_open_unsupported_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "initiatives.json")
+            with open(path, "w") as file:
+                file.write("{\n    \"py/object\": \"\"\n}")
+            with self.assertRaises(ValueError):
+                BallotCollection.open(path)
+
+    def test_close_bytes(self):
+        with self.collection as collection:
+            pass
+        self.assertEqual("Title", collection[2].bill.title)
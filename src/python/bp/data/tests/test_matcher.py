@@ -0,0 +1,38 @@
+from bp.data.matcher import TitleMatcher
+
+import unittest
+
+
+TITLES = [
+    "eidgenössische volksinitiative 'für eine sichere ahv'",
+    "bundesgesetz vom 17.12.1976 über die politischen rechte",
+    "eidgenössische volksinitiative 'für mehr bezahlbare wohnungen'"
+]
+
+
+class TestTitleMatcher(unittest.TestCase):
+
+    def test_find(self):
+        matcher = TitleMatcher(TITLES)
+        self.assertEqual(0, matcher.find("Für eine sichere AHV"))
+        self.assertEqual(2, matcher.find("Für mehr bezahlbare Wohnungen"))
+
+    def test_find_alias(self):
+        matcher = TitleMatcher(TITLES, {"Wohnbau": "politische Rechte"})
+        self.assertEqual(1, matcher.find("Wohnbau"))
+
+    def test_find_no_candidates(self):
+        self.assertIsNone(TitleMatcher([]).find("Für eine sichere AHV"))
+
+    def test_find_no_common_words(self):
+        matcher = TitleMatcher(["abc", "xyz"])
+        self.assertEqual(0, matcher.find("abd"))
+
+    def test_find_inconclusive(self):
+        matcher = TitleMatcher(["ca ca", "abc ca abc"])
+        with self.assertRaises(ValueError):
+            matcher.find("ca bc bc")
+
+    def test_find_prunes_candidates_without_common_words(self):
+        matcher = TitleMatcher(["aaaaaaax", "b aaaaaaa"])
+        self.assertEqual(1, matcher.find("aaaaaaaa b"))
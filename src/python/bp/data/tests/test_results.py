@@ -0,0 +1,33 @@
+from bp.data.results import VoteResultPage, VoteResultPages
+from bp.data.tests.test_chronology import MOCK_PAGES, MockFetcher
+
+import asyncio
+import unittest
+from datetime import datetime
+from lxml import html
+
+
+class TestVoteResultPage(unittest.TestCase):
+
+    def test_titles_and_tables(self):
+        page = VoteResultPage(html.fromstring(
+            "<div class='mod-text'><h3>Volksinitiative '<b>Erste</b>'</h3>"
+            "<table id='first'></table><h3>Zweite</h3><p>Keine Tabelle</p></div>"))
+        self.assertListEqual(
+            ["volksinitiative 'erste'", "zweite"], page.titles)
+        self.assertEqual("first", page.tables[0].get("id"))
+        self.assertIsNone(page.tables[1])
+
+
+class TestVoteResultPages(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_memoised(self):
+        fetcher = MockFetcher(MOCK_PAGES)
+        pages = VoteResultPages(fetcher)
+        first, second = await asyncio.gather(
+            pages.get(datetime(2021, 6, 13)), pages.get(datetime(2021, 6, 13)))
+        self.assertIs(first, second)
+        self.assertIs(first, await pages.get(datetime(2021, 6, 13)))
+        self.assertListEqual(
+            ["https://www.bk.admin.ch/ch/d/pore/va/20210613/index.html"], fetcher.requests)
+        self.assertEqual(3, len(first.titles))
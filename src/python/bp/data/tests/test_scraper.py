@@ -0,0 +1,76 @@
+from bp.data.scraper import Scraper
+
+import unittest
+from lxml import html
+
+
+class TestScraper(unittest.TestCase):
+
+    def test_get_parent(self):
+        self.assertEqual("https://www.bk.admin.ch/ch/d/pore/vi",
+                         Scraper.get_parent("https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"))
+
+    def test_parse(self):
+        page: html.HtmlElement = Scraper.parse(
+            "<p>Bundesbeschluss über die Änderung</p>".encode("utf-8"))
+        self.assertEqual("Bundesbeschluss über die Änderung",
+                         page.text_content())
+
+    def test_decode_unknown_encoding(self):
+        self.assertEqual("\x00\x01�", Scraper.decode(b"\x00\x01\xff"))
+
+    def test_convert_to_text(self):
+        page: html.HtmlElement = html.fromstring("""<div><p>Art. 1<sup>1</sup> Abs.\xa02 </p><p> </p><p>Ge­setz – <b>alt\xa0</b></p><p><sup> </sup></p><div id="contentNavigation">Navigation</div>Ende<br>Zeile</div>""")
+        self.assertEqual("Art. 1^1 Abs. 2\n\nGesetz - alt\n\n\nZeile",
+                         Scraper.convert_to_text(page))
+
+    def test_convert_to_text_list(self):
+        page: html.HtmlElement = html.fromstring(
+            "<div><ol>ignored<li>erstens</li><li>zweitens</li></ol>ignored<ol><li></li></ol></div>")
+        self.assertEqual("1. erstens\n2. zweitens\n\n1. \n\n",
+                         Scraper.convert_to_text(page))
+        self.assertEqual("1. erstens\n2. zweitens\n\n1. \n\n",
+                         Scraper.convert_to_text(list(page)))
+
+    def test_convert_to_text_empty(self):
+        self.assertEqual("", Scraper.convert_to_text(
+            html.fromstring("<p><span>­</span></p>")))
+        self.assertEqual("", Scraper.convert_to_text(
+            html.fromstring("<p><sup></sup> <span>­</span></p>")))
+        self.assertEqual("^^\n\n", Scraper.convert_to_text(
+            html.fromstring("<p><sup>^</sup></p>")))
+        self.assertEqual("\n", Scraper.convert_to_text(
+            html.fromstring("<div><br></div>")))
+        self.assertEqual("", Scraper.convert_to_text(
+            html.fromstring("<div id='contentNavigation'>Navigation</div>")))
+        self.assertEqual("1. \n\n", Scraper.convert_to_text(
+            html.fromstring("<div><ol><div id='contentNavigation'></div></ol></div>")))
+
+    def test_convert_to_text_trailing_spaces(self):
+        self.assertEqual("a \n\n", Scraper.convert_to_text(
+            html.fromstring("<p>a\xa0</p>")))
+        self.assertEqual("a\n\n", Scraper.convert_to_text(
+            html.fromstring("<p><b>a\xa0­</b> </p>")))
+
+    def test_detect_encoding(self):
+        self.assertEqual("utf-8", Scraper.detect_encoding(
+            "<p>Bundesbeschluss über die Änderung</p>".encode("utf-8")))
+        self.assertEqual("utf-8", Scraper.detect_encoding(b"\x00\x01\xff"))
+
+    def test_convert_divs_to_text(self):
+        navigation: str = "<div class='nav'><ul><li>Navigation</li></ul></div>" * 10
+        content: bytes = f"""<!DOCTYPE html><html><head><title>Titel</title></head><body>{navigation}
+            <div class='mod-text'><p>Art. 1<sup>1</sup> Änderung</p><div>Absatz</div><div class='mod-text'><p>Innen</p></div>Ende</div>Nach
+            {navigation}<div class='row mod-text'><p>Art. 2</p></div></body></html>""".encode("utf-8")
+        expected: str = Scraper.convert_to_text(Scraper.parse(content).xpath(
+            "//div[contains(@class, 'mod-text')]"))
+        self.assertEqual(
+            "Art. 1^1 Änderung\n\nAbsatzInnen\n\nEndeNach\n            Innen\n\nEndeArt. 2\n\n", expected)
+        self.assertEqual(expected, Scraper.convert_divs_to_text(
+            content, "mod-text"))
+
+    def test_convert_divs_to_text_unsupported_encoding(self):
+        content: bytes = "<div class='mod-text'><p>Ελληνικά κείμενο για δοκιμή</p></div>".encode(
+            "cp737")
+        self.assertEqual("Ελληνικά κείμενο για δοκιμή\n\n",
+                         Scraper.convert_divs_to_text(content, "mod-text"))
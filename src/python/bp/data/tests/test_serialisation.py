@@ -1,6 +1,7 @@
 import bp.data.serialisation
-from bp.data.serialisation import AUGMENTED_INITIATIVES, BallotStatusHandler, DatetimeHandler, DecimalHandler, DoubleMajorityBallotResultHandler, INITIATIVES, Serialisation
+from bp.data.serialisation import AUGMENTED_INITIATIVES, BallotStatusHandler, DatetimeHandler, DecimalHandler, DoubleMajorityBallotResultHandler, INITIATIVES, Serialisation, StorageFormat
 from bp.entity.ballot import BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.frozen import FrozenDoubleMajorityBallot
 
 import jsonpickle
 import tempfile
@@ -97,6 +98,130 @@ class TestSerialisation(unittest.IsolatedAsyncioTestCase):
                              actual.result.accepting_cantons)
             index = index + 1
 
+    async def test_frozen(self):
+        frozen: List[FrozenDoubleMajorityBallot] = [
+            FrozenDoubleMajorityBallot.from_ballot(ballot) for ballot in TEST_BALLOTS]
+        self.assertEqual(jsonpickle.encode(TEST_BALLOTS), jsonpickle.encode(frozen))
+        await Serialisation.write_initiatives(frozen)
+        deserialised: List[DoubleMajorityBallot] = await Serialisation.load_initiatives()
+        self.assertListEqual(frozen, [FrozenDoubleMajorityBallot.from_ballot(
+            ballot) for ballot in deserialised])
+
+    async def test_binary(self):
+        await Serialisation.write_initiatives(TEST_BALLOTS, StorageFormat.BINARY)
+        await Serialisation.write_augmented_initiatives(TEST_BALLOTS[:1], StorageFormat.BINARY)
+        deserialised: List[DoubleMajorityBallot] = await Serialisation.load_initiatives(StorageFormat.BINARY)
+        augmented: List[DoubleMajorityBallot] = await Serialisation.load_augmented_initiatives(StorageFormat.BINARY)
+        self.assertEqual(2, len(deserialised))
+        self.assertEqual(1, len(augmented))
+        self.assertNotEqual(deserialised[0], deserialised[1])
+        self.assertEqual(TEST_BALLOTS[0].bill.title, augmented[0].bill.title)
+        self.assertEqual(TEST_BALLOTS[0].result.percentage_yes,
+                         deserialised[1].result.percentage_yes)
+
+    async def test_open(self):
+        await Serialisation.write_initiatives(TEST_BALLOTS, StorageFormat.BINARY)
+        await Serialisation.write_augmented_initiatives(TEST_BALLOTS[:1], StorageFormat.BINARY)
+        with Serialisation.open_initiatives() as initiatives:
+            self.assertListEqual([ballot.bill.title for ballot in TEST_BALLOTS], [
+                                 ballot.bill.title for ballot in initiatives])
+        with Serialisation.open_augmented_initiatives() as augmented:
+            self.assertEqual(1, len(augmented))
+
+    async def test_stream(self):
+        await Serialisation.write_initiatives(TEST_BALLOTS)
+        with open(bp.data.serialisation.INITIATIVES) as file:
+            expected: str = file.read()
+        await Serialisation.write_initiatives_stream(TEST_BALLOTS)
+        with open(bp.data.serialisation.INITIATIVES) as file:
+            self.assertEqual(expected, file.read())
+
+        deserialised: List[DoubleMajorityBallot] = [ballot async for ballot in Serialisation.iter_initiatives()]
+        self.assertEqual(2, len(deserialised))
+        self.assertEqual(TEST_BALLOTS[0].bill.title, deserialised[1].bill.title)
+        self.assertEqual(TEST_BALLOTS[0].result.percentage_yes,
+                         deserialised[1].result.percentage_yes)
+
+    async def test_augmented_stream(self):
+        await Serialisation.write_initiatives(TEST_BALLOTS)
+        await Serialisation.write_augmented_initiatives_stream(Serialisation.iter_initiatives())
+        deserialised: List[DoubleMajorityBallot] = [ballot async for ballot in Serialisation.iter_augmented_initiatives()]
+        self.assertEqual(2, len(deserialised))
+        self.assertEqual(TEST_TIMESTAMP, deserialised[0].bill.date)
+
+    async def test_stream_empty(self):
+        await Serialisation.write_initiatives_stream([])
+        with open(bp.data.serialisation.INITIATIVES) as file:
+            self.assertEqual(jsonpickle.encode([]), file.read())
+        self.assertListEqual([], [ballot async for ballot in Serialisation.iter_initiatives()])
+
+    async def test_stream_chunks(self):
+        chunk_size: int = bp.data.serialisation.STREAM_CHUNK_SIZE
+        bp.data.serialisation.STREAM_CHUNK_SIZE = 7
+        try:
+            await Serialisation.write_initiatives_stream(TEST_BALLOTS)
+            deserialised: List[DoubleMajorityBallot] = [ballot async for ballot in Serialisation.iter_initiatives()]
+        finally:
+            bp.data.serialisation.STREAM_CHUNK_SIZE = chunk_size
+        self.assertEqual(2, len(deserialised))
+        self.assertEqual(TEST_BALLOTS[1].bill.wording, deserialised[1].bill.wording)
+
+    async def test_stream_malformed(self):
+        for content in ["", "{}", "[{} {}]", "[{}, ", "[{\"bill\": "]:
+            with open(bp.data.serialisation.INITIATIVES, "w") as file:
+                file.write(content)
+            with self.assertRaises(ValueError):
+                [ballot async for ballot in Serialisation.iter_initiatives()]
+
+    async def test_sharded(self):
+        await Serialisation.write_initiatives(TEST_BALLOTS, StorageFormat.SHARDED)
+        await Serialisation.write_augmented_initiatives(TEST_BALLOTS[:1], StorageFormat.SHARDED)
+        deserialised: List[DoubleMajorityBallot] = await Serialisation.load_initiatives(StorageFormat.SHARDED)
+        augmented: List[DoubleMajorityBallot] = await Serialisation.load_augmented_initiatives(StorageFormat.SHARDED)
+        self.assertEqual(2, len(deserialised))
+        self.assertEqual(1, len(augmented))
+        self.assertEqual(TEST_BALLOTS[1].result.accepting_cantons,
+                         deserialised[1].result.accepting_cantons)
+
+    async def test_deduplicated(self):
+        await Serialisation.write_initiatives(TEST_BALLOTS, StorageFormat.DEDUPLICATED)
+        await Serialisation.write_augmented_initiatives(TEST_BALLOTS[:1], StorageFormat.DEDUPLICATED)
+        deserialised: List[DoubleMajorityBallot] = await Serialisation.load_initiatives(StorageFormat.DEDUPLICATED)
+        augmented: List[DoubleMajorityBallot] = await Serialisation.load_augmented_initiatives(StorageFormat.DEDUPLICATED)
+        self.assertEqual(2, len(deserialised))
+        self.assertEqual(1, len(augmented))
+        self.assertNotEqual(deserialised[0], deserialised[1])
+        self.assertEqual(TEST_BALLOTS[1].bill.title, deserialised[1].bill.title)
+
+    def test_get_path(self):
+        self.assertEqual("resources/initiatives.json", Serialisation.get_path(
+            "resources/initiatives.json", StorageFormat.JSON))
+        self.assertEqual("resources/initiatives.bin", Serialisation.get_path(
+            "resources/initiatives.json", StorageFormat.BINARY))
+        self.assertEqual("resources/initiatives.shards", Serialisation.get_path(
+            "resources/initiatives.json", StorageFormat.SHARDED))
+        self.assertEqual("resources/initiatives.dedup.json", Serialisation.get_path(
+            "resources/initiatives.json", StorageFormat.DEDUPLICATED))
+
+
+class TestDoubleMajorityBallotHandler(unittest.TestCase):
+
+    def test_details_url(self):
+        ballot = DoubleMajorityBallot(
+            Bill("Title", "The wording.", TEST_TIMESTAMP),
+            BallotStatus.FAILED,
+            None,
+            "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html")
+        encoded: str = jsonpickle.encode(ballot)
+        self.assertIn("details_url", encoded)
+        self.assertEqual("https://www.bk.admin.ch/ch/d/pore/vi/vis1.html",
+                         jsonpickle.decode(encoded).details_url)
+
+    def test_no_details_url(self):
+        encoded: str = jsonpickle.encode(TEST_BALLOTS[0])
+        self.assertNotIn("details_url", encoded)
+        self.assertIsNone(jsonpickle.decode(encoded).details_url)
+
 
 class TestDatetimeHandler(unittest.TestCase):
 
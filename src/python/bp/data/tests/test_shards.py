@@ -0,0 +1,98 @@
+from bp.data.shards import MANIFEST, ShardedDataset
+from bp.data.tests.test_binary import TEST_BALLOTS
+from bp.entity.ballot import DoubleMajorityBallot
+
+import json
+import jsonpickle
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+
+class TestShardedDataset(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.directory.name, "initiatives.shards")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_round_trip(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path, 2)
+        self.assertListEqual(["manifest.json", "shard-00000.json.gz", "shard-00001.json.gz"],
+                             sorted(os.listdir(self.path)))
+        ballots: List[DoubleMajorityBallot] = await ShardedDataset.read(self.path, 2, 0)
+        self.assertEqual(jsonpickle.encode(TEST_BALLOTS), jsonpickle.encode(ballots))
+
+    async def test_round_trip_in_process(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path, 2)
+        with patch("bp.data.shards.ProcessPoolExecutor") as executor:
+            ballots: List[DoubleMajorityBallot] = await ShardedDataset.read(self.path, 2)
+            self.assertEqual(jsonpickle.encode(TEST_BALLOTS), jsonpickle.encode(ballots))
+            self.assertEqual(jsonpickle.encode(TEST_BALLOTS), jsonpickle.encode(
+                await ShardedDataset.read(self.path, 1, 0)))
+            executor.assert_not_called()
+
+    async def test_default_shard_size(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path)
+        self.assertListEqual(["manifest.json", "shard-00000.json.gz"],
+                             sorted(os.listdir(self.path)))
+
+    async def test_empty(self):
+        await ShardedDataset.write([], self.path)
+        self.assertListEqual([], await ShardedDataset.read(self.path, 2, 0))
+
+    async def test_removes_stale_shards(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path, 2)
+        await ShardedDataset.write(TEST_BALLOTS[:1], self.path, 2)
+        self.assertListEqual(["manifest.json", "shard-00000.json.gz"],
+                             sorted(os.listdir(self.path)))
+        ballots: List[DoubleMajorityBallot] = await ShardedDataset.read(self.path)
+        self.assertEqual(1, len(ballots))
+
+    async def test_checksum_mismatch(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path, 2)
+        manifest: Dict[str, Any] = self.__read_manifest()
+        manifest["shards"][1]["sha256"] = "0" * 64
+        self.__write_manifest(manifest)
+        with self.assertRaises(ValueError):
+            await ShardedDataset.read(self.path, 2, 0)
+        with self.assertRaises(ValueError):
+            await ShardedDataset.read(self.path)
+        with self.assertRaises(ValueError):
+            ShardedDataset.decode_shard(os.path.join(
+                self.path, manifest["shards"][1]["file"]), 1, manifest["shards"][1]["sha256"])
+
+    async def test_count_mismatch(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path, 2)
+        shard: Dict[str, Any] = self.__read_manifest()["shards"][0]
+        with self.assertRaises(ValueError):
+            ShardedDataset.decode_shard(os.path.join(self.path, shard["file"]), 3, shard["sha256"])
+        ballots: List[DoubleMajorityBallot] = ShardedDataset.decode_shard(
+            os.path.join(self.path, shard["file"]), 2, shard["sha256"])
+        self.assertEqual(TEST_BALLOTS[1].bill.title, ballots[1].bill.title)
+
+        manifest: Dict[str, Any] = self.__read_manifest()
+        manifest["count"] = 4
+        self.__write_manifest(manifest)
+        with self.assertRaises(ValueError):
+            await ShardedDataset.read(self.path)
+
+    async def test_unsupported_version(self):
+        await ShardedDataset.write(TEST_BALLOTS, self.path)
+        manifest: Dict[str, Any] = self.__read_manifest()
+        manifest["version"] = 2
+        self.__write_manifest(manifest)
+        with self.assertRaises(ValueError):
+            await ShardedDataset.read(self.path)
+
+    def __read_manifest(self) -> Dict[str, Any]:
+        with open(os.path.join(self.path, MANIFEST)) as file:
+            return json.load(file)
+
+    def __write_manifest(self, manifest: Dict[str, Any]):
+        with open(os.path.join(self.path, MANIFEST), "w") as file:
+            json.dump(manifest, file)
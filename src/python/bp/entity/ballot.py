@@ -2,6 +2,7 @@ from bp.entity.bill import Bill
 from bp.entity.result import DoubleMajorityBallotResult
 
 from enum import Enum
+from typing import Dict
 
 
 class BallotStatus(Enum):
@@ -22,12 +23,18 @@ class BallotStatus(Enum):
     """
 
 
+STATUSES_BY_VALUE: Dict[int, BallotStatus] = {
+    status.value: status for status in BallotStatus}
+"""Dict[int, BallotStatus]: Ballot status by value, used by columnar formats
+which store statuses as integers."""
+
+
 class DoubleMajorityBallot:
     """Double majority ballot consisting of bill details information and an
     optional result, if the ballot has already taken place.
     """
 
-    def __init__(self, bill: Bill, status: BallotStatus, result: DoubleMajorityBallotResult | None) -> None:
+    def __init__(self, bill: Bill, status: BallotStatus, result: DoubleMajorityBallotResult | None, details_url: str | None = None) -> None:
         """Initialises the ballot with all properties.
 
         Args:
@@ -36,7 +43,12 @@ class DoubleMajorityBallot:
             was already held actually held or wheher the measure failed without
             vote.
             result (DoubleMajorityBallotResult | None): Optional ballot result.
+            details_url (str | None, optional): Bill details page on
+            www.bk.admin.ch from which the ballot was retrieved. Identifies the
+            ballot during incremental updates. None for ballots which were not
+            downloaded, e.g. augmented ones. Defaults to None.
         """
         self.bill = bill
         self.status = status
         self.result = result
+        self.details_url = details_url
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from typing import Tuple
+
+
+def to_fixed_point(value: Decimal) -> Tuple[int, int]:
+    """Splits a decimal into an integer coefficient and exponent.
+
+    Args:
+        value (Decimal): Finite decimal to split.
+
+    Raises:
+        ValueError: If value is not finite.
+
+    Returns:
+        Tuple[int, int]: Coefficient and exponent, such that value equals
+        coefficient * 10^exponent including its number of decimal places.
+    """
+    if not value.is_finite():
+        raise ValueError(f"Only finite decimals are supported: {value}")
+    sign, digits, exponent = value.as_tuple()
+    coefficient: int = int("".join(map(str, digits)))
+    return -coefficient if sign else coefficient, exponent
+
+
+def from_fixed_point(coefficient: int, exponent: int) -> Decimal:
+    """Restores a decimal split by to_fixed_point.
+
+    Args:
+        coefficient (int): Integer coefficient.
+        exponent (int): Decimal exponent.
+
+    Returns:
+        Decimal: coefficient * 10^exponent, with the number of decimal places
+        given by exponent.
+    """
+    return Decimal(f"{coefficient}E{exponent}")
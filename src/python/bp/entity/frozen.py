@@ -0,0 +1,134 @@
+from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
+from bp.entity.bill import Bill
+from bp.entity.result import DoubleMajorityBallotResult
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenBill:
+    """Immutable, hashable counterpart of Bill without per-instance __dict__.
+    Serialised exactly like Bill.
+    """
+
+    title: str
+    """str: Official title of the bill."""
+
+    wording: str
+    """str: Full legal wording, i.e. body content of bill."""
+
+    date: datetime
+    """datetime: First date of record associated with the bill."""
+
+    @staticmethod
+    def from_bill(bill: Bill) -> "FrozenBill":
+        """Creates an immutable copy of bill.
+
+        Args:
+            bill (Bill): Bill to copy.
+
+        Returns:
+            FrozenBill: Immutable bill with the same properties.
+        """
+        return FrozenBill(bill.title, bill.wording, bill.date)
+
+    def to_bill(self) -> Bill:
+        """Creates a mutable copy of this bill.
+
+        Returns:
+            Bill: Mutable bill with the same properties.
+        """
+        return Bill(self.title, self.wording, self.date)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenDoubleMajorityBallotResult:
+    """Immutable, hashable counterpart of DoubleMajorityBallotResult without
+    per-instance __dict__. Serialised exactly like DoubleMajorityBallotResult.
+    """
+
+    percentage_yes: Decimal
+    """Decimal: Share of population voting yes."""
+
+    accepting_cantons: Decimal
+    """Decimal: Share of cantons voting yes."""
+
+    @staticmethod
+    def from_result(result: DoubleMajorityBallotResult) -> "FrozenDoubleMajorityBallotResult":
+        """Creates an immutable copy of result.
+
+        Args:
+            result (DoubleMajorityBallotResult): Result to copy.
+
+        Returns:
+            FrozenDoubleMajorityBallotResult: Immutable result with the same
+            properties.
+        """
+        return FrozenDoubleMajorityBallotResult(result.percentage_yes, result.accepting_cantons)
+
+    def to_result(self) -> DoubleMajorityBallotResult:
+        """Creates a mutable copy of this result.
+
+        Returns:
+            DoubleMajorityBallotResult: Mutable result with the same
+            properties.
+        """
+        return DoubleMajorityBallotResult(self.percentage_yes, self.accepting_cantons)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenDoubleMajorityBallot:
+    """Immutable, hashable counterpart of DoubleMajorityBallot without
+    per-instance __dict__. Two frozen ballots are equal if all their
+    properties are equal, which allows deduplicating and caching ballots by
+    value. Serialised exactly like DoubleMajorityBallot, so that persisted
+    frozen ballots are loaded as regular ballots.
+    """
+
+    bill: FrozenBill
+    """FrozenBill: Details information about bill on the ballot."""
+
+    status: BallotStatus
+    """BallotStatus: Indicates whether a ballot is still pending, was already
+    held or whether the measure failed without vote."""
+
+    result: FrozenDoubleMajorityBallotResult | None
+    """FrozenDoubleMajorityBallotResult | None: Optional ballot result."""
+
+    details_url: str | None = None
+    """str | None: Bill details page on www.bk.admin.ch from which the ballot
+    was retrieved, if any."""
+
+    @staticmethod
+    def from_ballot(ballot: DoubleMajorityBallot) -> "FrozenDoubleMajorityBallot":
+        """Creates an immutable copy of ballot, including its bill and result.
+
+        Args:
+            ballot (DoubleMajorityBallot): Ballot to copy.
+
+        Returns:
+            FrozenDoubleMajorityBallot: Immutable ballot with the same
+            properties.
+        """
+        result: DoubleMajorityBallotResult | None = ballot.result
+        return FrozenDoubleMajorityBallot(
+            FrozenBill.from_bill(ballot.bill),
+            ballot.status,
+            None if result is None else FrozenDoubleMajorityBallotResult.from_result(
+                result),
+            ballot.details_url)
+
+    def to_ballot(self) -> DoubleMajorityBallot:
+        """Creates a mutable copy of this ballot, including its bill and
+        result.
+
+        Returns:
+            DoubleMajorityBallot: Mutable ballot with the same properties.
+        """
+        return DoubleMajorityBallot(
+            self.bill.to_bill(),
+            self.status,
+            None if self.result is None else self.result.to_result(),
+            self.details_url)
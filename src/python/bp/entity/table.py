@@ -0,0 +1,236 @@
+from bp.entity.ballot import STATUSES_BY_VALUE, BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.fixed_point import from_fixed_point, to_fixed_point
+
+import numpy as np
+from datetime import datetime
+from typing import List, Tuple
+
+
+DATE_TYPE: np.dtype = np.dtype("datetime64[us]")
+"""np.dtype: Type of the date column, which represents every naive datetime
+exactly."""
+
+
+class BallotTable:
+    """Columnar representation of double majority ballots for bulk analytics.
+    Every ballot property is stored as one NumPy array, so that filters and
+    labels are computed with vectorised operations instead of Python loops
+    over ballot objects. Results are kept as exact fixed-point coefficients and
+    exponents, from which the float columns are derived, so that converting
+    ballots to a table and back is lossless. Ballots without result have NaN
+    in the float result columns.
+    """
+
+    def __init__(self, statuses: np.ndarray, dates: np.ndarray, has_result: np.ndarray, percentage_yes_coefficients: np.ndarray, percentage_yes_exponents: np.ndarray, accepting_cantons_coefficients: np.ndarray, accepting_cantons_exponents: np.ndarray, titles: np.ndarray, wordings: np.ndarray, details_urls: np.ndarray):
+        """Initialises the table with all columns, which need to have the same
+        length.
+
+        Args:
+            statuses (np.ndarray): uint8 BallotStatus values.
+            dates (np.ndarray): datetime64[us] bill dates.
+            has_result (np.ndarray): bool flags of ballots with a result.
+            percentage_yes_coefficients (np.ndarray): int64 coefficients of
+            the share of population voting yes.
+            percentage_yes_exponents (np.ndarray): int8 decimal exponents of
+            the share of population voting yes.
+            accepting_cantons_coefficients (np.ndarray): int64 coefficients of
+            the share of cantons voting yes.
+            accepting_cantons_exponents (np.ndarray): int8 decimal exponents
+            of the share of cantons voting yes.
+            titles (np.ndarray): str bill titles.
+            wordings (np.ndarray): str bill wordings.
+            details_urls (np.ndarray): str or None details URLs.
+        """
+        self.statuses = statuses
+        self.dates = dates
+        self.has_result = has_result
+        self.percentage_yes_coefficients = percentage_yes_coefficients
+        self.percentage_yes_exponents = percentage_yes_exponents
+        self.accepting_cantons_coefficients = accepting_cantons_coefficients
+        self.accepting_cantons_exponents = accepting_cantons_exponents
+        self.titles = titles
+        self.wordings = wordings
+        self.details_urls = details_urls
+        self.percentage_yes: np.ndarray = BallotTable.__to_float(
+            percentage_yes_coefficients, percentage_yes_exponents, has_result)
+        """np.ndarray: float64 share of population voting yes, NaN for
+        ballots without result."""
+        self.accepting_cantons: np.ndarray = BallotTable.__to_float(
+            accepting_cantons_coefficients, accepting_cantons_exponents, has_result)
+        """np.ndarray: float64 share of cantons voting yes, NaN for ballots
+        without result."""
+
+    @staticmethod
+    def from_ballots(ballots: List[DoubleMajorityBallot]) -> "BallotTable":
+        """Converts ballot objects to columns.
+
+        Args:
+            ballots (List[DoubleMajorityBallot]): Ballots to convert.
+
+        Raises:
+            ValueError: If a date is not naive or a result is not a finite
+            decimal fitting into an int64 coefficient and int8 exponent.
+
+        Returns:
+            BallotTable: Table containing ballots in order.
+        """
+        count: int = len(ballots)
+        dates: List[datetime] = [ballot.bill.date for ballot in ballots]
+        if any(date.tzinfo is not None for date in dates):
+            raise ValueError("Ballot tables only support naive dates")
+
+        results: List[DoubleMajorityBallotResult | None] = [
+            ballot.result for ballot in ballots]
+        percentages_yes: List[Tuple[int, int]] = [(0, 0) if result is None else to_fixed_point(
+            result.percentage_yes) for result in results]
+        accepting_cantons: List[Tuple[int, int]] = [(0, 0) if result is None else to_fixed_point(
+            result.accepting_cantons) for result in results]
+        try:
+            percentage_yes_columns: np.ndarray = np.array(
+                percentages_yes, dtype=np.int64).reshape(count, 2)
+            accepting_cantons_columns: np.ndarray = np.array(
+                accepting_cantons, dtype=np.int64).reshape(count, 2)
+        except OverflowError as e:
+            raise ValueError(f"Result exceeds ballot table limits: {e}")
+        if np.any(np.abs(percentage_yes_columns[:, 1]) > np.iinfo(np.int8).max) or np.any(np.abs(accepting_cantons_columns[:, 1]) > np.iinfo(np.int8).max):
+            raise ValueError("Result exponent exceeds ballot table limits")
+
+        return BallotTable(
+            np.fromiter((ballot.status.value for ballot in ballots),
+                        dtype=np.uint8, count=count),
+            np.array(dates, dtype=DATE_TYPE),
+            np.fromiter((result is not None for result in results),
+                        dtype=bool, count=count),
+            percentage_yes_columns[:, 0].copy(),
+            percentage_yes_columns[:, 1].astype(np.int8),
+            accepting_cantons_columns[:, 0].copy(),
+            accepting_cantons_columns[:, 1].astype(np.int8),
+            BallotTable.__to_object_array(
+                [ballot.bill.title for ballot in ballots]),
+            BallotTable.__to_object_array(
+                [ballot.bill.wording for ballot in ballots]),
+            BallotTable.__to_object_array([ballot.details_url for ballot in ballots]))
+
+    def to_ballots(self) -> List[DoubleMajorityBallot]:
+        """Converts the columns back to ballot objects.
+
+        Returns:
+            List[DoubleMajorityBallot]: Ballots of the table, in order.
+        """
+        ballots: List[DoubleMajorityBallot] = []
+        for status, date, has_result, percentage_yes_coefficient, percentage_yes_exponent, accepting_cantons_coefficient, accepting_cantons_exponent, title, wording, details_url in zip(
+                self.statuses.tolist(), self.dates.tolist(), self.has_result.tolist(),
+                self.percentage_yes_coefficients.tolist(), self.percentage_yes_exponents.tolist(),
+                self.accepting_cantons_coefficients.tolist(), self.accepting_cantons_exponents.tolist(),
+                self.titles.tolist(), self.wordings.tolist(), self.details_urls.tolist()):
+            result: DoubleMajorityBallotResult | None = DoubleMajorityBallotResult(
+                from_fixed_point(percentage_yes_coefficient, percentage_yes_exponent),
+                from_fixed_point(accepting_cantons_coefficient, accepting_cantons_exponent)) if has_result else None
+            ballots.append(DoubleMajorityBallot(
+                Bill(title, wording, date), STATUSES_BY_VALUE[status], result, details_url))
+        return ballots
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def select(self, mask: np.ndarray) -> "BallotTable":
+        """Selects rows of the table.
+
+        Args:
+            mask (np.ndarray): Boolean mask or integer indices of the selected
+            rows, e.g. a comparison on one of the columns.
+
+        Returns:
+            BallotTable: Table containing only the selected rows.
+        """
+        return BallotTable(
+            self.statuses[mask], self.dates[mask], self.has_result[mask],
+            self.percentage_yes_coefficients[mask], self.percentage_yes_exponents[mask],
+            self.accepting_cantons_coefficients[mask], self.accepting_cantons_exponents[mask],
+            self.titles[mask], self.wordings[mask], self.details_urls[mask])
+
+    def with_status(self, status: BallotStatus) -> "BallotTable":
+        """Selects all ballots with the given status.
+
+        Args:
+            status (BallotStatus): Status to filter by.
+
+        Returns:
+            BallotTable: Ballots of this table with status, in order.
+        """
+        return self.select(self.statuses == status.value)
+
+    def between(self, start: datetime, end: datetime) -> "BallotTable":
+        """Selects all ballots with a bill date in [start, end).
+
+        Args:
+            start (datetime): Earliest included bill date.
+            end (datetime): First excluded bill date.
+
+        Returns:
+            BallotTable: Ballots of this table in the date range, in order.
+        """
+        return self.select((self.dates >= np.datetime64(start, "us")) & (self.dates < np.datetime64(end, "us")))
+
+    def create_double_majority_labels(self) -> np.ndarray:
+        """Converts results to labels containing the popular and canton share
+        vote result, each in one-hot encoding. Tables are usually filtered to
+        completed ballots first.
+
+        Raises:
+            ValueError: If a ballot of the table has no result.
+
+        Returns:
+            np.ndarray: C-contiguous float32 array of shape (len(self), 2, 2),
+            which tf.convert_to_tensor can use without conversion. Values are
+            computed in float64 and rounded to float32 when they are written
+            into the labels, matching the labels created from Python floats,
+            without a float64 copy of the labels.
+        """
+        if not np.all(self.has_result):
+            raise ValueError("Labels require a result for every ballot")
+        percentage_yes: np.ndarray = self.percentage_yes / 100.0
+        accepting_cantons: np.ndarray = self.accepting_cantons / 100.0
+        labels: np.ndarray = np.empty((len(self), 2, 2), dtype=np.float32)
+        labels[:, 0, 0] = percentage_yes
+        labels[:, 0, 1] = 1.0 - percentage_yes
+        labels[:, 1, 0] = accepting_cantons
+        labels[:, 1, 1] = 1.0 - accepting_cantons
+        return labels
+
+    @staticmethod
+    def __to_float(coefficients: np.ndarray, exponents: np.ndarray, has_result: np.ndarray) -> np.ndarray:
+        """Converts fixed-point columns to float. Coefficients are divided by
+        exact powers of ten, so that the result is the correctly rounded float
+        of the decimal, identical to float(Decimal), for all coefficients
+        below 2^53.
+
+        Args:
+            coefficients (np.ndarray): int64 coefficients.
+            exponents (np.ndarray): int8 decimal exponents.
+            has_result (np.ndarray): bool flags of rows with a value.
+
+        Returns:
+            np.ndarray: float64 values, NaN where has_result is False.
+        """
+        scales: np.ndarray = np.power(
+            10.0, np.abs(exponents.astype(np.int64)))
+        values: np.ndarray = np.where(
+            exponents < 0, coefficients / scales, coefficients * scales)
+        values[~has_result] = np.nan
+        return values
+
+    @staticmethod
+    def __to_object_array(values: List[str | None]) -> np.ndarray:
+        """Creates a one-dimensional object array of strings, since NumPy's
+        fixed width string type would pad every wording to the longest one.
+
+        Args:
+            values (List[str | None]): Column values.
+
+        Returns:
+            np.ndarray: Object array containing values.
+        """
+        column: np.ndarray = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
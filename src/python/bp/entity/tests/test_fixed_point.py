@@ -0,0 +1,20 @@
+from bp.entity.fixed_point import from_fixed_point, to_fixed_point
+
+import unittest
+from decimal import Decimal
+
+
+class TestFixedPoint(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in [Decimal("37.1"), Decimal("0.00"), Decimal("-1.5"), Decimal("12E+1"), Decimal("65.217391")]:
+            coefficient, exponent = to_fixed_point(value)
+            restored: Decimal = from_fixed_point(coefficient, exponent)
+            self.assertEqual(value, restored)
+            self.assertEqual(str(value), str(restored))
+        self.assertEqual((-15, -1), to_fixed_point(Decimal("-1.5")))
+
+    def test_not_finite(self):
+        for value in [Decimal("NaN"), Decimal("Infinity")]:
+            with self.assertRaises(ValueError):
+                to_fixed_point(value)
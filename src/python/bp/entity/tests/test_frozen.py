@@ -0,0 +1,41 @@
+from bp.entity.ballot import BallotStatus, DoubleMajorityBallot
+from bp.entity.frozen import FrozenBill, FrozenDoubleMajorityBallot
+from bp.entity.tests.test_table import TEST_BALLOTS
+
+import dataclasses
+import unittest
+from typing import List
+
+
+class TestFrozenDoubleMajorityBallot(unittest.TestCase):
+
+    def test_round_trip(self):
+        ballots: List[DoubleMajorityBallot] = [FrozenDoubleMajorityBallot.from_ballot(
+            ballot).to_ballot() for ballot in TEST_BALLOTS]
+        for expected, actual in zip(TEST_BALLOTS, ballots):
+            self.assertIsInstance(actual, DoubleMajorityBallot)
+            self.assertEqual(expected.bill.title, actual.bill.title)
+            self.assertEqual(expected.bill.wording, actual.bill.wording)
+            self.assertEqual(expected.bill.date, actual.bill.date)
+            self.assertEqual(expected.status, actual.status)
+            self.assertEqual(expected.details_url, actual.details_url)
+        self.assertIsNone(ballots[1].result)
+        self.assertEqual(TEST_BALLOTS[2].result.accepting_cantons,
+                         ballots[2].result.accepting_cantons)
+
+    def test_value_semantics(self):
+        first: FrozenDoubleMajorityBallot = FrozenDoubleMajorityBallot.from_ballot(TEST_BALLOTS[0])
+        second: FrozenDoubleMajorityBallot = FrozenDoubleMajorityBallot.from_ballot(TEST_BALLOTS[0])
+        self.assertIsNot(first, second)
+        self.assertEqual(first, second)
+        self.assertEqual(1, len({first, second}))
+        self.assertNotEqual(first, dataclasses.replace(first, status=BallotStatus.PENDING))
+
+    def test_immutable(self):
+        ballot: FrozenDoubleMajorityBallot = FrozenDoubleMajorityBallot.from_ballot(TEST_BALLOTS[0])
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            ballot.status = BallotStatus.PENDING
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            ballot.bill.title = "Title"
+        self.assertFalse(hasattr(ballot, "__dict__"))
+        self.assertFalse(hasattr(FrozenBill.from_bill(TEST_BALLOTS[0].bill), "__dict__"))
@@ -0,0 +1,93 @@
+from bp.entity.ballot import BallotStatus, Bill, DoubleMajorityBallot, DoubleMajorityBallotResult
+from bp.entity.table import BallotTable
+
+import math
+import numpy as np
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+
+TEST_BALLOTS: List[DoubleMajorityBallot] = [
+    DoubleMajorityBallot(
+        Bill("Für eine Reichtumssteuer", "Art. 1 Änderung",
+             datetime(1976, 3, 12)),
+        BallotStatus.COMPLETED,
+        DoubleMajorityBallotResult(Decimal("37.1"), Decimal("0.00")),
+        "https://www.bk.admin.ch/ch/d/pore/vi/vis1.html"),
+    DoubleMajorityBallot(
+        Bill("", "", datetime(2024, 1, 1, 12, 30, 15, 7)),
+        BallotStatus.FAILED,
+        None),
+    DoubleMajorityBallot(
+        Bill("Title", "The wording.", datetime(1891, 1, 1)),
+        BallotStatus.COMPLETED,
+        DoubleMajorityBallotResult(Decimal("12E+1"), Decimal("65.217391")))
+]
+
+
+class TestBallotTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = BallotTable.from_ballots(TEST_BALLOTS)
+
+    def test_round_trip(self):
+        ballots: List[DoubleMajorityBallot] = self.table.to_ballots()
+        self.assertEqual(len(TEST_BALLOTS), len(ballots))
+        for expected, actual in zip(TEST_BALLOTS, ballots):
+            self.assertEqual(expected.bill.title, actual.bill.title)
+            self.assertEqual(expected.bill.wording, actual.bill.wording)
+            self.assertEqual(expected.bill.date, actual.bill.date)
+            self.assertEqual(expected.status, actual.status)
+            self.assertEqual(expected.details_url, actual.details_url)
+        self.assertIsNone(ballots[1].result)
+        self.assertEqual("0.00", str(ballots[0].result.accepting_cantons))
+        self.assertEqual("1.2E+2", str(ballots[2].result.percentage_yes))
+
+    def test_columns(self):
+        self.assertEqual(3, len(self.table))
+        self.assertListEqual([3, 2, 3], self.table.statuses.tolist())
+        self.assertEqual(np.dtype("datetime64[us]"), self.table.dates.dtype)
+        self.assertEqual(37.1, self.table.percentage_yes[0])
+        self.assertEqual(120.0, self.table.percentage_yes[2])
+        self.assertEqual(float(Decimal("65.217391")), self.table.accepting_cantons[2])
+        self.assertTrue(math.isnan(self.table.accepting_cantons[1]))
+
+    def test_empty(self):
+        table: BallotTable = BallotTable.from_ballots([])
+        self.assertEqual(0, len(table))
+        self.assertListEqual([], table.to_ballots())
+        self.assertEqual((0, 2, 2), table.create_double_majority_labels().shape)
+
+    def test_filters(self):
+        completed: BallotTable = self.table.with_status(BallotStatus.COMPLETED)
+        self.assertListEqual(["Für eine Reichtumssteuer", "Title"], completed.titles.tolist())
+        recent: BallotTable = self.table.between(datetime(1900, 1, 1), datetime(2024, 1, 1, 12, 30, 15, 7))
+        self.assertListEqual(["Für eine Reichtumssteuer"], recent.titles.tolist())
+        selected: BallotTable = self.table.select(self.table.percentage_yes > 50)
+        self.assertListEqual([None], selected.details_urls.tolist())
+
+    def test_labels(self):
+        labels: np.ndarray = self.table.with_status(
+            BallotStatus.COMPLETED).create_double_majority_labels()
+        self.assertEqual(np.float32, labels.dtype)
+        self.assertTrue(labels.flags.c_contiguous)
+        expected: np.ndarray = np.array([((0.371, 1.0 - 0.371), (0.0, 1.0)), ((1.2, 1.0 - 1.2), (
+            0.65217391, 1.0 - 0.65217391))], dtype=np.float32)
+        np.testing.assert_array_equal(expected, labels)
+
+    def test_labels_without_result(self):
+        with self.assertRaises(ValueError):
+            self.table.create_double_majority_labels()
+
+    def test_unsupported_values(self):
+        ballot = DoubleMajorityBallot(Bill("Title", "The wording.", datetime(
+            2024, 1, 1, tzinfo=timezone.utc)), BallotStatus.PENDING, None)
+        with self.assertRaises(ValueError):
+            BallotTable.from_ballots([ballot])
+        for value in [Decimal("NaN"), Decimal("1E+200"), Decimal("1" * 20)]:
+            ballot = DoubleMajorityBallot(Bill("Title", "The wording.", datetime(
+                2024, 1, 1)), BallotStatus.COMPLETED, DoubleMajorityBallotResult(value, Decimal(1)))
+            with self.assertRaises(ValueError):
+                BallotTable.from_ballots([ballot])
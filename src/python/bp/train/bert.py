@@ -1,5 +1,5 @@
-from bp.entity.ballot import DoubleMajorityBallotResult
 from bp.entity.bill import Bill
+from bp.entity.table import BallotTable
 
 import os
 import tensorflow as tf
@@ -11,7 +11,7 @@ from keras.optimizers import Adam
 from tensorflow import Tensor
 from transformers import BertTokenizer, TFBertForSequenceClassification
 from transformers.modeling_tf_outputs import TFBaseModelOutputWithPoolingAndCrossAttentions
-from typing import List, Tuple
+from typing import List
 
 
 HUGGINGFACE_MODEL: str = "bert-base-multilingual-cased"
@@ -107,22 +107,22 @@ class VoteResultPredictionModel:
         tokenized_bills: Tensor = self.tokenizer(formatted_bills, padding=True)
         return tf.convert_to_tensor(tokenized_bills[INPUT_IDS])
 
-    def create_double_majority_labels(self, results: List[DoubleMajorityBallotResult]) -> Tensor:
+    def create_double_majority_labels(self, table: BallotTable) -> Tensor:
         """Converts results to labels in the form of tuples containing the
         popular and canton share vote result, each in one-hot encoding.
 
         Args:
-            results (List[DoubleMajorityBallotResult]): Results to convert to expected labels.
+            table (BallotTable): Ballots whose results to convert to expected
+            labels.
+
+        Raises:
+            ValueError: If a ballot of table has no result.
 
         Returns:
             Tensor: Label tensor suitable for use with
             TFBertForSequenceClassification.
         """
-        labels: List[Tuple[float, float]] = [(float(
-            result.percentage_yes) / 100.0, float(result.accepting_cantons) / 100.0) for result in results]
-        one_hot_labels: List[Tuple[Tuple[float, float], Tuple[float, float]]] = [
-            ((label[0], 1.0 - label[0]), (label[1], 1.0 - label[1])) for label in labels]
-        return tf.convert_to_tensor(one_hot_labels)
+        return tf.convert_to_tensor(table.create_double_majority_labels())
 
     def train(self, features: Tensor, labels: Tensor, epochs: int) -> None:
         """Trains self.model with dataset.
@@ -1,5 +1,6 @@
 from bp.data.serialisation import Serialisation
 from bp.entity.ballot import DoubleMajorityBallot
+from bp.entity.table import BallotTable
 from bp.train.bert import VoteResultPredictionModel
 
 
@@ -22,7 +23,7 @@ async def main():
     features: Tensor = model.create_bill_features(
         [ballot.bill for ballot in ballots])
     labels: Tensor = model.create_double_majority_labels(
-        [ballot.result for ballot in ballots])
+        BallotTable.from_ballots(ballots))
     model.train(features, labels, epochs=2)
     model.save()
 